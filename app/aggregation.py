@@ -0,0 +1,225 @@
+import calendar
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.columnar import LaunchColumns, month_label
+from app.utils import parse_date
+
+TIME_DIMENSIONS = ("year", "quarter", "month", "week")
+DIMENSIONS = ("rocket", "launchpad", *TIME_DIMENSIONS)
+
+# Metrics read from each cell's own tallies.
+CELL_METRICS = ("count", "successes", "failures", "success_rate")
+# Metrics accumulated along the last group-by dimension, which must be a time
+# dimension.
+SERIES_METRICS = ("cumulative_count", "rolling_success_rate")
+METRICS = CELL_METRICS + SERIES_METRICS
+
+DEFAULT_ROLLING_WINDOW = 3
+
+_SECONDS_PER_DAY = 86400
+_EPOCH = date(1970, 1, 1)
+
+
+def _week_label(week: int) -> str:
+    # Week 0 starts on Monday 1969-12-29; 1970-01-01 was a Thursday.
+    year, number, _ = (_EPOCH + timedelta(days=int(week) * 7 - 3)).isocalendar()
+    return f"{year:04d}-W{number:02d}"
+
+
+def _quarter_label(quarter: int) -> str:
+    year, index = divmod(int(quarter), 4)
+    return f"{year + 1970:04d}-Q{index + 1}"
+
+
+def _by_name(
+    codes: np.ndarray, names: Sequence[str]
+) -> Tuple[np.ndarray, Callable[[int], str]]:
+    # Recode first-appearance codes by name, so groups come out in the same
+    # order whichever subset of launches the codes were assigned over.
+    ordered = sorted(range(len(names)), key=names.__getitem__)
+    rank = np.empty(len(names), dtype=np.int64)
+    rank[ordered] = np.arange(len(names))
+    return rank[codes], [names[code] for code in ordered].__getitem__
+
+
+def dimension(
+    columns: LaunchColumns, name: str
+) -> Tuple[np.ndarray, Callable[[int], str]]:
+    """
+    Returns per-row integer codes for a dimension and a code-to-label
+    function. Codes sort like their labels: rockets and launchpads by name,
+    and time codes are consecutive buckets, so they sort by time.
+
+    Rows are launches of ``columns``, or cells of anything exposing the same
+    code arrays (e.g. ``LaunchCube``).
+    """
+    if name == "rocket":
+        return _by_name(columns.rocket_codes, columns.rocket_names)
+    if name == "launchpad":
+        return _by_name(columns.launchpad_codes, columns.launchpad_names)
+    if name == "year":
+        return columns.years, str
+    if name == "quarter":
+        return columns.months // 3, _quarter_label
+    if name == "month":
+        return columns.months, month_label
+    if name == "week":
+        days = np.floor_divide(columns.timestamps, _SECONDS_PER_DAY)
+        return (days + 3) // 7, _week_label
+    raise ValueError(f"Unknown dimension: {name}")
+
+
+def select_rows(
+    columns: LaunchColumns,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    positions: Optional[Sequence[int]] = None,
+) -> np.ndarray:
+    """
+    Row positions within the inclusive date bounds, optionally restricted to
+    ``positions`` (e.g. the result of an index query).
+    """
+    rows = (
+        np.arange(columns.size)
+        if positions is None
+        else np.asarray(positions, dtype=np.int64)
+    )
+    if start_date:
+        start = calendar.timegm(parse_date(start_date).utctimetuple())
+        rows = rows[columns.timestamps[rows] >= start]
+    if end_date:
+        end = calendar.timegm(parse_date(end_date).utctimetuple())
+        rows = rows[columns.timestamps[rows] <= end]
+    return rows
+
+
+def aggregate(
+    columns: LaunchColumns,
+    group_by: Sequence[str] = (),
+    metrics: Sequence[str] = ("count",),
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    positions: Optional[Sequence[int]] = None,
+    window: int = DEFAULT_ROLLING_WINDOW,
+) -> List[Dict[str, Any]]:
+    """
+    Groups launches by any combination of ``DIMENSIONS`` and computes
+    ``METRICS`` per non-empty group, in dimension order.
+
+    Counts and success tallies for every cell come from one ``bincount``
+    pass. ``cumulative_count`` and ``rolling_success_rate`` (over ``window``
+    buckets) come from prefix sums along the last dimension. That dimension
+    must be a time dimension, and its empty buckets count towards the window.
+    """
+    validate(group_by, metrics, window)
+    rows = select_rows(columns, start_date, end_date, positions)
+    success = columns.success[rows]
+    return tabulate(
+        columns, rows, group_by, metrics, window, success == 1, success == 0
+    )
+
+
+def validate(group_by: Sequence[str], metrics: Sequence[str], window: int) -> None:
+    for name in group_by:
+        if name not in DIMENSIONS:
+            raise ValueError(f"Unknown dimension: {name}")
+    if len(set(group_by)) != len(group_by):
+        raise ValueError("Dimensions may only be grouped by once")
+    for metric in metrics:
+        if metric not in METRICS:
+            raise ValueError(f"Unknown metric: {metric}")
+    series = any(metric in SERIES_METRICS for metric in metrics)
+    if series and (not group_by or group_by[-1] not in TIME_DIMENSIONS):
+        raise ValueError(
+            "Cumulative and rolling metrics need a time dimension last in group_by"
+        )
+    if window < 1:
+        raise ValueError("window must be at least 1")
+
+
+def tabulate(
+    columns: LaunchColumns,
+    rows: np.ndarray,
+    group_by: Sequence[str],
+    metrics: Sequence[str],
+    window: int,
+    successes: np.ndarray,
+    failures: np.ndarray,
+    launches: Optional[np.ndarray] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Groups the validated ``rows`` and emits the requested metrics.
+
+    ``successes``, ``failures`` and ``launches`` are per-row weights, aligned
+    with ``rows``; ``launches`` defaults to one per row.
+    """
+    if not len(rows):
+        return []
+    series = any(metric in SERIES_METRICS for metric in metrics)
+
+    axes, indexes, labels = [], [], []
+    for depth, name in enumerate(group_by):
+        codes, label = dimension(columns, name)
+        codes = codes[rows]
+        if series and depth == len(group_by) - 1:
+            # Dense time axis, so prefix sums see the empty buckets too.
+            first = int(codes.min())
+            axes.append(np.arange(first, int(codes.max()) + 1))
+            indexes.append(codes - first)
+        else:
+            values, inverse = np.unique(codes, return_inverse=True)
+            axes.append(values)
+            indexes.append(inverse)
+        labels.append(label)
+
+    # Without dimensions, everything falls into a single cell.
+    shape = tuple(len(axis) for axis in axes) or (1,)
+    cells = (
+        np.ravel_multi_index(indexes, shape)
+        if group_by
+        else np.zeros(len(rows), dtype=np.int64)
+    )
+    size = int(np.prod(shape))
+    counts = np.bincount(cells, weights=launches, minlength=size).reshape(shape)
+    successes = np.bincount(cells, weights=successes, minlength=size).reshape(shape)
+    failures = np.bincount(cells, weights=failures, minlength=size).reshape(shape)
+
+    if series:
+        running_counts = np.cumsum(counts, axis=-1)
+        running_successes = np.cumsum(successes, axis=-1)
+
+        def trailing(prefix: np.ndarray) -> np.ndarray:
+            shifted = np.zeros_like(prefix)
+            shifted[..., window:] = prefix[..., :-window]
+            return prefix - shifted
+
+        window_counts = trailing(running_counts)
+        window_successes = trailing(running_successes)
+
+    results = []
+    for cell in zip(*np.nonzero(counts)):
+        row: Dict[str, Any] = {
+            name: labels[depth](axes[depth][cell[depth]])
+            for depth, name in enumerate(group_by)
+        }
+        count = int(counts[cell])
+        for metric in metrics:
+            if metric == "count":
+                row[metric] = count
+            elif metric == "successes":
+                row[metric] = int(successes[cell])
+            elif metric == "failures":
+                row[metric] = int(failures[cell])
+            elif metric == "success_rate":
+                row[metric] = round(float(successes[cell] / count) * 100, 2)
+            elif metric == "cumulative_count":
+                row[metric] = int(running_counts[cell])
+            elif metric == "rolling_success_rate":
+                row[metric] = round(
+                    float(window_successes[cell] / window_counts[cell]) * 100, 2
+                )
+        results.append(row)
+    return results
@@ -1,15 +1,200 @@
+import asyncio
 import logging
+import os
+import time
+import uuid
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
 
 import httpx
 
-from app.cache import ICache, SQLiteCache
+from app.cache import (
+    HOT_SYNC,
+    LAUNCH_COLUMNS,
+    LAUNCH_SEARCH_FIELDS,
+    NAME_COLUMNS,
+    ICache,
+    SQLiteCache,
+    SyncResult,
+)
+from app.models import LaunchModel, LaunchpadModel, RocketModel
 from app.settings import config
+from app.singleflight import SingleFlight
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 
+# Identifies this process when claiming refresh leases in the shared cache DB.
+LEASE_OWNER = f"{os.getpid()}-{uuid.uuid4().hex}"
+LEASE_POLL_SECONDS = 0.2
+
+
+def conditional_headers(validators: Dict[str, str]) -> Dict[str, str]:
+    headers = {}
+    if validators.get("etag"):
+        headers["If-None-Match"] = validators["etag"]
+    if validators.get("last_modified"):
+        headers["If-Modified-Since"] = validators["last_modified"]
+    return headers
+
+
+def response_validators(response: httpx.Response) -> Dict[str, str]:
+    return {
+        "etag": response.headers.get("ETag", ""),
+        "last_modified": response.headers.get("Last-Modified", ""),
+    }
+
+
+HOT_SYNC_TTL = timedelta(seconds=config.LAUNCHES_HOT_TTL_SECONDS)
+HOT_SYNC_WINDOW = timedelta(seconds=config.LAUNCHES_HOT_WINDOW_SECONDS)
+
+# Fields requested from the upstream query API: only what the models hold.
+QUERY_FIELDS = {
+    config.LAUNCHES_ENDPOINT: list(LaunchModel.model_fields),
+    config.ROCKETS_ENDPOINT: list(RocketModel.model_fields),
+    config.LAUNCHPADS_ENDPOINT: list(LaunchpadModel.model_fields),
+}
+
+
+def query_request(endpoint: str, query: Dict[str, Any], page: int) -> Dict[str, Any]:
+    """
+    Body of one ``POST <endpoint>/query`` page. Results are sorted by id so
+    pages fetched concurrently don't shift under each other.
+    """
+    return {
+        "query": query,
+        "options": {
+            "select": QUERY_FIELDS[endpoint],
+            "sort": {"_id": "asc"},
+            "pagination": True,
+            "page": page,
+            "limit": config.UPSTREAM_QUERY_PAGE_SIZE,
+        },
+    }
+
+
+def merge_query_pages(pages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    docs: Dict[str, Dict[str, Any]] = {}
+    for page in pages:
+        for doc in page["docs"]:
+            docs[doc["id"]] = doc
+    return list(docs.values())
+
+
+def launch_version(data_version: str) -> str:
+    """
+    The launch table's part of a data version token, which joins the launch,
+    rocket and launchpad table versions in that order.
+    """
+    return data_version.split("|", 1)[0]
+
+
+def hot_launch_query(hot_ids: List[str]) -> Dict[str, Any]:
+    return {"$or": [{"upcoming": True}, {"_id": {"$in": sorted(hot_ids)}}]}
+
+
+def query_call(endpoint: str, query: Dict[str, Any], page: int) -> Dict[str, Any]:
+    """
+    Arguments of the HTTP ``post`` fetching one page of a query.
+    """
+    return {"url": f"{endpoint}/query", "json": query_request(endpoint, query, page)}
+
+
+def response_json(response: httpx.Response) -> Dict[str, Any]:
+    response.raise_for_status()
+    return response.json()
+
+
+def remaining_pages(first: Dict[str, Any]) -> range:
+    """
+    Pages of a query left after the first one. Clients fetch them at most
+    UPSTREAM_QUERY_CONCURRENCY at a time and merge them with
+    ``merge_query_pages``.
+    """
+    return range(2, first.get("totalPages", 1) + 1)
+
+
+def claim_refresh(cache: ICache, deadline: float) -> Optional[bool]:
+    """
+    One attempt at a table's refresh lease. Returns True once it is held,
+    False when the caller should stop waiting (the table already has data
+    or the deadline passed) and None to poll again.
+    """
+    if cache.acquire_lease(LEASE_OWNER, config.REFRESH_LEASE_SECONDS):
+        return True
+    if cache.version() is not None or time.monotonic() > deadline:
+        return False
+    return None
+
+
+def claim_hot_sync(cache: ICache) -> bool:
+    """
+    Takes the launch table's lease if its hot rows are still due a sync,
+    returning whether the lease is now held.
+    """
+    if not cache.acquire_lease(LEASE_OWNER, config.REFRESH_LEASE_SECONDS):
+        return False
+    if cache.is_stale(HOT_SYNC, HOT_SYNC_TTL):
+        return True
+    cache.release_lease(LEASE_OWNER)
+    return False
+
+
+def store_items(
+    cache: ICache,
+    endpoint: str,
+    items: List[Dict[str, Any]],
+    validators: Dict[str, str],
+) -> List[Dict[str, Any]]:
+    result = cache.sync(items, validators=validators)
+    logger.info("Synced %s: %s", endpoint, result)
+    return items
+
+
+def store_response(
+    cache: ICache, endpoint: str, response: httpx.Response
+) -> Optional[List[Dict[str, Any]]]:
+    """
+    Applies a full-table GET to the cache. A 304 only extends the table's
+    TTL and returns None; otherwise the rows are synced and returned.
+    """
+    if response.status_code == 304:
+        logger.info("%s not modified, extending cache TTL.", endpoint)
+        cache.touch()
+        return None
+    response.raise_for_status()
+    return store_items(
+        cache, endpoint, response.json(), validators=response_validators(response)
+    )
+
+
+def pending_hot_ids(hot_ids: List[str], upcoming: List[Dict[str, Any]]) -> List[str]:
+    """
+    Hot launches missing from the upcoming list, fetched one at a time.
+    """
+    return sorted(set(hot_ids) - {launch["id"] for launch in upcoming})
+
+
+def store_hot_launches(
+    cache: ICache,
+    launches: List[Dict[str, Any]],
+    responses: Sequence[httpx.Response] = (),
+) -> None:
+    """
+    Syncs hot launches without pruning the rest of the table, adding those
+    fetched one at a time. Launches deleted upstream (404) are skipped.
+    """
+    launches = list(launches)
+    for response in responses:
+        if response.status_code == 404:
+            continue
+        response.raise_for_status()
+        launches.append(response.json())
+    result = cache.sync(launches, prune=False)
+    logger.info("Hot-synced launches: %s", result)
+
 
 class ISpaceXLaunchTracker(ABC):
     """
@@ -28,56 +213,449 @@ class ISpaceXLaunchTracker(ABC):
     def get_launchpads(self) -> List[Dict[str, Any]]:
         raise NotImplementedError
 
+    @abstractmethod
+    def get_data_version(self) -> str:
+        raise NotImplementedError
+
+    def get_launch_rows(self) -> List[Dict[str, Any]]:
+        """
+        Returns launches with at least their hot fields decoded; the rest of
+        each payload may be left as JSON text under ``data``.
+        """
+        return self.get_launches()
+
+    def get_launch_changes(self, since: str, until: str) -> Optional[SyncResult]:
+        """
+        Returns the ids of launches inserted, updated or removed between two
+        data versions, or ``None`` if the delta is not known.
+        """
+        return None
+
+
+class IAsyncSpaceXLaunchTracker(ABC):
+    """
+    Abstract interface for trackers that can be awaited from the routes.
+    """
+
+    @abstractmethod
+    async def get_launches(self) -> List[Dict[str, Any]]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_rockets(self) -> List[Dict[str, Any]]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_launchpads(self) -> List[Dict[str, Any]]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_data_version(self) -> str:
+        raise NotImplementedError
+
+    async def get_launch_rows(self) -> List[Dict[str, Any]]:
+        return await self.get_launches()
+
+    async def get_launch_changes(self, since: str, until: str) -> Optional[SyncResult]:
+        return None
+
+    @abstractmethod
+    async def aclose(self) -> None:
+        raise NotImplementedError
+
 
 class SpaceXLaunchTrackerFactory:
+    @staticmethod
+    def get_caches() -> Dict[str, SQLiteCache]:
+        return {
+            "launch_cache": SQLiteCache(
+                table="launches",
+                ttl_seconds=config.LAUNCHES_TTL_SECONDS,
+                columns=LAUNCH_COLUMNS,
+                search_fields=LAUNCH_SEARCH_FIELDS,
+            ),
+            "rocket_cache": SQLiteCache(
+                table="rockets",
+                ttl_seconds=config.ROCKETS_TTL_SECONDS,
+                columns=NAME_COLUMNS,
+            ),
+            "launchpad_cache": SQLiteCache(
+                table="launchpads",
+                ttl_seconds=config.LAUNCHPADS_TTL_SECONDS,
+                columns=NAME_COLUMNS,
+            ),
+        }
+
     @staticmethod
     def get_tracker() -> ISpaceXLaunchTracker:
-        return SpaceXClient(
-            launch_cache=SQLiteCache(table="launches"),
-            rocket_cache=SQLiteCache(table="rockets"),
-            launchpad_cache=SQLiteCache(table="launchpads"),
-        )
+        return SpaceXClient(**SpaceXLaunchTrackerFactory.get_caches())
+
+    @staticmethod
+    def get_async_tracker() -> IAsyncSpaceXLaunchTracker:
+        return AsyncSpaceXClient(**SpaceXLaunchTrackerFactory.get_caches())
 
 
-class SpaceXClient:
+class _SpaceXClientBase:
+    """
+    Cache wiring shared by the blocking and async clients.
+    """
+
     def __init__(
         self,
-        launch_cache: Optional[ICache] = None,
-        rocket_cache: Optional[SQLiteCache] = None,
-        launchpad_cache: Optional[SQLiteCache] = None,
+        launch_cache: ICache,
+        rocket_cache: ICache,
+        launchpad_cache: ICache,
+        query_api: bool,
     ):
-
-        self._http_client = httpx.Client(timeout=10.0, headers=config.HEADERS)
         self._launch_cache = launch_cache
         self._rocket_cache = rocket_cache
         self._launchpad_cache = launchpad_cache
+        self._query_api = query_api
+
+    @property
+    def _tables(self) -> List[tuple]:
+        return [
+            (self._launch_cache, config.LAUNCHES_ENDPOINT),
+            (self._rocket_cache, config.ROCKETS_ENDPOINT),
+            (self._launchpad_cache, config.LAUNCHPADS_ENDPOINT),
+        ]
+
+
+class SpaceXClient(_SpaceXClientBase, ISpaceXLaunchTracker):
+    def __init__(
+        self,
+        launch_cache: Optional[ICache] = None,
+        rocket_cache: Optional[SQLiteCache] = None,
+        launchpad_cache: Optional[SQLiteCache] = None,
+        query_api: bool = config.UPSTREAM_QUERY_API,
+    ):
+        super().__init__(launch_cache, rocket_cache, launchpad_cache, query_api)
+        self._http_client = httpx.Client(
+            timeout=config.HTTP_TIMEOUT_SECONDS, headers=config.HEADERS
+        )
+        self._flights = SingleFlight()
 
     def get_launches(self) -> List[Dict[str, Any]]:
         if self._launch_cache.is_valid():
+            self._sync_hot_launches()
             logger.info("Using valid cached launch data.")
             return self._launch_cache.load()
-        logger.info("Fetching fresh launch data from API.")
-        response = self._http_client.get(config.LAUNCHES_ENDPOINT)
-        launches = response.json()
-        self._launch_cache.save(launches)
-        return launches
+        return self._refresh(self._launch_cache, config.LAUNCHES_ENDPOINT)
+
+    def get_launch_rows(self) -> List[Dict[str, Any]]:
+        if self._launch_cache.is_valid():
+            self._sync_hot_launches()
+        else:
+            self._refresh(self._launch_cache, config.LAUNCHES_ENDPOINT)
+        return self._launch_cache.load_rows()
+
+    def get_launch_changes(self, since: str, until: str) -> Optional[SyncResult]:
+        return self._launch_cache.changes(launch_version(since), launch_version(until))
 
     def get_rockets(self) -> List[Dict[str, Any]]:
         if self._rocket_cache.is_valid():
             logger.info("Using cached rocket data.")
             return self._rocket_cache.load()
-        logger.info("Fetching rocket data from API.")
-        response = self._http_client.get(config.ROCKETS_ENDPOINT)
-        rockets = response.json()
-        self._rocket_cache.save(rockets)
-        return rockets
+        return self._refresh(self._rocket_cache, config.ROCKETS_ENDPOINT)
 
     def get_launchpads(self) -> List[Dict[str, Any]]:
         if self._launchpad_cache.is_valid():
             logger.info("Using cached launchpad data.")
             return self._launchpad_cache.load()
-        logger.info("Fetching launchpad data from API.")
-        response = self._http_client.get(config.LAUNCHPADS_ENDPOINT)
-        pads = response.json()
-        self._launchpad_cache.save(pads)
-        return pads
+        return self._refresh(self._launchpad_cache, config.LAUNCHPADS_ENDPOINT)
+
+    def get_data_version(self) -> str:
+        """
+        Refreshes any expired table and returns a token identifying the cached
+        data, so callers can tell whether anything changed without loading it.
+        """
+        for cache, endpoint in self._tables:
+            if not cache.is_valid():
+                self._refresh(cache, endpoint)
+        self._sync_hot_launches()
+        return "|".join(str(cache.version()) for cache, _ in self._tables)
+
+    def _refresh(self, cache: ICache, endpoint: str) -> List[Dict[str, Any]]:
+        # Threads missing the same table at once share a single refresh.
+        return self._flights.do(endpoint, lambda: self._refresh_once(cache, endpoint))
+
+    def _refresh_once(self, cache: ICache, endpoint: str) -> List[Dict[str, Any]]:
+        deadline = time.monotonic() + config.REFRESH_LEASE_SECONDS
+        while (claimed := claim_refresh(cache, deadline)) is None:
+            time.sleep(LEASE_POLL_SECONDS)
+        if not claimed:
+            # Another worker is refreshing: serve what we have.
+            logger.info("Refresh of %s is running elsewhere.", endpoint)
+            return cache.load()
+
+        try:
+            if cache.is_valid():
+                return cache.load()
+            if self._query_api:
+                logger.info("Querying fresh data from %s/query.", endpoint)
+                return store_items(
+                    cache, endpoint, self._query_all(endpoint, {}), validators={}
+                )
+            logger.info("Fetching fresh data from %s.", endpoint)
+            response = self._http_client.get(
+                endpoint, headers=conditional_headers(cache.validators())
+            )
+            items = store_response(cache, endpoint, response)
+            return cache.load() if items is None else items
+        finally:
+            cache.release_lease(LEASE_OWNER)
+
+    def _query_all(self, endpoint: str, query: Dict[str, Any]) -> List[Dict[str, Any]]:
+        def fetch(page: int) -> Dict[str, Any]:
+            return response_json(
+                self._http_client.post(**query_call(endpoint, query, page))
+            )
+
+        first = fetch(1)
+        with ThreadPoolExecutor(config.UPSTREAM_QUERY_CONCURRENCY) as pool:
+            rest = list(pool.map(fetch, remaining_pages(first)))
+        return merge_query_pages([first, *rest])
+
+    def _sync_hot_launches(self) -> None:
+        """
+        Re-syncs upcoming and recently flown launches on their own, shorter
+        TTL. Failures are logged and the cached rows keep being served.
+        """
+        if not self._launch_cache.is_stale(HOT_SYNC, HOT_SYNC_TTL):
+            return
+        try:
+            self._flights.do(
+                f"{config.LAUNCHES_ENDPOINT}#{HOT_SYNC}", self._sync_hot_launches_once
+            )
+        except Exception as exc:
+            logger.warning("Hot launch sync failed: %s", exc)
+
+    def _sync_hot_launches_once(self) -> None:
+        cache = self._launch_cache
+        if not claim_hot_sync(cache):
+            return
+        try:
+            hot_ids = cache.hot_ids(HOT_SYNC_WINDOW)
+            if self._query_api:
+                store_hot_launches(
+                    cache,
+                    self._query_all(
+                        config.LAUNCHES_ENDPOINT, hot_launch_query(hot_ids)
+                    ),
+                )
+                return
+            response = self._http_client.get(config.UPCOMING_LAUNCHES_ENDPOINT)
+            launches = response_json(response)
+            responses = [
+                self._http_client.get(f"{config.LAUNCHES_ENDPOINT}/{launch_id}")
+                for launch_id in pending_hot_ids(hot_ids, launches)
+            ]
+            store_hot_launches(cache, launches, responses)
+        finally:
+            cache.release_lease(LEASE_OWNER)
+
+
+class AsyncSpaceXClient(_SpaceXClientBase, IAsyncSpaceXLaunchTracker):
+    """
+    Non-blocking tracker sharing one pooled connection for all endpoints.
+
+    Expired tables that still hold data are served as-is while a background
+    task refreshes them (stale-while-revalidate); only an empty table makes
+    the caller wait for the upstream API.
+    """
+
+    def __init__(
+        self,
+        launch_cache: ICache,
+        rocket_cache: ICache,
+        launchpad_cache: ICache,
+        http_client: Optional[httpx.AsyncClient] = None,
+        query_api: bool = config.UPSTREAM_QUERY_API,
+    ):
+        super().__init__(launch_cache, rocket_cache, launchpad_cache, query_api)
+        self._http_client = http_client or httpx.AsyncClient(
+            timeout=config.HTTP_TIMEOUT_SECONDS,
+            headers=config.HEADERS,
+            limits=httpx.Limits(
+                max_connections=config.HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=config.HTTP_MAX_CONNECTIONS,
+            ),
+        )
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._background: Set[asyncio.Task] = set()
+
+    async def get_launches(self) -> List[Dict[str, Any]]:
+        return await self._get(self._launch_cache, config.LAUNCHES_ENDPOINT)
+
+    async def get_launch_rows(self) -> List[Dict[str, Any]]:
+        await self._ensure_available(self._launch_cache, config.LAUNCHES_ENDPOINT)
+        return await asyncio.to_thread(self._launch_cache.load_rows)
+
+    async def get_launch_changes(self, since: str, until: str) -> Optional[SyncResult]:
+        return await asyncio.to_thread(
+            self._launch_cache.changes, launch_version(since), launch_version(until)
+        )
+
+    async def get_rockets(self) -> List[Dict[str, Any]]:
+        return await self._get(self._rocket_cache, config.ROCKETS_ENDPOINT)
+
+    async def get_launchpads(self) -> List[Dict[str, Any]]:
+        return await self._get(self._launchpad_cache, config.LAUNCHPADS_ENDPOINT)
+
+    async def get_data_version(self) -> str:
+        """
+        Returns the version token of the cached data, fetching only tables
+        that are still empty and revalidating expired ones in the background.
+        """
+        await asyncio.gather(
+            *(
+                self._ensure_available(cache, endpoint)
+                for cache, endpoint in self._tables
+            )
+        )
+        return await asyncio.to_thread(
+            lambda: "|".join(str(cache.version()) for cache, _ in self._tables)
+        )
+
+    async def refresh(self) -> None:
+        """
+        Fetches every table concurrently, regardless of its expiry.
+        """
+        await asyncio.gather(
+            *(self._refresh(cache, endpoint) for cache, endpoint in self._tables)
+        )
+
+    def refresh_in_background(self) -> None:
+        for cache, endpoint in self._tables:
+            self._schedule(self._refresh_expired(cache, endpoint))
+
+    async def _refresh_expired(self, cache: ICache, endpoint: str) -> None:
+        if not await asyncio.to_thread(cache.is_valid):
+            await self._refresh(cache, endpoint)
+
+    async def aclose(self) -> None:
+        for task in list(self._background):
+            task.cancel()
+        await self._http_client.aclose()
+
+    async def _get(self, cache: ICache, endpoint: str) -> List[Dict[str, Any]]:
+        await self._ensure_available(cache, endpoint)
+        return await asyncio.to_thread(cache.load)
+
+    def _cache_state(self, cache: ICache) -> Tuple[bool, bool, bool]:
+        """
+        Returns whether a table is valid, due a hot sync and empty. Reads the
+        database, so it is run off the event loop.
+        """
+        if cache.is_valid():
+            hot_stale = cache is self._launch_cache and cache.is_stale(
+                HOT_SYNC, HOT_SYNC_TTL
+            )
+            return True, hot_stale, False
+        return False, False, cache.version() is None
+
+    async def _ensure_available(self, cache: ICache, endpoint: str) -> None:
+        valid, hot_stale, empty = await asyncio.to_thread(self._cache_state, cache)
+        if valid:
+            if hot_stale:
+                self._schedule(
+                    self._single_flight(
+                        f"{endpoint}#{HOT_SYNC}", self._sync_hot_launches
+                    )
+                )
+            return
+        if empty:
+            logger.info("Cache for %s is empty, fetching now.", endpoint)
+            await self._refresh(cache, endpoint)
+            return
+        logger.info("Serving stale data for %s while revalidating.", endpoint)
+        self._schedule(self._refresh(cache, endpoint))
+
+    def _schedule(self, coro) -> None:
+        task = asyncio.ensure_future(coro)
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+        task.add_done_callback(self._log_failure)
+
+    @staticmethod
+    def _log_failure(task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Background refresh failed: %s", task.exception())
+
+    async def _refresh(self, cache: ICache, endpoint: str) -> None:
+        await self._single_flight(endpoint, lambda: self._fetch(cache, endpoint))
+
+    async def _single_flight(self, key: str, factory) -> None:
+        # Concurrent callers for the same key share one upstream request.
+        task = self._inflight.get(key)
+        if task is None or task.done():
+            task = asyncio.ensure_future(factory())
+            self._inflight[key] = task
+        await asyncio.shield(task)
+
+    async def _fetch(self, cache: ICache, endpoint: str) -> None:
+        deadline = time.monotonic() + config.REFRESH_LEASE_SECONDS
+        while (
+            claimed := await asyncio.to_thread(claim_refresh, cache, deadline)
+        ) is None:
+            await asyncio.sleep(LEASE_POLL_SECONDS)
+        if not claimed:
+            # Another worker holds the lease; its result lands in the shared DB.
+            return
+
+        try:
+            if await asyncio.to_thread(cache.is_valid):
+                return
+            if self._query_api:
+                logger.info("Querying fresh data from %s/query.", endpoint)
+                items = await self._query_all(endpoint, {})
+                await asyncio.to_thread(store_items, cache, endpoint, items, {})
+                return
+            logger.info("Fetching fresh data from %s.", endpoint)
+            validators = await asyncio.to_thread(cache.validators)
+            response = await self._http_client.get(
+                endpoint, headers=conditional_headers(validators)
+            )
+            await asyncio.to_thread(store_response, cache, endpoint, response)
+        finally:
+            await asyncio.to_thread(cache.release_lease, LEASE_OWNER)
+
+    async def _query_all(
+        self, endpoint: str, query: Dict[str, Any]
+    ) -> List[Dict[str, Any]]:
+        semaphore = asyncio.Semaphore(config.UPSTREAM_QUERY_CONCURRENCY)
+
+        async def fetch(page: int) -> Dict[str, Any]:
+            async with semaphore:
+                response = await self._http_client.post(
+                    **query_call(endpoint, query, page)
+                )
+            return response_json(response)
+
+        first = await fetch(1)
+        rest = await asyncio.gather(*(fetch(page) for page in remaining_pages(first)))
+        return merge_query_pages([first, *rest])
+
+    async def _sync_hot_launches(self) -> None:
+        cache = self._launch_cache
+        if not await asyncio.to_thread(claim_hot_sync, cache):
+            return
+        try:
+            hot_ids = await asyncio.to_thread(cache.hot_ids, HOT_SYNC_WINDOW)
+            if self._query_api:
+                launches = await self._query_all(
+                    config.LAUNCHES_ENDPOINT, hot_launch_query(hot_ids)
+                )
+                await asyncio.to_thread(store_hot_launches, cache, launches)
+                return
+            response = await self._http_client.get(config.UPCOMING_LAUNCHES_ENDPOINT)
+            launches = response_json(response)
+            responses = await asyncio.gather(
+                *(
+                    self._http_client.get(f"{config.LAUNCHES_ENDPOINT}/{launch_id}")
+                    for launch_id in pending_hot_ids(hot_ids, launches)
+                )
+            )
+            await asyncio.to_thread(store_hot_launches, cache, launches, responses)
+        finally:
+            await asyncio.to_thread(cache.release_lease, LEASE_OWNER)
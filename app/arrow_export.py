@@ -0,0 +1,67 @@
+from typing import Sequence
+
+import numpy as np
+
+from app.columnar import SUCCESS_UNKNOWN, LaunchColumns
+from app.records import LaunchRecord
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # binary exports are only offered when pyarrow is installed
+    pa = None
+    pq = None
+
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+PARQUET_MEDIA_TYPE = "application/vnd.apache.parquet"
+
+
+def arrow_available() -> bool:
+    return pa is not None
+
+
+def build_launch_table(
+    launches: Sequence[LaunchRecord], columns: LaunchColumns, positions: Sequence[int]
+) -> "pa.Table":
+    """
+    Builds a typed Arrow table for the launches at ``positions``.
+
+    Dates, success, rocket and launchpad come straight from the snapshot's
+    columnar arrays; rocket and launchpad are dictionary-encoded.
+    """
+    rows = np.asarray(positions, dtype=np.int64)
+    success = columns.success[rows]
+    return pa.table(
+        {
+            "id": pa.array([launches[i].id for i in rows], pa.string()),
+            "name": pa.array([launches[i].name for i in rows], pa.string()),
+            "date_utc": pa.array(columns.timestamps[rows], pa.timestamp("s", tz="UTC")),
+            "success": pa.array(
+                success == 1, pa.bool_(), mask=success == SUCCESS_UNKNOWN
+            ),
+            "rocket": pa.DictionaryArray.from_arrays(
+                columns.rocket_codes[rows], pa.array(columns.rocket_names, pa.string())
+            ),
+            "launchpad": pa.DictionaryArray.from_arrays(
+                columns.launchpad_codes[rows],
+                pa.array(columns.launchpad_names, pa.string()),
+            ),
+            "flight_number": pa.array(
+                [launches[i].flight_number for i in rows], pa.int64()
+            ),
+            "upcoming": pa.array([launches[i].upcoming for i in rows], pa.bool_()),
+        }
+    )
+
+
+def to_arrow_ipc(table: "pa.Table") -> bytes:
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def to_parquet(table: "pa.Table") -> bytes:
+    sink = pa.BufferOutputStream()
+    pq.write_table(table, sink)
+    return sink.getvalue().to_pybytes()
@@ -1,12 +1,95 @@
+import hashlib
 import json
 import os
 import sqlite3
+import threading
+import time
+import uuid
 from abc import ABC, abstractmethod
+from contextlib import contextmanager
 from datetime import datetime, timedelta
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Sequence
 
 from app.settings import config
 
+SQLITE_BUSY_TIMEOUT_SECONDS = 10.0
+
+# Sync tiers: a full sync covers every row, a hot sync only the rows that are
+# still likely to change (upcoming or recently modified launches).
+FULL_SYNC = "full"
+HOT_SYNC = "hot"
+
+VALIDATOR_KEYS = ("etag", "last_modified")
+
+# Sync deltas journaled per table, so a reader a few versions behind can catch
+# up on just the changed rows.
+CHANGE_LOG_SIZE = 64
+
+
+class HotColumn(NamedTuple):
+    """
+    Top-level item field copied into its own column next to the JSON blob.
+
+    ``type`` is an SQLite column type; ``BOOLEAN`` values are read back as
+    ``bool`` (or ``None``).
+    """
+
+    name: str
+    type: str
+    indexed: bool = False
+
+
+# Fields that filters, statistics and the launch snapshot need, so they can be
+# read without decoding each launch's full payload.
+LAUNCH_COLUMNS = (
+    HotColumn("name", "TEXT"),
+    HotColumn("date_utc", "TEXT", indexed=True),
+    HotColumn("success", "BOOLEAN", indexed=True),
+    HotColumn("upcoming", "BOOLEAN"),
+    HotColumn("rocket", "TEXT", indexed=True),
+    HotColumn("launchpad", "TEXT", indexed=True),
+    HotColumn("flight_number", "INTEGER"),
+)
+# Rockets and launchpads are joined to launches by name.
+NAME_COLUMNS = (HotColumn("name", "TEXT"),)
+# Launch fields kept in a full-text index for ``/launches/?q=``.
+LAUNCH_SEARCH_FIELDS = ("name", "details")
+
+# One connection per (thread, database file), reused by every cache table.
+_thread_local = threading.local()
+
+
+def get_connection(db_path: str) -> sqlite3.Connection:
+    connections = getattr(_thread_local, "connections", None)
+    if connections is None:
+        connections = _thread_local.connections = {}
+    conn = connections.get(db_path)
+    if conn is None:
+        conn = sqlite3.connect(
+            db_path, timeout=SQLITE_BUSY_TIMEOUT_SECONDS, isolation_level=None
+        )
+        # WAL lets readers keep serving the last committed table while a
+        # refresh is being written.
+        conn.execute("PRAGMA journal_mode=WAL;")
+        conn.execute("PRAGMA synchronous=NORMAL;")
+        connections[db_path] = conn
+    return conn
+
+
+class SyncResult(NamedTuple):
+    inserted: List[str]
+    updated: List[str]
+    removed: List[str]
+    unchanged: int
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.inserted or self.updated or self.removed)
+
+
+def content_hash(serialized: str) -> str:
+    return hashlib.sha1(serialized.encode("utf-8")).hexdigest()
+
 
 class ICache(ABC):
     """
@@ -21,10 +104,61 @@ class ICache(ABC):
     def load(self) -> List[Dict[str, Any]]:
         raise NotImplementedError
 
+    @abstractmethod
+    def load_rows(
+        self,
+        where: str = "",
+        params: Sequence[Any] = (),
+        order_by: str = "id",
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        raise NotImplementedError
+
     @abstractmethod
     def save(self, data: List[Dict[str, Any]]) -> None:
         raise NotImplementedError
 
+    @abstractmethod
+    def sync(
+        self,
+        items: List[Dict[str, Any]],
+        prune: bool = True,
+        validators: Optional[Dict[str, str]] = None,
+    ) -> SyncResult:
+        raise NotImplementedError
+
+    @abstractmethod
+    def changes(self, since: str, until: str) -> Optional[SyncResult]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def validators(self) -> Dict[str, str]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def touch(self) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def is_stale(self, tier: str, ttl: timedelta) -> bool:
+        raise NotImplementedError
+
+    @abstractmethod
+    def hot_ids(self, window: timedelta) -> List[str]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def version(self) -> Optional[str]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def acquire_lease(self, owner: str, ttl_seconds: float) -> bool:
+        raise NotImplementedError
+
+    @abstractmethod
+    def release_lease(self, owner: str) -> None:
+        raise NotImplementedError
+
 
 class SQLiteCache(ICache):
 
@@ -32,48 +166,487 @@ class SQLiteCache(ICache):
         self,
         table: str,
         db_path: str = config.DB_PATH,
-        ttl_hours: int = config.CACHE_TTL_SECONDS,
+        ttl_seconds: float = config.CACHE_TTL_SECONDS,
+        columns: Sequence[HotColumn] = (),
+        search_fields: Sequence[str] = (),
     ):
         self.db_path = db_path
         self.table = table
-        self.ttl = timedelta(hours=ttl_hours)
+        self.columns = tuple(columns)
+        self.search_fields = tuple(search_fields)
+        self.ttl = timedelta(seconds=ttl_seconds)
         self._ensure_table()
 
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        conn = get_connection(self.db_path)
+        conn.execute("BEGIN IMMEDIATE;")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK;")
+            raise
+        conn.execute("COMMIT;")
+
     def _ensure_table(self):
-        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute(
-                f"""
+        os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+        with self._transaction() as conn:
+            conn.execute(f"""
                 CREATE TABLE IF NOT EXISTS {self.table} (
                     id TEXT PRIMARY KEY,
                     data TEXT NOT NULL,
-                    timestamp DATETIME NOT NULL
+                    timestamp DATETIME NOT NULL,
+                    content_hash TEXT
                 );
-            """
+            """)
+            columns = {
+                row[1] for row in conn.execute(f"PRAGMA table_info({self.table});")
+            }
+            if "content_hash" not in columns:
+                conn.execute(f"ALTER TABLE {self.table} ADD COLUMN content_hash TEXT;")
+            for column in self.columns:
+                if column.name not in columns:
+                    conn.execute(
+                        f"ALTER TABLE {self.table} "
+                        f"ADD COLUMN {column.name} {column.type};"
+                    )
+                    # Backfill rows cached before the column existed.
+                    conn.execute(
+                        f"UPDATE {self.table} "
+                        f"SET {column.name} = json_extract(data, '$.{column.name}');"
+                    )
+                if column.indexed:
+                    conn.execute(
+                        f"CREATE INDEX IF NOT EXISTS "
+                        f"{self.table}_{column.name}_idx "
+                        f"ON {self.table} ({column.name});"
+                    )
+            if self.search_fields:
+                self._ensure_search_table(conn)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS cache_meta (
+                    name TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    PRIMARY KEY (name, key)
+                );
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS cache_changes (
+                    name TEXT NOT NULL,
+                    version TEXT NOT NULL,
+                    previous TEXT,
+                    inserted TEXT NOT NULL,
+                    updated TEXT NOT NULL,
+                    removed TEXT NOT NULL,
+                    PRIMARY KEY (name, version)
+                );
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS refresh_leases (
+                    name TEXT PRIMARY KEY,
+                    owner TEXT NOT NULL,
+                    expires_at REAL NOT NULL
+                );
+            """)
+
+    @property
+    def search_table(self) -> str:
+        return f"{self.table}_fts"
+
+    def _ensure_search_table(self, conn: sqlite3.Connection) -> None:
+        """
+        Creates the FTS5 index of ``search_fields``, keyed by the rowid of
+        each cached row, and fills it from rows cached before it existed.
+        """
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = ?;", (self.search_table,)
+        ).fetchone()
+        if exists:
+            return
+        conn.execute(
+            f"CREATE VIRTUAL TABLE {self.search_table} "
+            f"USING fts5({', '.join(self.search_fields)}, tokenize='unicode61');"
+        )
+        self._index_rows(conn)
+
+    def _index_rows(
+        self, conn: sqlite3.Connection, ids: Optional[Sequence[str]] = None
+    ) -> None:
+        """
+        Adds the given rows (default: all) to the full-text index.
+        """
+        sql = (
+            f"INSERT INTO {self.search_table} "
+            f"(rowid, {', '.join(self.search_fields)}) "
+            f"SELECT rowid, "
+            f"{', '.join(self._column_sql(name) for name in self.search_fields)} "
+            f"FROM {self.table}"
+        )
+        if ids is None:
+            conn.execute(f"{sql};")
+        else:
+            conn.executemany(f"{sql} WHERE id = ?;", [(i,) for i in ids])
+
+    def _unindex_rows(self, conn: sqlite3.Connection, ids: Sequence[str]) -> None:
+        conn.executemany(
+            f"DELETE FROM {self.search_table} "
+            f"WHERE rowid = (SELECT rowid FROM {self.table} WHERE id = ?);",
+            [(i,) for i in ids],
+        )
+
+    def _get_meta(self, key: str) -> Optional[str]:
+        row = (
+            get_connection(self.db_path)
+            .execute(
+                "SELECT value FROM cache_meta WHERE name = ? AND key = ?;",
+                (self.table, key),
             )
+            .fetchone()
+        )
+        return row[0] if row else None
+
+    def _set_meta(self, conn: sqlite3.Connection, **values: str) -> None:
+        conn.executemany(
+            "INSERT OR REPLACE INTO cache_meta (name, key, value) VALUES (?, ?, ?);",
+            [(self.table, key, value) for key, value in values.items()],
+        )
+
+    def last_synced(self, tier: str = FULL_SYNC) -> Optional[datetime]:
+        value = self._get_meta(f"synced_at:{tier}")
+        return datetime.fromisoformat(value) if value else None
+
+    def is_stale(self, tier: str, ttl: timedelta) -> bool:
+        last_synced = self.last_synced(tier)
+        return last_synced is None or datetime.utcnow() - last_synced >= ttl
 
     def is_valid(self) -> bool:
-        with sqlite3.connect(self.db_path) as conn:
-            cur = conn.execute(
-                f"SELECT timestamp FROM {self.table} ORDER BY timestamp DESC LIMIT 1;"
-            )
-            row = cur.fetchone()
-            if not row:
-                return False
-            last_updated = datetime.fromisoformat(row[0])
-            return datetime.utcnow() - last_updated < self.ttl
+        return not self.is_stale(FULL_SYNC, self.ttl)
+
+    def version(self) -> Optional[str]:
+        """
+        Returns a token that changes whenever a write alters the stored rows.
+        """
+        return self._get_meta("version")
 
     def load(self) -> List[Dict[str, Any]]:
-        with sqlite3.connect(self.db_path) as conn:
-            cur = conn.execute(f"SELECT data FROM {self.table} ORDER BY id ASC;")
-            return [json.loads(row[0]) for row in cur.fetchall()]
+        cur = get_connection(self.db_path).execute(
+            f"SELECT data FROM {self.table} ORDER BY id ASC;"
+        )
+        return [json.loads(row[0]) for row in cur.fetchall()]
+
+    def load_rows(
+        self,
+        where: str = "",
+        params: Sequence[Any] = (),
+        order_by: str = "id",
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Returns the id, content hash and hot columns of the rows matching the
+        optional SQL ``where`` clause, with the full payload left as undecoded
+        JSON text under ``data``.
+        """
+        sql = f"SELECT {self._row_columns} FROM {self.table}"
+        if where:
+            sql += f" WHERE {where}"
+        sql += f" ORDER BY {order_by}"
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+        return self._read_rows(f"{sql};", params)
+
+    def search_rows(
+        self,
+        match: str,
+        weights: Sequence[float] = (),
+        where: str = "",
+        params: Sequence[Any] = (),
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Returns rows like ``load_rows`` for an FTS5 ``match`` expression over
+        ``search_fields``, best BM25 match (with per-field ``weights``) first.
+        """
+        ranking = f"bm25({', '.join([self.search_table, *map(str, weights)])})"
+        sql = (
+            f"SELECT {self._row_columns} FROM {self.search_table} "
+            f"JOIN {self.table} ON {self.table}.rowid = {self.search_table}.rowid "
+            f"WHERE {self.search_table} MATCH ?"
+        )
+        if where:
+            sql += f" AND {where}"
+        sql += f" ORDER BY {ranking}, {self.table}.id"
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+        return self._read_rows(f"{sql};", (match, *params))
+
+    @property
+    def _row_columns(self) -> str:
+        names = ["id", "content_hash", *(column.name for column in self.columns)]
+        return ", ".join(f"{self.table}.{name}" for name in [*names, "data"])
+
+    def _read_rows(self, sql: str, params: Sequence[Any]) -> List[Dict[str, Any]]:
+        names = ["id", "content_hash", *(column.name for column in self.columns)]
+        booleans = [c.name for c in self.columns if c.type == "BOOLEAN"]
+        cur = get_connection(self.db_path).execute(sql, tuple(params))
+        rows = []
+        for values in cur.fetchall():
+            row = dict(zip(names, values))
+            for name in booleans:
+                if row[name] is not None:
+                    row[name] = bool(row[name])
+            row["data"] = values[-1]
+            rows.append(row)
+        return rows
+
+    def _row(self, item: Dict[str, Any], data: str, now: str) -> tuple:
+        return (
+            item["id"],
+            data,
+            now,
+            content_hash(data),
+            *(item.get(column.name) for column in self.columns),
+        )
+
+    @property
+    def _insert_sql(self) -> str:
+        names = ["id", "data", "timestamp", "content_hash"]
+        names += [column.name for column in self.columns]
+        return (
+            f"INSERT INTO {self.table} ({', '.join(names)}) "
+            f"VALUES ({', '.join('?' * len(names))})"
+        )
+
+    def _column_sql(self, name: str) -> str:
+        """
+        SQL expression for a top-level field, preferring its hot column.
+        """
+        if any(column.name == name for column in self.columns):
+            return name
+        return f"json_extract(data, '$.{name}')"
 
     def save(self, items: List[Dict[str, Any]]) -> None:
-        with sqlite3.connect(self.db_path) as conn:
+        """
+        Replaces the table contents in a single transaction, so concurrent
+        readers see either the previous rows or the new ones, never a mix.
+        """
+        now = datetime.utcnow().isoformat()
+        rows = [
+            self._row(item, json.dumps(item, sort_keys=True), now) for item in items
+        ]
+        with self._transaction() as conn:
             conn.execute(f"DELETE FROM {self.table};")
-            now = datetime.utcnow().isoformat()
-            for item in items:
-                conn.execute(
-                    f"INSERT INTO {self.table} (id, data, timestamp) VALUES (?, ?, ?);",
-                    (item["id"], json.dumps(item), now),
+            conn.executemany(f"{self._insert_sql};", rows)
+            if self.search_fields:
+                conn.execute(f"DELETE FROM {self.search_table};")
+                self._index_rows(conn)
+            self._set_meta(
+                conn,
+                version=uuid.uuid4().hex,
+                **{f"synced_at:{FULL_SYNC}": now, f"synced_at:{HOT_SYNC}": now},
+            )
+
+    def sync(
+        self,
+        items: List[Dict[str, Any]],
+        prune: bool = True,
+        validators: Optional[Dict[str, str]] = None,
+    ) -> SyncResult:
+        """
+        Upserts only the rows whose content hash changed. With ``prune`` the
+        items are treated as the complete collection (a full sync) and rows
+        missing from it are deleted; otherwise it is a hot sync of a subset.
+        HTTP ``validators`` of the full collection are stored alongside.
+        """
+        now = datetime.utcnow().isoformat()
+        incoming = {}
+        for item in items:
+            row = self._row(item, json.dumps(item, sort_keys=True), now)
+            incoming[row[0]] = row
+
+        updates = ["data", "timestamp", "content_hash"]
+        updates += [column.name for column in self.columns]
+        with self._transaction() as conn:
+            existing = dict(conn.execute(f"SELECT id, content_hash FROM {self.table};"))
+            changed = [
+                row
+                for item_id, row in incoming.items()
+                if existing.get(item_id) != row[3]
+            ]
+            removed = [i for i in existing if i not in incoming] if prune else []
+            if self.search_fields:
+                self._unindex_rows(
+                    conn, [row[0] for row in changed if row[0] in existing] + removed
                 )
+
+            conn.executemany(
+                f"""
+                {self._insert_sql}
+                ON CONFLICT(id) DO UPDATE SET
+                    {", ".join(f"{name} = excluded.{name}" for name in updates)};
+                """,
+                changed,
+            )
+            conn.executemany(
+                f"DELETE FROM {self.table} WHERE id = ?;",
+                [(item_id,) for item_id in removed],
+            )
+            if self.search_fields:
+                self._index_rows(conn, [row[0] for row in changed])
+
+            meta = {f"synced_at:{HOT_SYNC}": now}
+            if prune:
+                meta[f"synced_at:{FULL_SYNC}"] = now
+            inserted = [row[0] for row in changed if row[0] not in existing]
+            updated = [row[0] for row in changed if row[0] in existing]
+            if changed or removed:
+                meta["version"] = uuid.uuid4().hex
+                self._journal(conn, meta["version"], inserted, updated, removed)
+            if validators is not None:
+                meta.update({key: validators.get(key, "") for key in VALIDATOR_KEYS})
+            self._set_meta(conn, **meta)
+
+        return SyncResult(inserted, updated, removed, len(incoming) - len(changed))
+
+    def _journal(
+        self,
+        conn: sqlite3.Connection,
+        version: str,
+        inserted: List[str],
+        updated: List[str],
+        removed: List[str],
+    ) -> None:
+        """
+        Records the delta from the current version to ``version`` and drops
+        all but the last ``CHANGE_LOG_SIZE`` entries.
+        """
+        conn.execute(
+            "INSERT INTO cache_changes VALUES (?, ?, ?, ?, ?, ?);",
+            (
+                self.table,
+                version,
+                self._get_meta("version"),
+                json.dumps(inserted),
+                json.dumps(updated),
+                json.dumps(removed),
+            ),
+        )
+        conn.execute(
+            """
+            DELETE FROM cache_changes WHERE name = ? AND rowid NOT IN (
+                SELECT rowid FROM cache_changes WHERE name = ?
+                ORDER BY rowid DESC LIMIT ?
+            );
+            """,
+            (self.table, self.table, CHANGE_LOG_SIZE),
+        )
+
+    def changes(self, since: str, until: str) -> Optional[SyncResult]:
+        """
+        Combines the journaled sync deltas that took the table from version
+        ``since`` to ``until``, or returns ``None`` if they are not all
+        journaled (e.g. across a full ``save``). ``unchanged`` is not tracked
+        across versions and is always 0.
+        """
+        cur = get_connection(self.db_path).execute(
+            "SELECT version, previous, inserted, updated, removed "
+            "FROM cache_changes WHERE name = ?;",
+            (self.table,),
+        )
+        journal = {row[0]: row[1:] for row in cur.fetchall()}
+        deltas = []
+        version = until
+        while version != since:
+            if version not in journal:
+                return None
+            version, *delta = journal[version]
+            deltas.append([json.loads(ids) for ids in delta])
+
+        inserted: Dict[str, None] = {}
+        updated: Dict[str, None] = {}
+        removed: Dict[str, None] = {}
+        for step_inserted, step_updated, step_removed in reversed(deltas):
+            for item_id in step_inserted:
+                if item_id in removed:
+                    # Removed and re-inserted: net, the row changed.
+                    del removed[item_id]
+                    updated[item_id] = None
+                else:
+                    inserted[item_id] = None
+            for item_id in step_updated:
+                if item_id not in inserted:
+                    updated[item_id] = None
+            for item_id in step_removed:
+                if item_id in inserted:
+                    del inserted[item_id]
+                else:
+                    updated.pop(item_id, None)
+                    removed[item_id] = None
+        return SyncResult(list(inserted), list(updated), list(removed), 0)
+
+    def validators(self) -> Dict[str, str]:
+        """
+        Returns the ETag/Last-Modified of the last full collection download.
+        """
+        cur = get_connection(self.db_path).execute(
+            f"""
+            SELECT key, value FROM cache_meta
+            WHERE name = ? AND key IN ({", ".join("?" * len(VALIDATOR_KEYS))})
+              AND value != '';
+            """,
+            (self.table, *VALIDATOR_KEYS),
+        )
+        return dict(cur.fetchall())
+
+    def touch(self) -> None:
+        """
+        Extends the TTL without rewriting rows, e.g. after a 304 response.
+        """
+        now = datetime.utcnow().isoformat()
+        with self._transaction() as conn:
+            self._set_meta(
+                conn, **{f"synced_at:{FULL_SYNC}": now, f"synced_at:{HOT_SYNC}": now}
+            )
+
+    def hot_ids(self, window: timedelta) -> List[str]:
+        """
+        Returns ids of launches that are still upcoming or flew within
+        ``window``; their outcome may still change upstream, unlike settled
+        history.
+        """
+        since = (datetime.utcnow() - window).strftime("%Y-%m-%dT%H:%M:%S")
+        cur = get_connection(self.db_path).execute(
+            f"""
+            SELECT id FROM {self.table}
+            WHERE {self._column_sql("upcoming")} = 1
+               OR {self._column_sql("date_utc")} >= ?;
+            """,
+            (since,),
+        )
+        return [row[0] for row in cur.fetchall()]
+
+    def acquire_lease(self, owner: str, ttl_seconds: float) -> bool:
+        """
+        Claims the right to refresh this table, shared by every process using
+        the same database. Expired leases can be taken over by anyone.
+        """
+        now = time.time()
+        cur = get_connection(self.db_path).execute(
+            """
+            INSERT INTO refresh_leases (name, owner, expires_at)
+            VALUES (?, ?, ?)
+            ON CONFLICT(name) DO UPDATE SET
+                owner = excluded.owner,
+                expires_at = excluded.expires_at
+            WHERE refresh_leases.expires_at < ?
+               OR refresh_leases.owner = excluded.owner;
+            """,
+            (self.table, owner, now + ttl_seconds, now),
+        )
+        return cur.rowcount == 1
+
+    def release_lease(self, owner: str) -> None:
+        get_connection(self.db_path).execute(
+            "DELETE FROM refresh_leases WHERE name = ? AND owner = ?;",
+            (self.table, owner),
+        )
@@ -0,0 +1,118 @@
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Sequence, Tuple
+
+import numpy as np
+
+from app.records import LaunchRecord
+
+SUCCESS_UNKNOWN = -1
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def epoch_micros(value: datetime) -> int:
+    """
+    Microseconds since the epoch; naive values are taken as UTC.
+    """
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return (value - EPOCH) // timedelta(microseconds=1)
+
+
+def _encode(values: Sequence[str]) -> Tuple[Tuple[str, ...], np.ndarray]:
+    """
+    Int-codes categorical values in order of first appearance.
+    """
+    codes: Dict[str, int] = {}
+    encoded = np.fromiter(
+        (codes.setdefault(value, len(codes)) for value in values),
+        dtype=np.int32,
+        count=len(values),
+    )
+    return tuple(codes), encoded
+
+
+class LaunchColumns:
+    """
+    Column-oriented copy of a snapshot's launches for vectorized aggregates.
+
+    Rockets and launchpads are int-coded against ``rocket_names`` and
+    ``launchpad_names``; dates are epoch microseconds and seconds (naive
+    values are taken as UTC) and ``success`` is tri-state: 1, 0 or
+    ``SUCCESS_UNKNOWN``.
+    """
+
+    def __init__(self, launches: Sequence[LaunchRecord]):
+        self.size = len(launches)
+        self.ids: Sequence[str] = tuple(launch.id for launch in launches)
+        self.rocket_names, self.rocket_codes = _encode(
+            [launch.rocket.name for launch in launches]
+        )
+        self.launchpad_names, self.launchpad_codes = _encode(
+            [launch.launchpad.name for launch in launches]
+        )
+        self.date_us = np.fromiter(
+            (epoch_micros(launch.date_utc) for launch in launches),
+            dtype=np.int64,
+            count=self.size,
+        )
+        self.timestamps = self.date_us // 1_000_000
+        self.success = np.fromiter(
+            (
+                SUCCESS_UNKNOWN if launch.success is None else int(launch.success)
+                for launch in launches
+            ),
+            dtype=np.int8,
+            count=self.size,
+        )
+        # Months since 1970-01, from which year and month are derived.
+        self.months = (
+            self.timestamps.astype("datetime64[s]")
+            .astype("datetime64[M]")
+            .astype(np.int64)
+        )
+
+    @classmethod
+    def from_arrays(
+        cls,
+        ids: Sequence[str],
+        rocket_names: Sequence[str],
+        rocket_codes: np.ndarray,
+        launchpad_names: Sequence[str],
+        launchpad_codes: np.ndarray,
+        date_us: np.ndarray,
+        timestamps: np.ndarray,
+        success: np.ndarray,
+        months: np.ndarray,
+    ) -> "LaunchColumns":
+        """
+        Wraps existing arrays and ids (e.g. views of a shared snapshot file)
+        as columns without copying them.
+        """
+        columns = cls.__new__(cls)
+        columns.size = len(ids)
+        columns.ids = ids
+        columns.rocket_names = tuple(rocket_names)
+        columns.rocket_codes = rocket_codes
+        columns.launchpad_names = tuple(launchpad_names)
+        columns.launchpad_codes = launchpad_codes
+        columns.date_us = date_us
+        columns.timestamps = timestamps
+        columns.success = success
+        columns.months = months
+        return columns
+
+    @property
+    def years(self) -> np.ndarray:
+        return self.months // 12 + 1970
+
+    def count_by(self, codes: np.ndarray, size: int) -> np.ndarray:
+        return np.bincount(codes, minlength=size)
+
+    def successes_by(self, codes: np.ndarray, size: int) -> np.ndarray:
+        counts = np.bincount(codes, weights=self.success == 1, minlength=size)
+        return counts.astype(np.int64)
+
+
+def month_label(month_index: int) -> str:
+    year, month = divmod(int(month_index), 12)
+    return f"{year + 1970:04d}-{month + 1:02d}"
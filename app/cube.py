@@ -0,0 +1,186 @@
+import calendar
+import logging
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.aggregation import DEFAULT_ROLLING_WINDOW, tabulate, validate
+from app.columnar import LaunchColumns
+from app.index import normalize_name
+from app.settings import config
+from app.utils import parse_date
+
+logger = logging.getLogger(__name__)
+
+# Group-by dimensions a cube can roll up to; weeks cut across its months.
+CUBE_DIMENSIONS = frozenset(("rocket", "launchpad", "year", "quarter", "month"))
+
+# Bytes per cell: month, launches, successes, failures (int64) and the rocket
+# and launchpad codes (int32).
+_CELL_BYTES = 4 * 8 + 2 * 4
+
+
+def _month_start(month: int) -> int:
+    year, index = divmod(int(month), 12)
+    return calendar.timegm((year + 1970, index + 1, 1, 0, 0, 0))
+
+
+def _shape(columns: LaunchColumns) -> Tuple[int, int]:
+    return max(len(columns.rocket_names), 1), max(len(columns.launchpad_names), 1)
+
+
+def _month_of(timestamp: int) -> int:
+    return int(np.datetime64(int(timestamp), "s").astype("datetime64[M]").astype(int))
+
+
+class LaunchCube:
+    """
+    Precomputed launch counts over (year, month, rocket, launchpad, success).
+
+    Cells are keyed by month, rocket and launchpad, and success is folded
+    into each cell's launch, success and failure tallies. Only non-empty
+    cells are stored. Filtered statistics are answered by rolling up the
+    matching cells, which are far fewer than the launches. Date bounds are
+    covered only when no launch falls between a bound and the edge of its
+    month.
+    """
+
+    def __init__(self, columns: LaunchColumns, cells: np.ndarray, inverse: np.ndarray):
+        rockets, launchpads = _shape(columns)
+        self.rocket_names = columns.rocket_names
+        self.launchpad_names = columns.launchpad_names
+        self.size = len(cells)
+        self.months = cells // (rockets * launchpads)
+        self.rocket_codes = (cells // launchpads % rockets).astype(np.int32)
+        self.launchpad_codes = (cells % launchpads).astype(np.int32)
+        self.launches = np.bincount(inverse, minlength=self.size)
+        self.successes = np.bincount(
+            inverse, weights=columns.success == 1, minlength=self.size
+        ).astype(np.int64)
+        self.failures = np.bincount(
+            inverse, weights=columns.success == 0, minlength=self.size
+        ).astype(np.int64)
+        # Sorted launch times, to check that a date bound is month-aligned.
+        self._timestamps = np.sort(columns.timestamps)
+
+    @classmethod
+    def build(
+        cls, columns: LaunchColumns, max_bytes: int = config.STATS_CUBE_MAX_BYTES
+    ) -> Optional["LaunchCube"]:
+        """
+        Builds the cube, or returns ``None`` if it would exceed ``max_bytes``.
+        """
+        rockets, launchpads = _shape(columns)
+        keys = (
+            columns.months.astype(np.int64) * rockets + columns.rocket_codes
+        ) * launchpads + columns.launchpad_codes
+        cells, inverse = np.unique(keys, return_inverse=True)
+        size = len(cells) * _CELL_BYTES + columns.timestamps.nbytes
+        if size > max_bytes:
+            logger.info(
+                "Statistics cube needs %d bytes, over the %d byte budget.",
+                size,
+                max_bytes,
+            )
+            return None
+        return cls(columns, cells, inverse)
+
+    @property
+    def years(self) -> np.ndarray:
+        return self.months // 12 + 1970
+
+    @property
+    def nbytes(self) -> int:
+        arrays = (
+            self.months,
+            self.rocket_codes,
+            self.launchpad_codes,
+            self.launches,
+            self.successes,
+            self.failures,
+            self._timestamps,
+        )
+        return sum(array.nbytes for array in arrays)
+
+    def aggregate(
+        self,
+        group_by: Sequence[str] = (),
+        metrics: Sequence[str] = ("count",),
+        window: int = DEFAULT_ROLLING_WINDOW,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        success: Optional[bool] = None,
+        rocket_name: Optional[str] = None,
+        launchpad_name: Optional[str] = None,
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Same result as ``LaunchSnapshot.aggregate`` for the launches matching
+        the filters, or ``None`` if the cube doesn't cover the query.
+        """
+        validate(group_by, metrics, window)
+        if not CUBE_DIMENSIONS.issuperset(group_by):
+            return None
+        selected = np.ones(self.size, dtype=bool)
+        if start_date:
+            start_at = parse_date(start_date)
+            start = calendar.timegm(start_at.utctimetuple())
+            month = _month_of(start)
+            last = start if start_at.microsecond else start - 1
+            if self._launched_between(_month_start(month), last):
+                return None
+            selected &= self.months >= month
+        if end_date:
+            end = calendar.timegm(parse_date(end_date).utctimetuple())
+            month = _month_of(end)
+            if self._launched_between(end, _month_start(month + 1) - 1):
+                return None
+            selected &= self.months <= month
+        if rocket_name:
+            selected &= np.isin(
+                self.rocket_codes, self._codes(self.rocket_names, rocket_name)
+            )
+        if launchpad_name:
+            selected &= np.isin(
+                self.launchpad_codes, self._codes(self.launchpad_names, launchpad_name)
+            )
+
+        if success is None:
+            launches, successes, failures = (
+                self.launches,
+                self.successes,
+                self.failures,
+            )
+        elif success:
+            launches, successes = self.successes, self.successes
+            failures = np.zeros_like(self.failures)
+        else:
+            launches, failures = self.failures, self.failures
+            successes = np.zeros_like(self.successes)
+
+        rows = np.flatnonzero(selected & (launches > 0))
+        return tabulate(
+            self,
+            rows,
+            group_by,
+            metrics,
+            window,
+            successes[rows],
+            failures[rows],
+            launches[rows],
+        )
+
+    def _launched_between(self, first: int, last: int) -> bool:
+        """
+        Whether any launch time, truncated to whole seconds, falls in
+        [first, last].
+        """
+        lo = np.searchsorted(self._timestamps, first, side="left")
+        hi = np.searchsorted(self._timestamps, last, side="right")
+        return hi > lo
+
+    @staticmethod
+    def _codes(names: Sequence[str], name: str) -> List[int]:
+        wanted = normalize_name(name)
+        return [
+            code for code, value in enumerate(names) if normalize_name(value) == wanted
+        ]
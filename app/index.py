@@ -0,0 +1,245 @@
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.columnar import EPOCH, LaunchColumns, epoch_micros
+from app.records import LaunchRecord
+from app.utils import parse_date
+
+# Keyset pagination key: launches are paged in (date_utc, id) order.
+PageKey = Tuple[datetime, str]
+
+
+def normalize_name(name: str) -> str:
+    return name.lower()
+
+
+class _Candidates:
+    """
+    Positions matching one filter, plus a membership test for them that
+    takes one position or an array of them.
+
+    ``ordered`` holds the same positions in (date_utc, id) order.
+    """
+
+    def __init__(
+        self,
+        positions: np.ndarray,
+        contains: Callable[[np.ndarray], np.ndarray],
+        ordered: Optional[np.ndarray] = None,
+    ):
+        self.positions = positions
+        self.contains = contains
+        self.ordered = positions if ordered is None else ordered
+
+
+class LaunchIndex:
+    """
+    Lookup structures over one snapshot's launches, built once per version.
+
+    Built from the snapshot's columns rather than its records, so launches
+    mapped from a shared file are not materialized. Positions are kept
+    sorted by (``date_utc``, ``id``) for range lookups and keyset
+    pagination, and grouped by normalized rocket name, launchpad name and
+    success. Queries start from the smallest candidate set and probe the
+    others by membership.
+    """
+
+    def __init__(
+        self, launches: Sequence[LaunchRecord], columns: Optional[LaunchColumns] = None
+    ):
+        self._launches = launches
+        self._columns = columns if columns is not None else LaunchColumns(launches)
+        self._by_date = self._date_order()
+        self._dates = self._columns.date_us[self._by_date]
+        self._rank = np.empty(len(self._by_date), dtype=np.int64)
+        self._rank[self._by_date] = np.arange(len(self._by_date))
+        self._by_rocket = self._group(
+            self._columns.rocket_codes, self._columns.rocket_names
+        )
+        self._by_launchpad = self._group(
+            self._columns.launchpad_codes, self._columns.launchpad_names
+        )
+        self._by_success = {
+            success: self._candidates_where(self._columns.success, [int(success)])
+            for success in (True, False)
+        }
+
+    def _date_order(self) -> np.ndarray:
+        """
+        Positions sorted by date, then by id.
+        """
+        return np.lexsort((np.asarray(self._columns.ids), self._columns.date_us))
+
+    def _candidates_where(
+        self, column: np.ndarray, values: Sequence[int]
+    ) -> _Candidates:
+        values = np.asarray(values)
+        ordered = self._by_date[np.isin(column[self._by_date], values)]
+        return _Candidates(
+            np.sort(ordered), lambda i: np.isin(column[i], values), ordered
+        )
+
+    def _group(self, codes: np.ndarray, names: Sequence[str]) -> Dict[str, _Candidates]:
+        """
+        Candidates per normalized name, over the codes of its spellings.
+        """
+        groups: Dict[str, List[int]] = {}
+        for code, name in enumerate(names):
+            groups.setdefault(normalize_name(name), []).append(code)
+        return {
+            name: self._candidates_where(codes, group) for name, group in groups.items()
+        }
+
+    @staticmethod
+    def _hashed(groups: Dict[object, _Candidates], value: object) -> _Candidates:
+        empty = np.empty(0, dtype=np.int64)
+        return groups.get(value) or _Candidates(empty, lambda i: np.zeros_like(i, bool))
+
+    def key(self, position: int) -> PageKey:
+        date_us = int(self._columns.date_us[position])
+        return (
+            EPOCH + timedelta(microseconds=date_us),
+            self._columns.ids[position],
+        )
+
+    def _date_range(
+        self, start_date: Optional[str], end_date: Optional[str]
+    ) -> _Candidates:
+        start = epoch_micros(parse_date(start_date)) if start_date else None
+        end = epoch_micros(parse_date(end_date)) if end_date else None
+        lo = np.searchsorted(self._dates, start, "left") if start is not None else 0
+        hi = (
+            np.searchsorted(self._dates, end, "right")
+            if end is not None
+            else len(self._dates)
+        )
+        date_us = self._columns.date_us
+        low = np.iinfo(np.int64).min if start is None else start
+        high = np.iinfo(np.int64).max if end is None else end
+        ordered = self._by_date[lo:hi]
+        return _Candidates(
+            np.sort(ordered),
+            lambda i: (date_us[i] >= low) & (date_us[i] <= high),
+            ordered,
+        )
+
+    def query(
+        self,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        success: Optional[bool] = None,
+        rocket_name: Optional[str] = None,
+        launchpad_name: Optional[str] = None,
+    ) -> List[LaunchRecord]:
+        """
+        Returns the launches matching every given filter, in snapshot order.
+        """
+        return [
+            self._launches[i]
+            for i in self.positions(
+                start_date, end_date, success, rocket_name, launchpad_name
+            )
+        ]
+
+    def positions(
+        self,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        success: Optional[bool] = None,
+        rocket_name: Optional[str] = None,
+        launchpad_name: Optional[str] = None,
+    ) -> List[int]:
+        candidates = self._candidates(
+            start_date, end_date, success, rocket_name, launchpad_name
+        )
+        if not candidates:
+            return list(range(len(self._launches)))
+
+        driver, probes = candidates[0], candidates[1:]
+        positions = driver.positions
+        for probe in probes:
+            positions = positions[probe.contains(positions)]
+        return positions.tolist()
+
+    def page(
+        self,
+        after: Optional[PageKey],
+        limit: int,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        success: Optional[bool] = None,
+        rocket_name: Optional[str] = None,
+        launchpad_name: Optional[str] = None,
+    ) -> Tuple[List[int], Optional[PageKey]]:
+        """
+        Returns up to ``limit`` matching positions in (date_utc, id) order,
+        strictly after ``after``, and the key of the last one if more follow.
+
+        Only the page itself is visited past the cursor, so the cost depends
+        on ``limit`` and filter selectivity rather than on history length.
+        """
+        candidates = self._candidates(
+            start_date, end_date, success, rocket_name, launchpad_name
+        )
+        if candidates:
+            driver, probes = candidates[0], candidates[1:]
+            ordered = driver.ordered
+        else:
+            ordered, probes = self._by_date, []
+
+        start = 0
+        if after is not None:
+            # Launches ranked below ``floor`` sort at or before the cursor.
+            start = bisect_left(ordered, self._floor(after), key=self._rank.__getitem__)
+
+        found = []
+        for offset in range(start, len(ordered)):
+            position = int(ordered[offset])
+            if all(p.contains(position) for p in probes):
+                if len(found) == limit:
+                    return found, self.key(found[-1])
+                found.append(position)
+        return found, None
+
+    def _floor(self, after: PageKey) -> int:
+        """
+        Number of launches whose (date_utc, id) sorts at or before ``after``.
+        """
+        date, launch_id = after
+        date_us = epoch_micros(date)
+        lo = int(np.searchsorted(self._dates, date_us, "left"))
+        hi = int(np.searchsorted(self._dates, date_us, "right"))
+        ids = self._columns.ids
+        tied = [ids[i] for i in self._by_date[lo:hi]]
+        return lo + bisect_right(tied, launch_id)
+
+    def _candidates(
+        self,
+        start_date: Optional[str],
+        end_date: Optional[str],
+        success: Optional[bool],
+        rocket_name: Optional[str],
+        launchpad_name: Optional[str],
+    ) -> List[_Candidates]:
+        """
+        Candidate sets for the given filters, smallest first.
+        """
+        candidates = []
+        if start_date or end_date:
+            candidates.append(self._date_range(start_date, end_date))
+        if success is not None:
+            candidates.append(self._by_success[success])
+        if rocket_name:
+            candidates.append(
+                self._hashed(self._by_rocket, normalize_name(rocket_name))
+            )
+        if launchpad_name:
+            candidates.append(
+                self._hashed(self._by_launchpad, normalize_name(launchpad_name))
+            )
+
+        candidates.sort(key=lambda c: len(c.positions))
+        return candidates
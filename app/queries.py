@@ -0,0 +1,88 @@
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from app.aggregation import DEFAULT_ROLLING_WINDOW, aggregate
+from app.columnar import LaunchColumns
+from app.index import PageKey
+from app.records import LaunchRecord
+
+
+class ILaunchQueries(ABC):
+    """
+    Read queries behind ``/launches/``, ``/stats/*`` and ``/export/`` for one
+    data version.
+
+    Implemented in memory by ``LaunchSnapshot`` and in SQL by
+    ``SQLiteLaunchQueries``; both return the same results for a version.
+    """
+
+    version: str
+
+    @abstractmethod
+    def query(
+        self,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        success: Optional[bool] = None,
+        rocket_name: Optional[str] = None,
+        launchpad_name: Optional[str] = None,
+    ) -> Sequence[LaunchRecord]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def page(
+        self,
+        after: Optional[PageKey],
+        limit: int,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        success: Optional[bool] = None,
+        rocket_name: Optional[str] = None,
+        launchpad_name: Optional[str] = None,
+    ) -> Tuple[List[LaunchRecord], Optional[PageKey]]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def search(
+        self,
+        q: str,
+        limit: Optional[int] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        success: Optional[bool] = None,
+        rocket_name: Optional[str] = None,
+        launchpad_name: Optional[str] = None,
+    ) -> List[LaunchRecord]:
+        """
+        Launches matching the full-text query ``q`` and the filters, best
+        match first.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def statistic(self, name: str, **params: Any) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    def columnar(
+        self, **filters: Any
+    ) -> Tuple[Sequence[LaunchRecord], LaunchColumns, Sequence[int]]:
+        """
+        Returns launches, their columns and the positions matching the
+        filters. By default only the matching launches are loaded.
+        """
+        launches = self.query(**filters)
+        return launches, LaunchColumns(launches), range(len(launches))
+
+    def aggregate(
+        self,
+        group_by: Sequence[str] = (),
+        metrics: Sequence[str] = ("count",),
+        window: int = DEFAULT_ROLLING_WINDOW,
+        **filters: Any,
+    ) -> List[Dict[str, Any]]:
+        """
+        Grouped metrics over the launches matching the ``/launches/``
+        filters; see ``app.aggregation``.
+        """
+        _, columns, positions = self.columnar(**filters)
+        return aggregate(columns, group_by, metrics, positions=positions, window=window)
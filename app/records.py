@@ -0,0 +1,182 @@
+import json
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+from app.models import LaunchModel
+
+UNKNOWN_NAME = "Unknown"
+
+
+class RocketRef:
+    """
+    Rocket reference shared by every launch of that rocket in a snapshot.
+    """
+
+    __slots__ = ("id", "name")
+
+    def __init__(self, id: Optional[str], name: str):
+        self.id = id
+        self.name = name
+
+
+class LaunchpadRef:
+    """
+    Launchpad reference shared by every launch from that pad in a snapshot.
+    """
+
+    __slots__ = ("id", "name")
+
+    def __init__(self, id: Optional[str], name: str):
+        self.id = id
+        self.name = name
+
+
+class LaunchRecord:
+    """
+    Compact internal launch, attribute-compatible with ``LaunchModel``.
+
+    Records are built without validation; ``to_model`` converts one to the
+    pydantic model at the API boundary. Fields no filter or statistic needs
+    (``details``, ``webcast``, ``links``) are read from ``payload``, which may
+    be raw JSON text (or UTF-8 bytes, e.g. a view of a shared snapshot file).
+    Raw payloads are decoded on each read and the result is never kept on
+    the record, so a snapshot only holds the JSON text.
+    """
+
+    __slots__ = (
+        "id",
+        "name",
+        "date_utc",
+        "success",
+        "upcoming",
+        "rocket",
+        "launchpad",
+        "flight_number",
+        "_payload",
+    )
+
+    def __init__(
+        self,
+        id: str,
+        name: str,
+        date_utc: datetime,
+        success: Optional[bool],
+        upcoming: bool,
+        rocket: RocketRef,
+        launchpad: LaunchpadRef,
+        flight_number: Optional[int],
+        payload: Union[str, bytes, memoryview, Dict[str, Any]],
+    ):
+        self.id = id
+        self.name = name
+        self.date_utc = date_utc
+        self.success = success
+        self.upcoming = upcoming
+        self.rocket = rocket
+        self.launchpad = launchpad
+        self.flight_number = flight_number
+        self._payload = payload
+
+    @property
+    def payload(self) -> Dict[str, Any]:
+        if isinstance(self._payload, dict):
+            return self._payload
+        if isinstance(self._payload, memoryview):
+            return json.loads(self._payload.tobytes())
+        return json.loads(self._payload)
+
+    def payload_json(self) -> str:
+        """
+        Returns the payload as JSON text, without decoding it if still raw.
+        """
+        if isinstance(self._payload, str):
+            return self._payload
+        if isinstance(self._payload, (bytes, memoryview)):
+            return bytes(self._payload).decode()
+        return json.dumps(self._payload, sort_keys=True)
+
+    def payload_field(self, name: str) -> Any:
+        return self.payload.get(name)
+
+    @property
+    def details(self) -> Optional[str]:
+        return self.payload_field("details")
+
+    @property
+    def webcast(self) -> Optional[str]:
+        return self.payload_field("webcast")
+
+    @property
+    def links(self) -> Optional[dict]:
+        return self.payload_field("links")
+
+
+def build_records(
+    raw_launches: Iterable[Dict[str, Any]],
+    rocket_map: Dict[str, str],
+    launchpad_map: Dict[str, str],
+) -> List[LaunchRecord]:
+    """
+    Builds launch records with one shared ``RocketRef``/``LaunchpadRef`` per id.
+
+    Items are either full launch dicts or cache rows carrying the undecoded
+    payload under ``data``.
+    """
+    rockets: Dict[Optional[str], RocketRef] = {}
+    launchpads: Dict[Optional[str], LaunchpadRef] = {}
+    records = []
+
+    for launch in raw_launches:
+        rocket_id = launch.get("rocket")
+        rocket = rockets.get(rocket_id)
+        if rocket is None:
+            rocket = rockets[rocket_id] = RocketRef(
+                rocket_id, rocket_map.get(rocket_id, UNKNOWN_NAME)
+            )
+        launchpad_id = launch.get("launchpad")
+        launchpad = launchpads.get(launchpad_id)
+        if launchpad is None:
+            launchpad = launchpads[launchpad_id] = LaunchpadRef(
+                launchpad_id, launchpad_map.get(launchpad_id, UNKNOWN_NAME)
+            )
+
+        records.append(
+            LaunchRecord(
+                id=launch["id"],
+                name=launch["name"],
+                date_utc=datetime.fromisoformat(launch["date_utc"]),
+                success=launch.get("success"),
+                upcoming=launch.get("upcoming", False),
+                rocket=rocket,
+                launchpad=launchpad,
+                flight_number=launch.get("flight_number"),
+                payload=launch.get("data", launch),
+            )
+        )
+
+    return records
+
+
+def to_model(launch: LaunchRecord) -> LaunchModel:
+    """
+    Converts a record to the API model, decoding its payload once for the
+    conversion.
+    """
+    if not isinstance(launch, LaunchRecord):
+        return LaunchModel.model_validate(launch, from_attributes=True)
+    payload = launch.payload
+    return LaunchModel.model_validate(
+        {
+            "id": launch.id,
+            "name": launch.name,
+            "date_utc": launch.date_utc,
+            "success": launch.success,
+            "upcoming": launch.upcoming,
+            "rocket": {"id": launch.rocket.id, "name": launch.rocket.name},
+            "launchpad": {"id": launch.launchpad.id, "name": launch.launchpad.name},
+            "flight_number": launch.flight_number,
+            "details": payload.get("details"),
+            "webcast": payload.get("webcast"),
+            "links": payload.get("links"),
+        }
+    )
@@ -0,0 +1,185 @@
+import math
+import re
+import unicodedata
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.records import LaunchRecord
+
+# Searched launch fields and their weight in the ranking.
+SEARCH_FIELDS: Dict[str, float] = {"name": 2.0, "details": 1.0}
+
+# BM25 parameters, as used by SQLite FTS5's bm25().
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+_TOKEN = re.compile(r"([^\W_]+)(\*?)")
+
+# A query term and whether it matches as a prefix.
+Term = Tuple[str, bool]
+
+
+def fold(text: str) -> str:
+    """
+    Case- and diacritic-folds text, like FTS5's ``unicode61`` tokenizer.
+    """
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).lower()
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    if not text:
+        return []
+    return [match.group(1) for match in _TOKEN.finditer(fold(text))]
+
+
+def parse_query(q: str) -> List[Term]:
+    """
+    Splits a search query into terms; a term ending in ``*`` is a prefix.
+    """
+    return [
+        (match.group(1), bool(match.group(2))) for match in _TOKEN.finditer(fold(q))
+    ]
+
+
+def fts_query(terms: Sequence[Term]) -> str:
+    """
+    Renders parsed terms as an FTS5 MATCH expression (all terms required).
+    """
+    return " ".join(f'"{term}"' + ("*" if prefix else "") for term, prefix in terms)
+
+
+def _field_text(launch: LaunchRecord, field: str) -> Optional[str]:
+    if isinstance(launch, LaunchRecord) and field not in LaunchRecord.__slots__:
+        return launch.payload_field(field)
+    return getattr(launch, field)
+
+
+def _idf(total: int, matching: int) -> float:
+    idf = math.log((total - matching + 0.5) / (matching + 0.5))
+    return idf if idf > 0 else 1e-6
+
+
+class SearchIndex:
+    """
+    Inverted index over the launches' ``SEARCH_FIELDS``, built once per
+    snapshot.
+
+    Postings are stored as flat arrays: for the term at ``vocabulary[t]``,
+    ``positions[offsets[t]:offsets[t + 1]]`` are the snapshot positions
+    containing it (ascending) and ``weights`` their field-weighted term
+    frequencies. Being arrays, the index can be written to and mapped from a
+    shared snapshot file. Queries match launches containing every term, rank
+    them with BM25 and break ties by snapshot position. Payload fields are
+    decoded per launch and not kept, so the records' raw payloads stay raw.
+    """
+
+    def __init__(self, launches: Sequence[LaunchRecord]):
+        postings: Dict[str, Dict[int, float]] = defaultdict(dict)
+        lengths = np.zeros(len(launches), dtype=np.int32)
+        for position, launch in enumerate(launches):
+            for field, weight in SEARCH_FIELDS.items():
+                tokens = tokenize(_field_text(launch, field))
+                lengths[position] += len(tokens)
+                for token in tokens:
+                    counts = postings[token]
+                    counts[position] = counts.get(position, 0.0) + weight
+        vocabulary = sorted(postings)
+        offsets = np.zeros(len(vocabulary) + 1, dtype=np.int64)
+        np.cumsum([len(postings[term]) for term in vocabulary], out=offsets[1:])
+        positions = np.fromiter(
+            (p for term in vocabulary for p in sorted(postings[term])),
+            dtype=np.int32,
+            count=offsets[-1],
+        )
+        weights = np.fromiter(
+            (postings[term][p] for term in vocabulary for p in sorted(postings[term])),
+            dtype=np.float32,
+            count=offsets[-1],
+        )
+        self._set(vocabulary, offsets, positions, weights, lengths)
+
+    @classmethod
+    def from_arrays(
+        cls,
+        vocabulary: Sequence[str],
+        offsets: np.ndarray,
+        positions: np.ndarray,
+        weights: np.ndarray,
+        lengths: np.ndarray,
+    ) -> "SearchIndex":
+        """
+        Wraps existing postings (e.g. views of a shared snapshot file)
+        without copying them.
+        """
+        index = cls.__new__(cls)
+        index._set(vocabulary, offsets, positions, weights, lengths)
+        return index
+
+    def _set(
+        self,
+        vocabulary: Sequence[str],
+        offsets: np.ndarray,
+        positions: np.ndarray,
+        weights: np.ndarray,
+        lengths: np.ndarray,
+    ) -> None:
+        self.vocabulary = vocabulary
+        self.offsets = offsets
+        self.positions = positions
+        self.weights = weights
+        self.lengths = lengths
+        self._average_length = float(lengths.mean()) if len(lengths) else 0.0
+
+    def _postings(self, term: int) -> Tuple[np.ndarray, np.ndarray]:
+        start, end = self.offsets[term], self.offsets[term + 1]
+        return self.positions[start:end], self.weights[start:end]
+
+    def _matches(self, term: str, prefix: bool) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Positions containing ``term`` (or a word it prefixes) and their term
+        frequencies, ascending by position.
+        """
+        vocabulary = self.vocabulary
+        first = bisect_left(vocabulary, term)
+        last = first
+        while last < len(vocabulary) and (
+            vocabulary[last].startswith(term) if prefix else vocabulary[last] == term
+        ):
+            last += 1
+        if last - first == 1:
+            return self._postings(first)
+        postings = [self._postings(t) for t in range(first, last)]
+        positions = np.concatenate([p for p, _ in postings] or [np.empty(0, np.int32)])
+        weights = np.concatenate([w for _, w in postings] or [np.empty(0, np.float32)])
+        merged, inverse = np.unique(positions, return_inverse=True)
+        return merged, np.bincount(inverse, weights=weights, minlength=len(merged))
+
+    def search(self, q: str, positions: Optional[Iterable[int]] = None) -> List[int]:
+        """
+        Positions of the launches matching every term of ``q``, optionally
+        restricted to ``positions``, best match first.
+        """
+        terms = parse_query(q)
+        if not terms:
+            return []
+        matches = [self._matches(term, prefix) for term, prefix in terms]
+        candidates = min((p for p, _ in matches), key=len)
+        if positions is not None:
+            candidates = np.intersect1d(candidates, np.fromiter(positions, np.int64))
+        for postings, _ in matches:
+            candidates = np.intersect1d(candidates, postings)
+
+        total = len(self.lengths)
+        norm = BM25_K1 * (
+            1 - BM25_B + BM25_B * self.lengths[candidates] / self._average_length
+        )
+        scores = np.zeros(len(candidates))
+        for postings, frequencies in matches:
+            frequency = frequencies[np.searchsorted(postings, candidates)].astype(float)
+            idf = _idf(total, len(postings))
+            scores += idf * frequency * (BM25_K1 + 1) / (frequency + norm)
+        return candidates[np.lexsort((candidates, -scores))].tolist()
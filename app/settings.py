@@ -11,9 +11,57 @@ class Config(BaseModel):
     LAUNCHES_ENDPOINT: str = f"{BASE_URL}/launches"
     ROCKETS_ENDPOINT: str = f"{BASE_URL}/rockets"
     LAUNCHPADS_ENDPOINT: str = f"{BASE_URL}/launchpads"
+    UPCOMING_LAUNCHES_ENDPOINT: str = f"{BASE_URL}/launches/upcoming"
 
     DB_PATH: str = os.getenv("CACHE_DB_PATH", "cache/launch_cache.db")
     CACHE_TTL_SECONDS: int = int(os.getenv("CACHE_TTL_SECONDS", "3600"))
+    # Per-table TTLs; rockets and launchpads rarely change.
+    LAUNCHES_TTL_SECONDS: int = int(
+        os.getenv("LAUNCHES_TTL_SECONDS", str(CACHE_TTL_SECONDS))
+    )
+    ROCKETS_TTL_SECONDS: int = int(
+        os.getenv("ROCKETS_TTL_SECONDS", str(CACHE_TTL_SECONDS))
+    )
+    LAUNCHPADS_TTL_SECONDS: int = int(
+        os.getenv("LAUNCHPADS_TTL_SECONDS", str(CACHE_TTL_SECONDS))
+    )
+    # Upcoming and recently flown launches are re-synced on this shorter TTL.
+    LAUNCHES_HOT_TTL_SECONDS: int = int(os.getenv("LAUNCHES_HOT_TTL_SECONDS", "300"))
+    LAUNCHES_HOT_WINDOW_SECONDS: int = int(
+        os.getenv("LAUNCHES_HOT_WINDOW_SECONDS", str(7 * 24 * 3600))
+    )
+
+    # "snapshot" serves /launches/ and /stats/* from each worker's in-memory
+    # snapshot; "sqlite" runs them as SQL queries against the cache database.
+    QUERY_BACKEND: str = os.getenv("QUERY_BACKEND", "snapshot")
+
+    # Directory for the memory-mapped snapshot shared by all workers; empty
+    # keeps a private snapshot per worker.
+    SHARED_SNAPSHOT_DIR: str = os.getenv("SHARED_SNAPSHOT_DIR", "")
+
+    # Fetch collections through the upstream POST <collection>/query endpoints,
+    # selecting only modeled fields, instead of downloading them whole.
+    UPSTREAM_QUERY_API: bool = os.getenv("UPSTREAM_QUERY_API", "false").lower() in (
+        "1",
+        "true",
+        "yes",
+    )
+    UPSTREAM_QUERY_PAGE_SIZE: int = int(os.getenv("UPSTREAM_QUERY_PAGE_SIZE", "200"))
+    UPSTREAM_QUERY_CONCURRENCY: int = int(os.getenv("UPSTREAM_QUERY_CONCURRENCY", "4"))
+
+    # Memory budget of the precomputed statistics cube per snapshot; filtered
+    # statistics fall back to scanning launches when it is exceeded (0 = off).
+    STATS_CUBE_MAX_BYTES: int = int(os.getenv("STATS_CUBE_MAX_BYTES", str(16 << 20)))
+
+    REFRESH_LEASE_SECONDS: float = float(os.getenv("REFRESH_LEASE_SECONDS", "30"))
+
+    # Total size of the pre-encoded response bodies kept per dataset version.
+    RESPONSE_CACHE_MAX_BYTES: int = int(
+        os.getenv("RESPONSE_CACHE_MAX_BYTES", str(32 << 20))
+    )
+
+    HTTP_TIMEOUT_SECONDS: float = float(os.getenv("HTTP_TIMEOUT_SECONDS", "10"))
+    HTTP_MAX_CONNECTIONS: int = int(os.getenv("HTTP_MAX_CONNECTIONS", "10"))
 
     HEADERS: dict = {
         "Accept": "application/json",
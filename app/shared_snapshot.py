@@ -0,0 +1,390 @@
+import fcntl
+import json
+import logging
+import mmap
+import operator
+import os
+import struct
+import tempfile
+import threading
+import uuid
+from datetime import timedelta
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.columnar import EPOCH, LaunchColumns
+from app.records import LaunchpadRef, LaunchRecord, RocketRef
+from app.search import SearchIndex
+from app.snapshot import LaunchSnapshot
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"SXSNAP01"
+# Magic, then the little-endian byte length of the JSON header.
+_PREAMBLE = struct.Struct("<8sQ")
+_ALIGNMENT = 8
+CURRENT_FILE = "CURRENT"
+LOCK_FILE = "LOCK"
+FLIGHT_NUMBER_NULL = np.iinfo(np.int64).min
+
+
+def _strings(values: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Packs strings as UTF-8 into one blob plus ``len(values) + 1`` offsets.
+    """
+    encoded = [value.encode() for value in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(value) for value in encoded], out=offsets[1:])
+    return offsets, np.frombuffer(b"".join(encoded), dtype=np.uint8)
+
+
+def _refs(refs: Sequence[Any]) -> Tuple[List[List[Optional[str]]], np.ndarray]:
+    """
+    Int-codes shared rocket/launchpad refs by identity.
+    """
+    codes: Dict[int, int] = {}
+    table = []
+    encoded = np.empty(len(refs), dtype=np.int32)
+    for position, ref in enumerate(refs):
+        code = codes.get(id(ref))
+        if code is None:
+            code = codes[id(ref)] = len(table)
+            table.append([ref.id, ref.name])
+        encoded[position] = code
+    return table, encoded
+
+
+def encode_snapshot(snapshot: LaunchSnapshot) -> bytes:
+    """
+    Serializes a snapshot into the shared file layout: a JSON header with the
+    small tables, followed by 8-byte aligned little-endian arrays.
+    """
+    launches = snapshot.launches
+    columns = snapshot.columns
+    rocket_refs, rocket_ref_codes = _refs([launch.rocket for launch in launches])
+    launchpad_refs, launchpad_ref_codes = _refs(
+        [launch.launchpad for launch in launches]
+    )
+    arrays: Dict[str, np.ndarray] = {
+        "date_us": columns.date_us,
+        "timestamps": columns.timestamps,
+        "months": columns.months,
+        "success": columns.success,
+        "upcoming": np.fromiter(
+            (launch.upcoming for launch in launches), dtype=np.int8, count=len(launches)
+        ),
+        "flight_number": np.fromiter(
+            (
+                (
+                    FLIGHT_NUMBER_NULL
+                    if launch.flight_number is None
+                    else launch.flight_number
+                )
+                for launch in launches
+            ),
+            dtype=np.int64,
+            count=len(launches),
+        ),
+        "rocket_codes": columns.rocket_codes,
+        "launchpad_codes": columns.launchpad_codes,
+        "rocket_refs": rocket_ref_codes,
+        "launchpad_refs": launchpad_ref_codes,
+    }
+    search = snapshot.search_index
+    arrays.update(
+        {
+            "search.offsets": search.offsets,
+            "search.positions": search.positions,
+            "search.weights": search.weights,
+            "search.lengths": search.lengths,
+        }
+    )
+    for name, values in (
+        ("ids", [launch.id for launch in launches]),
+        ("names", [launch.name for launch in launches]),
+        ("payloads", [launch.payload_json() for launch in launches]),
+        ("search.vocabulary", list(search.vocabulary)),
+    ):
+        arrays[f"{name}.offsets"], arrays[f"{name}.data"] = _strings(values)
+
+    layout, offset = {}, 0
+    for name, array in arrays.items():
+        array = np.ascontiguousarray(array, dtype=array.dtype.newbyteorder("<"))
+        arrays[name] = array
+        layout[name] = [array.dtype.str, offset, len(array)]
+        offset += -(-array.nbytes // _ALIGNMENT) * _ALIGNMENT
+
+    header = json.dumps(
+        {
+            "version": snapshot.version,
+            "size": len(launches),
+            "rocket_map": dict(snapshot.rocket_map),
+            "launchpad_map": dict(snapshot.launchpad_map),
+            "rocket_names": list(columns.rocket_names),
+            "launchpad_names": list(columns.launchpad_names),
+            "rocket_refs": rocket_refs,
+            "launchpad_refs": launchpad_refs,
+            "arrays": layout,
+        }
+    ).encode()
+    header += b" " * (-(_PREAMBLE.size + len(header)) % _ALIGNMENT)
+
+    chunks = [_PREAMBLE.pack(MAGIC, len(header)), header]
+    for array in arrays.values():
+        chunks.append(array.tobytes())
+        chunks.append(b"\0" * (-array.nbytes % _ALIGNMENT))
+    return b"".join(chunks)
+
+
+class MappedStrings(Sequence[str]):
+    """
+    Strings packed by ``_strings``, decoded from the mapping on each access.
+    """
+
+    def __init__(self, offsets: np.ndarray, data: memoryview):
+        self._offsets = offsets
+        self._data = data
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def raw(self, index: int) -> memoryview:
+        return self._data[self._offsets[index] : self._offsets[index + 1]]
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        index = operator.index(index)
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return bytes(self.raw(index)).decode()
+
+
+class MappedLaunches(Sequence[LaunchRecord]):
+    """
+    Launch records read from a mapped snapshot file.
+
+    A record is built on each access and not kept, with its payload as a
+    view of the mapping, so a worker holds no per-launch objects for the
+    snapshot beyond what a request is using.
+    """
+
+    def __init__(
+        self,
+        ids: MappedStrings,
+        names: MappedStrings,
+        payloads: MappedStrings,
+        arrays: Dict[str, np.ndarray],
+        rockets: List[RocketRef],
+        launchpads: List[LaunchpadRef],
+    ):
+        self._ids = ids
+        self._names = names
+        self._payloads = payloads
+        self._arrays = arrays
+        self._rockets = rockets
+        self._launchpads = launchpads
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        index = operator.index(index)
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        arrays = self._arrays
+        success = int(arrays["success"][index])
+        flight_number = int(arrays["flight_number"][index])
+        return LaunchRecord(
+            id=self._ids[index],
+            name=self._names[index],
+            date_utc=EPOCH + timedelta(microseconds=int(arrays["date_us"][index])),
+            success=None if success < 0 else bool(success),
+            upcoming=bool(arrays["upcoming"][index]),
+            rocket=self._rockets[arrays["rocket_refs"][index]],
+            launchpad=self._launchpads[arrays["launchpad_refs"][index]],
+            flight_number=(
+                None if flight_number == FLIGHT_NUMBER_NULL else flight_number
+            ),
+            payload=self._payloads.raw(index),
+        )
+
+
+def decode_snapshot(buffer: mmap.mmap) -> LaunchSnapshot:
+    """
+    Builds a snapshot whose columns, search index and launches are views of
+    ``buffer``.
+
+    Only the rocket/launchpad refs and the small name tables are allocated;
+    launch records are built from the mapping when read.
+    """
+    magic, header_length = _PREAMBLE.unpack_from(buffer, 0)
+    if magic != MAGIC:
+        raise ValueError("Not a launch snapshot file")
+    header = json.loads(bytes(buffer[_PREAMBLE.size : _PREAMBLE.size + header_length]))
+    base = _PREAMBLE.size + header_length
+    view = memoryview(buffer)
+
+    def array(name: str) -> np.ndarray:
+        dtype, offset, count = header["arrays"][name]
+        return np.frombuffer(buffer, dtype=dtype, count=count, offset=base + offset)
+
+    def strings(name: str) -> MappedStrings:
+        dtype, offset, count = header["arrays"][f"{name}.data"]
+        start = base + offset
+        return MappedStrings(array(f"{name}.offsets"), view[start : start + count])
+
+    ids = strings("ids")
+    arrays = {
+        name: array(name)
+        for name in (
+            "date_us",
+            "success",
+            "upcoming",
+            "flight_number",
+            "rocket_refs",
+            "launchpad_refs",
+        )
+    }
+    launches = MappedLaunches(
+        ids,
+        strings("names"),
+        strings("payloads"),
+        arrays,
+        [RocketRef(*ref) for ref in header["rocket_refs"]],
+        [LaunchpadRef(*ref) for ref in header["launchpad_refs"]],
+    )
+    columns = LaunchColumns.from_arrays(
+        ids,
+        header["rocket_names"],
+        array("rocket_codes"),
+        header["launchpad_names"],
+        array("launchpad_codes"),
+        arrays["date_us"],
+        array("timestamps"),
+        arrays["success"],
+        array("months"),
+    )
+    search_index = SearchIndex.from_arrays(
+        strings("search.vocabulary"),
+        array("search.offsets"),
+        array("search.positions"),
+        array("search.weights"),
+        array("search.lengths"),
+    )
+    return LaunchSnapshot(
+        header["version"],
+        launches,
+        header["rocket_map"],
+        header["launchpad_map"],
+        columns=columns,
+        search_index=search_index,
+    )
+
+
+class SharedSnapshotFile:
+    """
+    Publishes enriched snapshots to a directory that every worker maps.
+
+    Each publish writes an immutable ``snapshot-<generation>-<id>.bin`` and
+    then atomically repoints ``CURRENT`` at it with ``os.replace``. Readers
+    map whichever file ``CURRENT`` names read-only, so they only ever see
+    complete files. Publishers hold an exclusive ``flock`` on ``LOCK`` from
+    reading the generation until ``CURRENT`` is replaced, so generations stay
+    unique across processes, and a worker that finds its version already
+    published under the lock maps that generation instead of writing another.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _read_current(self) -> Optional[Dict[str, Any]]:
+        try:
+            with open(os.path.join(self.directory, CURRENT_FILE)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_atomic(self, name: str, data: bytes) -> None:
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=f".{name}.")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, os.path.join(self.directory, name))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def generation(self) -> int:
+        current = self._read_current()
+        return current["generation"] if current else 0
+
+    def open(self, version: str) -> Optional[LaunchSnapshot]:
+        """
+        Maps the current generation if it holds ``version``, else ``None``.
+        """
+        current = self._read_current()
+        if current is None or current["version"] != version:
+            return None
+        try:
+            with open(os.path.join(self.directory, current["file"]), "rb") as f:
+                buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except OSError:
+            # Superseded and removed between reading CURRENT and opening it.
+            return None
+        logger.info(
+            "Mapped shared snapshot generation %s (version %s).",
+            current["generation"],
+            version,
+        )
+        snapshot = decode_snapshot(buffer)
+        return snapshot if snapshot.version == version else None
+
+    def publish(self, snapshot: LaunchSnapshot) -> LaunchSnapshot:
+        """
+        Writes ``snapshot`` as the next generation and returns it re-opened
+        from the mapping, so the publishing worker shares it too.
+        """
+        with self._lock, open(os.path.join(self.directory, LOCK_FILE), "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            current = self._read_current()
+            if current is not None and current["version"] == snapshot.version:
+                # Another worker published this version while we built it.
+                return self.open(snapshot.version) or snapshot
+            generation = current["generation"] + 1 if current else 1
+            name = f"snapshot-{generation}-{uuid.uuid4().hex}.bin"
+            self._write_atomic(name, encode_snapshot(snapshot))
+            self._write_atomic(
+                CURRENT_FILE,
+                json.dumps(
+                    {
+                        "generation": generation,
+                        "version": snapshot.version,
+                        "file": name,
+                    }
+                ).encode(),
+            )
+            self._remove_superseded(generation)
+        return self.open(snapshot.version) or snapshot
+
+    def _remove_superseded(self, generation: int) -> None:
+        # Workers still mapping an old generation keep it alive until unmapped.
+        for name in os.listdir(self.directory):
+            if not name.startswith("snapshot-"):
+                continue
+            if int(name.split("-")[1]) < generation:
+                try:
+                    os.unlink(os.path.join(self.directory, name))
+                except OSError:
+                    pass
@@ -0,0 +1,352 @@
+import asyncio
+import logging
+import threading
+from bisect import bisect_left
+from functools import cached_property
+from types import MappingProxyType
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+import numpy as np
+
+from app.aggregation import DEFAULT_ROLLING_WINDOW, aggregate
+from app.api_client import IAsyncSpaceXLaunchTracker, ISpaceXLaunchTracker
+from app.cache import SyncResult
+from app.columnar import LaunchColumns
+from app.cube import LaunchCube
+from app.index import LaunchIndex, PageKey
+from app.queries import ILaunchQueries
+from app.records import LaunchRecord, build_records
+from app.search import SearchIndex
+from app.statistics import STATISTICS, LaunchTallies
+
+if TYPE_CHECKING:
+    from app.shared_snapshot import SharedSnapshotFile
+
+logger = logging.getLogger(__name__)
+
+# Launch changes reported by the tracker since a version, and that version.
+TallyDelta = Tuple[str, SyncResult]
+
+
+class LaunchSnapshot(ILaunchQueries):
+    """
+    Immutable, versioned view of the enriched launch data shared by all routes.
+    """
+
+    def __init__(
+        self,
+        version: str,
+        launches: Iterable[LaunchRecord],
+        rocket_map: Mapping[str, str],
+        launchpad_map: Mapping[str, str],
+        columns: Optional[LaunchColumns] = None,
+        search_index: Optional[SearchIndex] = None,
+    ):
+        self.version = version
+        # Sequences (e.g. launches read lazily from a mapped file) are kept
+        # as they are; other iterables are copied.
+        self.launches: Sequence[LaunchRecord] = (
+            launches if isinstance(launches, Sequence) else tuple(launches)
+        )
+        self.rocket_map = MappingProxyType(dict(rocket_map))
+        self.launchpad_map = MappingProxyType(dict(launchpad_map))
+        # Parameterless statistics derived from the store's running tallies.
+        self.tallied: Mapping[str, Dict[str, Any]] = {}
+        if columns is not None:
+            # Prebuilt columns, e.g. mapped from a shared snapshot file.
+            self.columns = columns
+        if search_index is not None:
+            self.search_index = search_index
+
+    @cached_property
+    def index(self) -> LaunchIndex:
+        return LaunchIndex(self.launches, self.columns)
+
+    @cached_property
+    def columns(self) -> LaunchColumns:
+        return LaunchColumns(self.launches)
+
+    @cached_property
+    def _id_order(self) -> np.ndarray:
+        # Positions sorted by launch id, for bisecting ids without a dict of
+        # every id.
+        return np.argsort(np.asarray(self.columns.ids), kind="stable")
+
+    def position_of(self, launch_id: str) -> Optional[int]:
+        ids = self.columns.ids
+        order = self._id_order
+        index = bisect_left(order, launch_id, key=ids.__getitem__)
+        if index < len(order) and ids[order[index]] == launch_id:
+            return int(order[index])
+        return None
+
+    @cached_property
+    def search_index(self) -> SearchIndex:
+        return SearchIndex(self.launches)
+
+    @cached_property
+    def cube(self) -> Optional[LaunchCube]:
+        return LaunchCube.build(self.columns)
+
+    def query(self, **filters: Any) -> List[LaunchRecord]:
+        return self.index.query(**filters)
+
+    def page(
+        self, after: Optional[PageKey], limit: int, **filters: Any
+    ) -> Tuple[List[LaunchRecord], Optional[PageKey]]:
+        positions, next_key = self.index.page(after, limit, **filters)
+        return [self.launches[i] for i in positions], next_key
+
+    def columnar(
+        self, **filters: Any
+    ) -> Tuple[Sequence[LaunchRecord], LaunchColumns, Sequence[int]]:
+        return self.launches, self.columns, self.index.positions(**filters)
+
+    def search(
+        self, q: str, limit: Optional[int] = None, **filters: Any
+    ) -> List[LaunchRecord]:
+        positions = None
+        if any(value is not None for value in filters.values()):
+            positions = self.index.positions(**filters)
+        hits = self.search_index.search(q, positions)
+        return [self.launches[i] for i in hits[:limit]]
+
+    def statistic(self, name: str, **params: Any) -> Dict[str, Any]:
+        if not params and name in self.tallied:
+            return self.tallied[name]
+        return STATISTICS[name](self.columns, **params)
+
+    def aggregate(
+        self,
+        group_by: Sequence[str] = (),
+        metrics: Sequence[str] = ("count",),
+        window: int = DEFAULT_ROLLING_WINDOW,
+        **filters: Any,
+    ) -> List[Dict[str, Any]]:
+        """
+        Grouped metrics over the launches matching the ``/launches/``
+        filters; see ``app.aggregation``. Rolled up from the cube when it
+        covers the query, else aggregated over the index's matching positions.
+        """
+        if self.cube is not None:
+            rows = self.cube.aggregate(group_by, metrics, window, **filters)
+            if rows is not None:
+                return rows
+        positions = None
+        if any(value is not None for value in filters.values()):
+            positions = self.index.positions(**filters)
+        return aggregate(
+            self.columns, group_by, metrics, positions=positions, window=window
+        )
+
+    @classmethod
+    def build(
+        cls,
+        version: str,
+        raw_launches: List[Dict[str, Any]],
+        rockets: List[Dict[str, Any]],
+        launchpads: List[Dict[str, Any]],
+    ) -> "LaunchSnapshot":
+        rocket_map = {r["id"]: r["name"] for r in rockets}
+        launchpad_map = {p["id"]: p["name"] for p in launchpads}
+        launches = build_records(raw_launches, rocket_map, launchpad_map)
+        return cls(version, launches, rocket_map, launchpad_map)
+
+
+class SnapshotStore:
+    """
+    Holds the current snapshot and rebuilds it only when the cache version moves.
+
+    With a ``shared`` file, a new version is mapped from the file if another
+    worker already published it, and published there after building it.
+
+    Statistics are kept as running ``LaunchTallies``: each new snapshot only
+    re-counts the launches the tracker reports as changed since the tallied
+    version and drops the removed ones, instead of recomputing every
+    statistic over all launches. Without a reported delta, launches are
+    compared by content hash.
+    """
+
+    def __init__(self, shared: Optional["SharedSnapshotFile"] = None):
+        self._shared = shared
+        self._snapshot: Optional[LaunchSnapshot] = None
+        self._lock = threading.Lock()
+        self._async_lock = asyncio.Lock()
+        self._listeners: List[Callable[[LaunchSnapshot], None]] = []
+        self._tallies = LaunchTallies()
+        self._tally_lock = threading.Lock()
+        self._tallied_names: Optional[Tuple[Mapping, Mapping]] = None
+        self._tallied_version: Optional[str] = None
+
+    def subscribe(self, listener: Callable[[LaunchSnapshot], None]) -> None:
+        """
+        Registers a callback run with every newly installed snapshot.
+        """
+        self._listeners.append(listener)
+
+    @property
+    def current(self) -> Optional[LaunchSnapshot]:
+        return self._snapshot
+
+    def get(self, tracker: ISpaceXLaunchTracker) -> LaunchSnapshot:
+        version = tracker.get_data_version()
+        snapshot = self._matching(version)
+        if snapshot is not None:
+            return snapshot
+
+        with self._lock:
+            snapshot = self._matching(version)
+            if snapshot is not None:
+                return snapshot
+            since = self._tallied_version
+            changes = tracker.get_launch_changes(since, version) if since else None
+            delta = (since, changes) if changes is not None else None
+            snapshot = self._install_shared(version, delta)
+            if snapshot is None:
+                snapshot = self._install(
+                    version,
+                    tracker.get_launch_rows(),
+                    tracker.get_rockets(),
+                    tracker.get_launchpads(),
+                    delta,
+                )
+        return snapshot
+
+    async def aget(self, tracker: IAsyncSpaceXLaunchTracker) -> LaunchSnapshot:
+        version = await tracker.get_data_version()
+        snapshot = self._matching(version)
+        if snapshot is not None:
+            return snapshot
+
+        async with self._async_lock:
+            snapshot = self._matching(version)
+            if snapshot is not None:
+                return snapshot
+            since = self._tallied_version
+            changes = (
+                await tracker.get_launch_changes(since, version) if since else None
+            )
+            delta = (since, changes) if changes is not None else None
+            if self._shared is not None:
+                snapshot = await asyncio.to_thread(self._install_shared, version, delta)
+            if snapshot is None:
+                raw = await asyncio.gather(
+                    tracker.get_launch_rows(),
+                    tracker.get_rockets(),
+                    tracker.get_launchpads(),
+                )
+                snapshot = await asyncio.to_thread(self._install, version, *raw, delta)
+        return snapshot
+
+    def _matching(self, version: str) -> Optional[LaunchSnapshot]:
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.version == version:
+            return snapshot
+        return None
+
+    def _install(
+        self,
+        version: str,
+        raw_launches: List[Dict[str, Any]],
+        rockets: List[Dict[str, Any]],
+        launchpads: List[Dict[str, Any]],
+        delta: Optional[TallyDelta] = None,
+    ) -> LaunchSnapshot:
+        logger.info("Building launch snapshot for version %s.", version)
+        snapshot = LaunchSnapshot.build(version, raw_launches, rockets, launchpads)
+        if self._shared is not None:
+            snapshot = self._shared.publish(snapshot)
+        revisions = {row["id"]: row.get("content_hash") for row in raw_launches}
+        return self._activate(snapshot, revisions, delta)
+
+    def _update_tallies(
+        self,
+        snapshot: LaunchSnapshot,
+        revisions: Optional[Dict[str, Optional[str]]],
+        delta: Optional[TallyDelta] = None,
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Applies the delta from the last tallied snapshot and returns the
+        statistics for ``snapshot``. A ``delta`` reported against the tallied
+        version is applied as is; otherwise launches are compared by revision,
+        and those without one (e.g. mapped from a shared file) are always
+        re-counted. Renamed rockets or launchpads restart the tallies from
+        scratch.
+        """
+        revisions = revisions or {}
+        names = (snapshot.rocket_map, snapshot.launchpad_map)
+        with self._tally_lock:
+            tallies = self._tallies
+            if self._tallied_names != names:
+                tallies = self._tallies = LaunchTallies()
+                self._tallied_names = names
+                self._tallied_version = None
+            if delta is not None and delta[0] == self._tallied_version:
+                changes = delta[1]
+                positions = [
+                    snapshot.position_of(launch_id)
+                    for launch_id in (*changes.inserted, *changes.updated)
+                ]
+                upserted = [snapshot.launches[i] for i in positions if i is not None]
+                removed = changes.removed
+            else:
+                upserted = [
+                    launch
+                    for launch in snapshot.launches
+                    if revisions.get(launch.id) is None
+                    or tallies.revision(launch.id) != revisions[launch.id]
+                ]
+                current = {launch.id for launch in snapshot.launches}
+                removed = [i for i in tallies.ids() if i not in current]
+            tallies.apply(upserted, removed, revisions)
+            self._tallied_version = snapshot.version
+            logger.info(
+                "Tallied version %s: %d launches re-counted, %d removed.",
+                snapshot.version,
+                len(upserted),
+                len(removed),
+            )
+            return tallies.statistics(
+                snapshot.columns.rocket_names, snapshot.columns.launchpad_names
+            )
+
+    def _install_shared(
+        self, version: str, delta: Optional[TallyDelta] = None
+    ) -> Optional[LaunchSnapshot]:
+        if self._shared is None:
+            return None
+        snapshot = self._shared.open(version)
+        return self._activate(snapshot, None, delta) if snapshot is not None else None
+
+    def _activate(
+        self,
+        snapshot: LaunchSnapshot,
+        revisions: Optional[Dict[str, Optional[str]]] = None,
+        delta: Optional[TallyDelta] = None,
+    ) -> LaunchSnapshot:
+        # Build derived structures before the snapshot becomes visible.
+        snapshot.index
+        snapshot.columns
+        snapshot.cube
+        snapshot.search_index
+        snapshot.tallied = MappingProxyType(
+            self._update_tallies(snapshot, revisions, delta)
+        )
+        self._snapshot = snapshot
+        for listener in self._listeners:
+            try:
+                listener(snapshot)
+            except Exception:
+                logger.exception("Snapshot listener %r failed.", listener)
+        return snapshot
@@ -0,0 +1,181 @@
+from datetime import datetime, timezone
+from functools import cached_property
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.cache import SQLiteCache, get_connection
+from app.index import PageKey, normalize_name
+from app.queries import ILaunchQueries
+from app.records import UNKNOWN_NAME, LaunchRecord, build_records
+from app.search import SEARCH_FIELDS, fts_query, parse_query
+from app.utils import parse_date
+
+
+def sql_timestamp(value: datetime) -> str:
+    """
+    Formats a datetime like the upstream ``date_utc`` strings stored in the
+    cache (``YYYY-MM-DDTHH:MM:SS.sssZ``) so the two compare as text.
+    """
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return value.strftime("%Y-%m-%dT%H:%M:%S.") + f"{value.microsecond // 1000:03d}Z"
+
+
+class SQLiteLaunchQueries(ILaunchQueries):
+    """
+    Launch filters and statistics pushed down into the cache database.
+
+    Filters compile to parameterized predicates on the launches table's
+    indexed hot columns, and statistics run as ``GROUP BY`` queries, so only
+    the rows a request returns are read into Python.
+    """
+
+    def __init__(
+        self,
+        version: str,
+        launch_cache: SQLiteCache,
+        rocket_cache: SQLiteCache,
+        launchpad_cache: SQLiteCache,
+    ):
+        self.version = version
+        self._launches = launch_cache
+        self._rockets = rocket_cache
+        self._launchpads = launchpad_cache
+
+    @cached_property
+    def rocket_map(self) -> Dict[str, str]:
+        return self._names(self._rockets)
+
+    @cached_property
+    def launchpad_map(self) -> Dict[str, str]:
+        return self._names(self._launchpads)
+
+    def _names(self, cache: SQLiteCache) -> Dict[str, str]:
+        conn = get_connection(cache.db_path)
+        return dict(conn.execute(f"SELECT id, name FROM {cache.table};").fetchall())
+
+    def _where(
+        self,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        success: Optional[bool] = None,
+        rocket_name: Optional[str] = None,
+        launchpad_name: Optional[str] = None,
+    ) -> Tuple[List[str], List[Any]]:
+        clauses, params = [], []
+        if start_date:
+            clauses.append("date_utc >= ?")
+            params.append(sql_timestamp(parse_date(start_date)))
+        if end_date:
+            clauses.append("date_utc <= ?")
+            params.append(sql_timestamp(parse_date(end_date)))
+        if success is not None:
+            clauses.append("success = ?")
+            params.append(int(success))
+        if rocket_name:
+            clauses.append(
+                f"rocket IN (SELECT id FROM {self._rockets.table} "
+                "WHERE lower(name) = ?)"
+            )
+            params.append(normalize_name(rocket_name))
+        if launchpad_name:
+            clauses.append(
+                f"launchpad IN (SELECT id FROM {self._launchpads.table} "
+                "WHERE lower(name) = ?)"
+            )
+            params.append(normalize_name(launchpad_name))
+        return clauses, params
+
+    def _records(self, rows: List[Dict[str, Any]]) -> List[LaunchRecord]:
+        return build_records(rows, self.rocket_map, self.launchpad_map)
+
+    def query(self, **filters: Any) -> List[LaunchRecord]:
+        clauses, params = self._where(**filters)
+        rows = self._launches.load_rows(" AND ".join(clauses), params)
+        return self._records(rows)
+
+    def page(
+        self, after: Optional[PageKey], limit: int, **filters: Any
+    ) -> Tuple[List[LaunchRecord], Optional[PageKey]]:
+        clauses, params = self._where(**filters)
+        if after is not None:
+            clauses.append("(date_utc, id) > (?, ?)")
+            params.extend([sql_timestamp(after[0]), after[1]])
+        rows = self._launches.load_rows(
+            " AND ".join(clauses), params, order_by="date_utc, id", limit=limit + 1
+        )
+        records = self._records(rows[:limit])
+        if len(rows) > limit:
+            return records, (records[-1].date_utc, records[-1].id)
+        return records, None
+
+    def search(
+        self, q: str, limit: Optional[int] = None, **filters: Any
+    ) -> List[LaunchRecord]:
+        terms = parse_query(q)
+        if not terms:
+            return []
+        clauses, params = self._where(**filters)
+        rows = self._launches.search_rows(
+            fts_query(terms),
+            tuple(SEARCH_FIELDS[name] for name in self._launches.search_fields),
+            " AND ".join(clauses),
+            params,
+            limit,
+        )
+        return self._records(rows)
+
+    def statistic(self, name: str, **params: Any) -> Dict[str, Any]:
+        handlers = {
+            "success-rate": self.success_rates_by_rocket,
+            "launchpads": self.launches_per_site,
+            "monthly": self.launch_frequency_by_month,
+            "yearly": self.launch_frequency_by_year,
+        }
+        return handlers[name](**params)
+
+    def _group_by_name(self, key: str, names: SQLiteCache) -> List[tuple]:
+        # Groups come out in order of first appearance by launch id, matching
+        # the in-memory snapshot.
+        conn = get_connection(self._launches.db_path)
+        return conn.execute(
+            f"""
+            SELECT COALESCE(n.name, ?), COUNT(*), TOTAL(l.success = 1)
+            FROM {self._launches.table} AS l
+            LEFT JOIN {names.table} AS n ON n.id = l.{key}
+            GROUP BY 1
+            ORDER BY MIN(l.id);
+            """,
+            (UNKNOWN_NAME,),
+        ).fetchall()
+
+    def _group_by_date_prefix(self, length: int) -> Dict[str, int]:
+        conn = get_connection(self._launches.db_path)
+        rows = conn.execute(
+            f"""
+            SELECT substr(date_utc, 1, ?), COUNT(*)
+            FROM {self._launches.table}
+            WHERE date_utc IS NOT NULL
+            GROUP BY 1
+            ORDER BY 1;
+            """,
+            (length,),
+        ).fetchall()
+        return dict(rows)
+
+    def success_rates_by_rocket(self) -> Dict[str, float]:
+        return {
+            rocket: round(successes / total * 100, 2)
+            for rocket, total, successes in self._group_by_name("rocket", self._rockets)
+        }
+
+    def launches_per_site(self) -> Dict[str, int]:
+        return {
+            site: total
+            for site, total, _ in self._group_by_name("launchpad", self._launchpads)
+        }
+
+    def launch_frequency_by_month(self) -> Dict[str, int]:
+        return self._group_by_date_prefix(len("YYYY-MM"))
+
+    def launch_frequency_by_year(self) -> Dict[str, int]:
+        return self._group_by_date_prefix(len("YYYY"))
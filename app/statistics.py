@@ -1,7 +1,12 @@
+import threading
 from collections import defaultdict
-from typing import Dict, List
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
 
+import numpy as np
+
+from app.columnar import LaunchColumns, month_label
 from app.models import LaunchModel
+from app.records import LaunchRecord
 
 
 def compute_success_rates_by_rocket(
@@ -64,3 +69,243 @@ def get_launch_frequency_by_year(launches: List[LaunchModel]) -> Dict[str, int]:
         count[year] += 1
 
     return dict(sorted(count.items()))
+
+
+def success_rates_by_rocket(columns: LaunchColumns) -> Dict[str, float]:
+    """
+    Columnar version of ``compute_success_rates_by_rocket``.
+    """
+    size = len(columns.rocket_names)
+    totals = columns.count_by(columns.rocket_codes, size)
+    successes = columns.successes_by(columns.rocket_codes, size)
+    return {
+        rocket: round(float(successes[code] / totals[code]) * 100, 2)
+        for code, rocket in enumerate(columns.rocket_names)
+        if totals[code] > 0
+    }
+
+
+def launches_per_site(columns: LaunchColumns) -> Dict[str, int]:
+    """
+    Columnar version of ``count_launches_per_site``.
+    """
+    size = len(columns.launchpad_names)
+    counts = columns.count_by(columns.launchpad_codes, size)
+    return {
+        site: int(counts[code]) for code, site in enumerate(columns.launchpad_names)
+    }
+
+
+def launch_frequency_by_month(columns: LaunchColumns) -> Dict[str, int]:
+    """
+    Columnar version of ``get_launch_frequency_by_month``.
+    """
+    if not columns.size:
+        return {}
+    first = int(columns.months.min())
+    counts = np.bincount(columns.months - first)
+    return {
+        month_label(first + offset): int(counts[offset])
+        for offset in np.flatnonzero(counts)
+    }
+
+
+def launch_frequency_by_year(columns: LaunchColumns) -> Dict[str, int]:
+    """
+    Columnar version of ``get_launch_frequency_by_year``.
+    """
+    if not columns.size:
+        return {}
+    years = columns.years
+    first = int(years.min())
+    counts = np.bincount(years - first)
+    return {
+        str(first + offset): int(counts[offset]) for offset in np.flatnonzero(counts)
+    }
+
+
+# Statistics served by the API, by name, computed over a snapshot's columns.
+STATISTICS: Dict[str, Callable[..., Dict[str, Any]]] = {
+    "success-rate": success_rates_by_rocket,
+    "launchpads": launches_per_site,
+    "monthly": launch_frequency_by_month,
+    "yearly": launch_frequency_by_year,
+}
+
+
+# Tally cell of a launch: rocket name, launchpad name and "YYYY-MM" month.
+TallyKey = Tuple[str, str, str]
+
+
+class LaunchTallies:
+    """
+    Mergeable partial aggregates behind the ``STATISTICS`` endpoints.
+
+    Launch and success counts are kept per (rocket, launchpad, month) cell,
+    together with each launch's contribution, so a refresh delta is applied
+    by touching only the inserted, changed and removed launches. Every
+    statistic is then derived from the cells rather than the launches.
+    """
+
+    def __init__(self):
+        self._cells: Dict[TallyKey, List[int]] = defaultdict(lambda: [0, 0])
+        # Launch id -> (revision, cell, success) as currently counted.
+        self._launches: Dict[str, Tuple[Optional[str], TallyKey, bool]] = {}
+
+    def __len__(self) -> int:
+        return len(self._launches)
+
+    def __contains__(self, launch_id: str) -> bool:
+        return launch_id in self._launches
+
+    def ids(self) -> List[str]:
+        return list(self._launches)
+
+    def revision(self, launch_id: str) -> Optional[str]:
+        """
+        Returns the revision (content hash) a launch was counted with.
+        """
+        counted = self._launches.get(launch_id)
+        return counted[0] if counted is not None else None
+
+    def add(self, launch: LaunchRecord, revision: Optional[str] = None) -> None:
+        """
+        Counts a launch, replacing its previous contribution if any.
+        """
+        self.discard(launch.id)
+        date = launch.date_utc.utctimetuple()
+        key = (
+            launch.rocket.name,
+            launch.launchpad.name,
+            f"{date.tm_year:04d}-{date.tm_mon:02d}",
+        )
+        success = launch.success is True
+        cell = self._cells[key]
+        cell[0] += 1
+        cell[1] += success
+        self._launches[launch.id] = (revision, key, success)
+
+    def discard(self, launch_id: str) -> None:
+        counted = self._launches.pop(launch_id, None)
+        if counted is None:
+            return
+        _, key, success = counted
+        cell = self._cells[key]
+        cell[0] -= 1
+        cell[1] -= success
+        if not cell[0]:
+            del self._cells[key]
+
+    def apply(
+        self,
+        upserted: Iterable[LaunchRecord],
+        removed: Iterable[str] = (),
+        revisions: Optional[Dict[str, Optional[str]]] = None,
+    ) -> None:
+        """
+        Applies a refresh delta: inserted or changed launches, and the ids of
+        removed ones, optionally with the revisions of the upserted launches.
+        """
+        revisions = revisions or {}
+        for launch in upserted:
+            self.add(launch, revisions.get(launch.id))
+        for launch_id in removed:
+            self.discard(launch_id)
+
+    def merge(self, other: "LaunchTallies") -> None:
+        """
+        Adds the tallies of a disjoint set of launches, e.g. another shard.
+        """
+        for key, (launches, successes) in other._cells.items():
+            cell = self._cells[key]
+            cell[0] += launches
+            cell[1] += successes
+        self._launches.update(other._launches)
+
+    def success_rates_by_rocket(self, rockets: Sequence[str] = ()) -> Dict[str, float]:
+        """
+        Same result as ``success_rates_by_rocket``, with ``rockets`` listed
+        first in the given order.
+        """
+        totals: Dict[str, List[int]] = {name: [0, 0] for name in rockets}
+        for (rocket, _, _), (launches, successes) in self._cells.items():
+            total = totals.setdefault(rocket, [0, 0])
+            total[0] += launches
+            total[1] += successes
+        return {
+            rocket: round((successes / launches) * 100, 2)
+            for rocket, (launches, successes) in totals.items()
+            if launches > 0
+        }
+
+    def launches_per_site(self, launchpads: Sequence[str] = ()) -> Dict[str, int]:
+        """
+        Same result as ``launches_per_site``, with ``launchpads`` listed first
+        in the given order.
+        """
+        count: Dict[str, int] = {name: 0 for name in launchpads}
+        for (_, site, _), (launches, _) in self._cells.items():
+            count[site] = count.get(site, 0) + launches
+        return {site: launches for site, launches in count.items() if launches}
+
+    def frequency_by_month(self) -> Dict[str, int]:
+        count = defaultdict(int)
+        for (_, _, month), (launches, _) in self._cells.items():
+            count[month] += launches
+        return dict(sorted(count.items()))
+
+    def frequency_by_year(self) -> Dict[str, int]:
+        count = defaultdict(int)
+        for (_, _, month), (launches, _) in self._cells.items():
+            count[month[:4]] += launches
+        return dict(sorted(count.items()))
+
+    def statistics(
+        self, rockets: Sequence[str] = (), launchpads: Sequence[str] = ()
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Every parameterless ``STATISTICS`` entry, derived from the cells.
+        """
+        return {
+            "success-rate": self.success_rates_by_rocket(rockets),
+            "launchpads": self.launches_per_site(launchpads),
+            "monthly": self.frequency_by_month(),
+            "yearly": self.frequency_by_year(),
+        }
+
+
+class StatisticsCache:
+    """
+    Memoizes statistic results keyed by dataset version, name and parameters.
+
+    Results for older versions are dropped as soon as a newer snapshot is
+    seen. Returned dicts are shared between requests and must not be mutated.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version: Optional[str] = None
+        self._results: Dict[Tuple, Dict[str, Any]] = {}
+
+    def get(self, snapshot, name: str, **params: Any) -> Dict[str, Any]:
+        key = (snapshot.version, name, tuple(sorted(params.items())))
+        with self._lock:
+            if snapshot.version != self._version:
+                self._version = snapshot.version
+                self._results = {}
+            result = self._results.get(key)
+        if result is not None:
+            return result
+
+        result = snapshot.statistic(name, **params)
+        with self._lock:
+            if snapshot.version == self._version:
+                self._results[key] = result
+        return result
+
+    def warm(self, snapshot) -> None:
+        """
+        Precomputes every parameterless statistic for a freshly built snapshot.
+        """
+        for name in STATISTICS:
+            self.get(snapshot, name)
@@ -0,0 +1,115 @@
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.models import LaunchModel, LaunchpadModel, RocketModel
+from app.snapshot import LaunchSnapshot
+from webapp.dependencies import get_launch_snapshot
+from webapp.main import app
+from webapp.routes import export
+
+
+@pytest.fixture
+def mock_launches():
+    return [
+        LaunchModel(
+            id=f"launch_{i}",
+            name=f"Test Launch {i}",
+            date_utc=f"2021-01-{i:02d}T00:00:00Z",
+            success=i % 2 == 0,
+            upcoming=False,
+            rocket=RocketModel(id="r1", name="Falcon 9"),
+            launchpad=LaunchpadModel(id="p1", name="CCSFS SLC 40"),
+            flight_number=i,
+            details=None,
+            links={"patch": {"small": None}, "flickr": {"original": []}},
+        )
+        for i in range(1, 8)
+    ]
+
+
+@pytest.fixture
+def client(mock_launches, monkeypatch):
+    monkeypatch.setattr(export, "EXPORT_BATCH_SIZE", 3)
+    snapshot = LaunchSnapshot("v1", mock_launches, {}, {})
+    app.dependency_overrides[get_launch_snapshot] = lambda: snapshot
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+def test_json_export_streams_a_valid_array(client, mock_launches):
+    response = client.get("/export/?format=json")
+    assert response.status_code == 200
+    data = response.json()
+    assert [launch["id"] for launch in data] == [l.id for l in mock_launches]
+    assert data[0] == json.loads(mock_launches[0].model_dump_json())
+
+
+def test_json_export_headers_do_not_depend_on_cached_bodies(client):
+    before = client.get("/export/?format=json")
+    client.get("/launches/")
+    after = client.get("/export/?format=json")
+    assert after.content == before.content
+    for response in (before, after):
+        assert response.headers["Content-Disposition"].startswith("attachment")
+        assert response.headers["Vary"] == "Accept-Encoding"
+
+
+def test_ndjson_export_has_one_launch_per_line(client):
+    response = client.get("/export/?format=ndjson&success=true")
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = response.text.splitlines()
+    assert [json.loads(line)["id"] for line in lines] == [
+        "launch_2",
+        "launch_4",
+        "launch_6",
+    ]
+
+
+def test_empty_json_export(client):
+    response = client.get("/export/?format=json&rocket_name=Starship")
+    assert response.json() == []
+
+
+def test_csv_rows_are_batched_into_chunks(mock_launches, monkeypatch):
+    monkeypatch.setattr(export, "CSV_CHUNK_BYTES", 100)
+    chunks = list(export.csv_chunks(mock_launches))
+    assert 1 < len(chunks) < len(mock_launches)
+    rows = b"".join(chunks).decode().splitlines()
+    assert rows[0].startswith("id,name")
+    assert len(rows) == len(mock_launches) + 1
+
+
+def test_export_is_gzipped_when_accepted(client):
+    response = client.get("/export/?format=ndjson", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert len(response.text.splitlines()) == 7
+
+
+def test_identity_when_encoding_is_refused(client):
+    response = client.get(
+        "/export/?format=csv", headers={"Accept-Encoding": "gzip;q=0, br"}
+    )
+    assert "content-encoding" not in response.headers
+
+
+def test_arrow_export_has_typed_columns(client):
+    pa = pytest.importorskip("pyarrow")
+    response = client.get("/export/?format=arrow&success=true")
+    assert response.headers["content-type"] == "application/vnd.apache.arrow.stream"
+
+    table = pa.ipc.open_stream(response.content).read_all()
+    assert table.column("id").to_pylist() == ["launch_2", "launch_4", "launch_6"]
+    assert table.schema.field("date_utc").type == pa.timestamp("s", tz="UTC")
+    assert table.column("success").to_pylist() == [True, True, True]
+    assert table.column("rocket").to_pylist() == ["Falcon 9"] * 3
+
+
+def test_parquet_export_round_trips(client):
+    pq = pytest.importorskip("pyarrow.parquet")
+    pa = pytest.importorskip("pyarrow")
+    response = client.get("/export/?format=parquet")
+    table = pq.read_table(pa.BufferReader(response.content))
+    assert table.num_rows == 7
+    assert table.column("flight_number").to_pylist() == list(range(1, 8))
@@ -3,6 +3,9 @@ from unittest.mock import patch
 import pytest
 from fastapi.testclient import TestClient
 
+from app.models import LaunchModel
+from app.snapshot import LaunchSnapshot
+from webapp.dependencies import get_launch_snapshot
 from webapp.main import app
 
 
@@ -53,3 +56,79 @@ def test_launches_basic_filtering(mock_data, client, mock_launches):
     assert len(data) != 0
     assert data[0]["rocket"]["name"] == "Falcon 9"
     assert data[0]["success"] is True
+
+
+@pytest.fixture
+def snapshot_client(client, mock_launches):
+    launches = [LaunchModel(**launch) for launch in mock_launches]
+    snapshot = LaunchSnapshot("v1", launches, {}, {})
+    app.dependency_overrides[get_launch_snapshot] = lambda: snapshot
+    yield client
+    app.dependency_overrides.clear()
+
+
+def test_launches_are_served_from_the_snapshot_index(snapshot_client):
+    response = snapshot_client.get("/launches/?rocket_name=starship")
+    assert response.status_code == 200
+    assert [launch["id"] for launch in response.json()] == ["launch_2"]
+
+
+def test_launches_support_etag_revalidation(snapshot_client):
+    first = snapshot_client.get("/launches/")
+    etag = first.headers["ETag"]
+
+    second = snapshot_client.get("/launches/", headers={"If-None-Match": etag})
+    assert second.status_code == 304
+    assert second.content == b""
+
+    filtered = snapshot_client.get("/launches/?success=false")
+    assert filtered.headers["ETag"] != etag
+
+
+def test_launches_are_paged_by_cursor(snapshot_client):
+    first = snapshot_client.get("/launches/?limit=1")
+    assert [launch["id"] for launch in first.json()] == ["launch_2"]
+    cursor = first.headers["X-Next-Cursor"]
+    assert 'rel="next"' in first.headers["Link"]
+
+    second = snapshot_client.get(f"/launches/?limit=1&cursor={cursor}")
+    assert [launch["id"] for launch in second.json()] == ["launch_1"]
+    assert "X-Next-Cursor" not in second.headers
+
+
+def test_launches_support_field_projection(snapshot_client):
+    response = snapshot_client.get("/launches/?limit=5&fields=id,date_utc")
+    assert response.json() == [
+        {"id": "launch_2", "date_utc": "2021-05-20T00:00:00Z"},
+        {"id": "launch_1", "date_utc": "2022-01-10T00:00:00Z"},
+    ]
+
+
+@pytest.mark.parametrize("query", ["cursor=not-a-cursor", "fields=id,bogus"])
+def test_launches_reject_bad_paging_parameters(snapshot_client, query):
+    assert snapshot_client.get(f"/launches/?{query}").status_code == 400
+
+
+def test_launches_support_full_text_search(snapshot_client):
+    response = snapshot_client.get("/launches/?q=test launch&fields=id")
+    assert response.status_code == 200
+    assert response.json() == [{"id": "launch_1"}, {"id": "launch_2"}]
+
+    filtered = snapshot_client.get("/launches/?q=launch b*&success=false")
+    assert [launch["id"] for launch in filtered.json()] == ["launch_2"]
+
+    limited = snapshot_client.get("/launches/?q=test&limit=1")
+    assert len(limited.json()) == 1
+    assert "X-Next-Cursor" not in limited.headers
+
+
+def test_launches_empty_search_lists_all_launches(snapshot_client):
+    response = snapshot_client.get("/launches/?q=&fields=id")
+    assert response.json() == snapshot_client.get("/launches/?fields=id").json()
+    assert len(response.json()) == 2
+
+
+def test_launches_search_rejects_cursor(snapshot_client):
+    cursor = snapshot_client.get("/launches/?limit=1").headers["X-Next-Cursor"]
+    response = snapshot_client.get(f"/launches/?q=test&cursor={cursor}")
+    assert response.status_code == 400
@@ -5,6 +5,8 @@ import pytest
 from fastapi.testclient import TestClient
 
 from app.models import LaunchModel, LaunchpadModel, RocketModel
+from app.snapshot import LaunchSnapshot
+from webapp.dependencies import get_launch_snapshot
 from webapp.main import app
 
 
@@ -79,3 +81,66 @@ def test_yearly_frequency(mock_data, client, mock_launches):
     mock_data.return_value = mock_launches
     response = client.get("/stats/yearly")
     assert response.status_code == 200
+
+
+@pytest.fixture
+def snapshot_client(client, mock_launches):
+    snapshot = LaunchSnapshot("v1", mock_launches, {}, {})
+    app.dependency_overrides[get_launch_snapshot] = lambda: snapshot
+    yield client
+    app.dependency_overrides.clear()
+
+
+def test_statistics_are_served_pre_encoded(snapshot_client):
+    response = snapshot_client.get("/stats/success-rate")
+    assert response.json() == {"Falcon 9": 50.0}
+
+    cached = snapshot_client.get(
+        "/stats/success-rate", headers={"If-None-Match": response.headers["ETag"]}
+    )
+    assert cached.status_code == 304
+
+
+def test_stats_query_groups_filtered_launches(snapshot_client):
+    response = snapshot_client.get(
+        "/stats/query?group_by=rocket,month&metrics=count,success_rate"
+        "&rocket_name=falcon 9"
+    )
+    assert response.status_code == 200
+    assert response.json() == [
+        {"rocket": "Falcon 9", "month": "2021-01", "count": 2, "success_rate": 50.0}
+    ]
+
+    failures = snapshot_client.get("/stats/query?success=false&metrics=count")
+    assert failures.json() == [{"count": 1}]
+
+    cached = snapshot_client.get(
+        "/stats/query?group_by=rocket,month&metrics=count,success_rate"
+        "&rocket_name=falcon 9",
+        headers={"If-None-Match": response.headers["ETag"]},
+    )
+    assert cached.status_code == 304
+
+
+def test_stats_query_rolling_metrics(snapshot_client):
+    response = snapshot_client.get(
+        "/stats/query?group_by=week&metrics=cumulative_count,rolling_success_rate"
+        "&window=2"
+    )
+    assert response.json() == [
+        {"week": "2020-W53", "cumulative_count": 1, "rolling_success_rate": 100.0},
+        {"week": "2021-W02", "cumulative_count": 2, "rolling_success_rate": 0.0},
+    ]
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "group_by=decade",
+        "metrics=median",
+        "group_by=month,rocket&metrics=cumulative_count",
+        "start_date=yesterday",
+    ],
+)
+def test_stats_query_rejects_bad_parameters(snapshot_client, query):
+    assert snapshot_client.get(f"/stats/query?{query}").status_code == 400
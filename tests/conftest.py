@@ -0,0 +1,89 @@
+"""
+Launch and tracker fakes shared by the test modules.
+"""
+
+from app.api_client import ISpaceXLaunchTracker
+from app.models import LaunchModel, LaunchpadModel, RocketModel
+
+
+def make_launch(
+    launch_id,
+    date_utc,
+    success=True,
+    rocket="Falcon 9",
+    launchpad="SLC 40",
+    name=None,
+    details=None,
+    flight_number=1,
+):
+    return LaunchModel(
+        id=launch_id,
+        name=name or f"Mission {launch_id}",
+        date_utc=date_utc,
+        success=success,
+        upcoming=False,
+        rocket=RocketModel(id=rocket, name=rocket),
+        launchpad=LaunchpadModel(id=launchpad, name=launchpad),
+        flight_number=flight_number,
+        details=details,
+    )
+
+
+class FakeTracker(ISpaceXLaunchTracker):
+    def __init__(self):
+        self.version = "v1"
+        self.launch_loads = 0
+
+    def get_launches(self):
+        self.launch_loads += 1
+        return [
+            {
+                "id": "l1",
+                "name": "Mission Alpha",
+                "date_utc": "2021-01-10T00:00:00Z",
+                "success": True,
+                "upcoming": False,
+                "rocket": "r1",
+                "launchpad": "p1",
+                "flight_number": 1,
+                "details": None,
+            }
+        ]
+
+    def get_rockets(self):
+        return [{"id": "r1", "name": "Falcon 9"}]
+
+    def get_launchpads(self):
+        return [{"id": "p1", "name": "CCSFS SLC 40"}]
+
+    def get_data_version(self):
+        return self.version
+
+
+class RowTracker(FakeTracker):
+    """
+    Serves cache rows with content hashes, like ``SpaceXClient``.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.rows = {
+            launch_id: {
+                "id": launch_id,
+                "content_hash": "h1",
+                "name": launch_id,
+                "date_utc": date_utc,
+                "success": True,
+                "upcoming": False,
+                "rocket": "r1",
+                "launchpad": "p1",
+                "flight_number": 1,
+            }
+            for launch_id, date_utc in [
+                ("l1", "2021-01-10T00:00:00Z"),
+                ("l2", "2021-02-10T00:00:00Z"),
+            ]
+        }
+
+    def get_launch_rows(self):
+        return list(self.rows.values())
@@ -0,0 +1,98 @@
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app.api_client import AsyncSpaceXClient, SpaceXClient
+from app.cache import SQLiteCache
+from app.settings import config
+
+ETAG = '"launches-v1"'
+LAUNCHES = [{"id": "abc", "name": "Test Launch", "upcoming": False}]
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    requests = []
+
+    def do_GET(self):
+        StubHandler.requests.append((self.path, self.headers.get("If-None-Match")))
+        if self.headers.get("If-None-Match") == ETAG:
+            self.send_response(304)
+            self.send_header("ETag", ETAG)
+            self.end_headers()
+            return
+        body = json.dumps(LAUNCHES if self.path == "/launches" else []).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", ETAG)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_api(monkeypatch):
+    StubHandler.requests = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base = f"http://127.0.0.1:{server.server_port}"
+    monkeypatch.setattr(config, "LAUNCHES_ENDPOINT", f"{base}/launches")
+    monkeypatch.setattr(config, "ROCKETS_ENDPOINT", f"{base}/rockets")
+    monkeypatch.setattr(config, "LAUNCHPADS_ENDPOINT", f"{base}/launchpads")
+    yield StubHandler.requests
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def caches(tmp_path):
+    db_path = str(tmp_path / "cache.db")
+    return [
+        SQLiteCache(table=table, db_path=db_path)
+        for table in ("launches", "rockets", "launchpads")
+    ]
+
+
+def _expire(cache):
+    cache.ttl = cache.ttl * 0
+
+
+def test_not_modified_response_only_extends_ttl(stub_api, caches):
+    launch_cache = caches[0]
+    client = SpaceXClient(*caches)
+
+    assert client.get_launches() == LAUNCHES
+    version = launch_cache.version()
+    assert launch_cache.validators() == {"etag": ETAG}
+
+    _expire(launch_cache)
+    synced_at = launch_cache.last_synced()
+    assert client.get_launches() == LAUNCHES
+
+    assert stub_api[-1] == ("/launches", ETAG)
+    assert launch_cache.version() == version
+    assert launch_cache.last_synced() > synced_at
+
+
+def test_async_client_sends_conditional_requests(stub_api, caches):
+    launch_cache = caches[0]
+
+    async def run():
+        client = AsyncSpaceXClient(*caches)
+        await client.get_data_version()
+        version = launch_cache.version()
+        _expire(launch_cache)
+        await client.refresh()
+        await client.aclose()
+        return version
+
+    version = asyncio.run(run())
+
+    assert ("/launches", ETAG) in stub_api
+    assert launch_cache.version() == version
@@ -1,9 +1,14 @@
+import asyncio
+import json
+import threading
 from unittest.mock import MagicMock, patch
 
+import httpx
 import pytest
 
-from app.api_client import SpaceXClient
+from app.api_client import AsyncSpaceXClient, SpaceXClient
 from app.cache import SQLiteCache
+from app.settings import config
 
 
 @pytest.fixture
@@ -95,3 +100,218 @@ def test_get_launchpads_success():
 
     pads = client.get_launchpads()
     assert pads[0]["name"] == "Starbase"
+
+
+def _cache_stub(valid: bool, version, data=None):
+    cache = MagicMock(spec=SQLiteCache)
+    cache.is_valid.return_value = valid
+    cache.version.return_value = version
+    cache.load.return_value = data or []
+    cache.validators.return_value = {}
+    return cache
+
+
+def _mock_transport(payloads, seen):
+    def handler(request):
+        seen.append(request.url.path)
+        return httpx.Response(200, json=payloads[request.url.path.rsplit("/", 1)[-1]])
+
+    return httpx.MockTransport(handler)
+
+
+def test_async_client_fetches_empty_tables(mock_launch_data):
+    seen = []
+    payloads = {
+        "launches": mock_launch_data,
+        "rockets": [{"id": "rocket_123", "name": "Falcon 9"}],
+        "launchpads": [{"id": "pad_456", "name": "Starbase"}],
+    }
+    caches = [_cache_stub(False, None) for _ in range(3)]
+
+    async def run():
+        client = AsyncSpaceXClient(
+            *caches,
+            http_client=httpx.AsyncClient(transport=_mock_transport(payloads, seen)),
+        )
+        await client.get_data_version()
+        await client.aclose()
+
+    asyncio.run(run())
+
+    assert sorted(seen) == ["/v4/launches", "/v4/launchpads", "/v4/rockets"]
+    assert caches[0].sync.call_args.args[0] == mock_launch_data
+
+
+def test_async_client_serves_stale_data_while_revalidating(mock_launch_data):
+    launch_cache = _cache_stub(False, "old", mock_launch_data)
+
+    async def run():
+        upstream_released = asyncio.Event()
+
+        async def handler(request):
+            await upstream_released.wait()
+            return httpx.Response(200, json=mock_launch_data)
+
+        client = AsyncSpaceXClient(
+            launch_cache,
+            _cache_stub(True, "r"),
+            _cache_stub(True, "p"),
+            http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        )
+        launches = await client.get_launches()
+        launch_cache.sync.assert_not_called()
+
+        upstream_released.set()
+        await asyncio.gather(*client._background)
+        await client.aclose()
+        return launches
+
+    launches = asyncio.run(run())
+
+    assert launches[0]["id"] == "abc"
+    assert launch_cache.sync.call_args.args[0] == mock_launch_data
+
+
+def test_async_client_reads_caches_off_the_event_loop():
+    loop_threads = set()
+    cache_threads = []
+
+    def on_read(*args):
+        cache_threads.append(threading.get_ident())
+        return True
+
+    caches = [_cache_stub(True, "v") for _ in range(3)]
+    for cache in caches:
+        cache.is_valid.side_effect = on_read
+        cache.is_stale.side_effect = lambda *args: on_read() and False
+        cache.version.side_effect = lambda: on_read() and "v"
+
+    async def run():
+        loop_threads.add(threading.get_ident())
+        client = AsyncSpaceXClient(*caches, http_client=httpx.AsyncClient())
+        version = await client.get_data_version()
+        await client.aclose()
+        return version
+
+    assert asyncio.run(run()) == "v|v|v"
+    assert cache_threads
+    assert loop_threads.isdisjoint(cache_threads)
+
+
+def _query_api(collections, requests, page_size=2):
+    """
+    Local stand-in for the upstream POST <collection>/query endpoints.
+    Tracks how many page requests are in flight at once.
+    """
+    state = {"in_flight": 0, "max_in_flight": 0}
+
+    async def handler(request):
+        assert request.method == "POST"
+        body = json.loads(request.content)
+        requests.append((request.url.path, body))
+        state["in_flight"] += 1
+        state["max_in_flight"] = max(state["max_in_flight"], state["in_flight"])
+        await asyncio.sleep(0.01)
+        state["in_flight"] -= 1
+
+        docs = collections[request.url.path.split("/")[-2]]
+        if "$or" in body["query"]:
+            wanted = set(body["query"]["$or"][1]["_id"]["$in"])
+            docs = [d for d in docs if d.get("upcoming") or d["id"] in wanted]
+        page = body["options"]["page"]
+        selected = [
+            {key: doc[key] for key in body["options"]["select"] if key in doc}
+            for doc in docs[(page - 1) * page_size : page * page_size]
+        ]
+        total_pages = max(1, -(-len(docs) // page_size))
+        return httpx.Response(200, json={"docs": selected, "totalPages": total_pages})
+
+    return httpx.MockTransport(handler), state
+
+
+def test_async_client_pages_through_the_query_api(monkeypatch):
+    monkeypatch.setattr(config, "UPSTREAM_QUERY_CONCURRENCY", 2)
+    launches = [
+        {"id": f"l{i}", "name": f"Mission {i}", "fairings": {"big": "blob"}}
+        for i in range(9)
+    ]
+    requests = []
+    transport, state = _query_api({"launches": launches}, requests)
+    caches = [_cache_stub(False, None), _cache_stub(True, "r"), _cache_stub(True, "p")]
+
+    async def run():
+        client = AsyncSpaceXClient(
+            *caches,
+            http_client=httpx.AsyncClient(transport=transport),
+            query_api=True,
+        )
+        await client.get_data_version()
+        await client.aclose()
+
+    asyncio.run(run())
+
+    synced = caches[0].sync.call_args.args[0]
+    assert sorted(doc["id"] for doc in synced) == [f"l{i}" for i in range(9)]
+    assert all("fairings" not in doc for doc in synced)
+    assert {path for path, _ in requests} == {"/v4/launches/query"}
+    pages = sorted(body["options"]["page"] for _, body in requests)
+    assert pages == [1, 2, 3, 4, 5]
+    assert "fairings" not in requests[0][1]["options"]["select"]
+    assert state["max_in_flight"] == 2
+
+
+def test_async_hot_sync_uses_one_query(monkeypatch):
+    launch_cache = _cache_stub(True, "v1")
+    launch_cache.is_stale.return_value = True
+    launch_cache.hot_ids.return_value = ["recent"]
+    launches = [
+        {"id": "next", "upcoming": True},
+        {"id": "recent", "upcoming": False},
+        {"id": "settled", "upcoming": False},
+    ]
+    requests = []
+    transport, _ = _query_api({"launches": launches}, requests)
+
+    async def run():
+        client = AsyncSpaceXClient(
+            launch_cache,
+            _cache_stub(True, "r"),
+            _cache_stub(True, "p"),
+            http_client=httpx.AsyncClient(transport=transport),
+            query_api=True,
+        )
+        await client._sync_hot_launches()
+        await client.aclose()
+
+    asyncio.run(run())
+
+    assert [path for path, _ in requests] == ["/v4/launches/query"]
+    synced = launch_cache.sync.call_args.args[0]
+    assert sorted(doc["id"] for doc in synced) == ["next", "recent"]
+
+
+def test_sync_client_shares_query_paging_and_timeout(monkeypatch):
+    monkeypatch.setattr(config, "UPSTREAM_QUERY_CONCURRENCY", 2)
+    launches = [{"id": f"l{i}", "name": f"Mission {i}"} for i in range(9)]
+    requests = []
+
+    def handler(request):
+        body = json.loads(request.content)
+        requests.append((request.url.path, body))
+        page = body["options"]["page"]
+        docs = launches[(page - 1) * 2 : page * 2]
+        return httpx.Response(200, json={"docs": docs, "totalPages": 5})
+
+    caches = [_cache_stub(False, None), _cache_stub(True, "r"), _cache_stub(True, "p")]
+    for cache in caches:
+        cache.acquire_lease.return_value = True
+
+    client = SpaceXClient(*caches, query_api=True)
+    assert client._http_client.timeout.read == config.HTTP_TIMEOUT_SECONDS
+    client._http_client = httpx.Client(transport=httpx.MockTransport(handler))
+    client.get_launches()
+
+    synced = caches[0].sync.call_args.args[0]
+    assert sorted(doc["id"] for doc in synced) == [f"l{i}" for i in range(9)]
+    pages = sorted(body["options"]["page"] for _, body in requests)
+    assert pages == [1, 2, 3, 4, 5]
@@ -0,0 +1,123 @@
+from datetime import datetime
+
+import pytest
+
+from app.aggregation import aggregate
+from app.columnar import LaunchColumns
+from app.snapshot import LaunchSnapshot
+from tests.conftest import make_launch
+
+
+@pytest.fixture
+def columns():
+    return LaunchColumns(
+        [
+            make_launch("l1", datetime(2021, 1, 10), True, "Falcon 9", "SLC 40"),
+            make_launch("l2", datetime(2021, 1, 15), False, "Falcon 9", "LC 39A"),
+            make_launch("l3", datetime(2021, 4, 1), True, "Falcon Heavy", "LC 39A"),
+            make_launch("l4", datetime(2021, 4, 2), True, "Falcon 9", "SLC 40"),
+            make_launch("l5", datetime(2022, 1, 3), None, "Falcon 9", "SLC 40"),
+        ]
+    )
+
+
+def test_group_by_rocket(columns):
+    assert aggregate(columns, ["rocket"], ["count", "successes", "success_rate"]) == [
+        {"rocket": "Falcon 9", "count": 4, "successes": 2, "success_rate": 50.0},
+        {"rocket": "Falcon Heavy", "count": 1, "successes": 1, "success_rate": 100.0},
+    ]
+
+
+def test_time_buckets(columns):
+    assert aggregate(columns, ["quarter"]) == [
+        {"quarter": "2021-Q1", "count": 2},
+        {"quarter": "2021-Q2", "count": 2},
+        {"quarter": "2022-Q1", "count": 1},
+    ]
+    assert aggregate(
+        columns, ["week"], start_date="2021-01-01", end_date="2021-01-31"
+    ) == [
+        {"week": "2021-W01", "count": 1},
+        {"week": "2021-W02", "count": 1},
+    ]
+    assert aggregate(columns, ["year"], ["count", "failures"]) == [
+        {"year": "2021", "count": 4, "failures": 1},
+        {"year": "2022", "count": 1, "failures": 0},
+    ]
+
+
+def test_no_dimensions_totals_selected_rows(columns):
+    assert aggregate(columns, metrics=["count", "failures"]) == [
+        {"count": 5, "failures": 1}
+    ]
+    assert aggregate(columns, start_date="2023-01-01") == []
+
+
+def test_date_bounds_and_positions(columns):
+    assert aggregate(columns, ["launchpad"], start_date="2021-02-01") == [
+        {"launchpad": "LC 39A", "count": 1},
+        {"launchpad": "SLC 40", "count": 2},
+    ]
+    assert aggregate(columns, ["rocket"], positions=[2]) == [
+        {"rocket": "Falcon Heavy", "count": 1}
+    ]
+
+
+def test_cumulative_and_rolling_metrics(columns):
+    rows = aggregate(
+        columns,
+        ["month"],
+        ["count", "cumulative_count", "rolling_success_rate"],
+        window=3,
+    )
+    assert rows == [
+        {
+            "month": "2021-01",
+            "count": 2,
+            "cumulative_count": 2,
+            "rolling_success_rate": 50.0,
+        },
+        # The window covers 2021-02..2021-04; January has dropped out.
+        {
+            "month": "2021-04",
+            "count": 2,
+            "cumulative_count": 4,
+            "rolling_success_rate": 100.0,
+        },
+        {
+            "month": "2022-01",
+            "count": 1,
+            "cumulative_count": 5,
+            "rolling_success_rate": 0.0,
+        },
+    ]
+
+
+def test_series_restart_per_leading_group(columns):
+    rows = aggregate(columns, ["rocket", "year"], ["cumulative_count"])
+    assert rows == [
+        {"rocket": "Falcon 9", "year": "2021", "cumulative_count": 3},
+        {"rocket": "Falcon 9", "year": "2022", "cumulative_count": 4},
+        {"rocket": "Falcon Heavy", "year": "2021", "cumulative_count": 1},
+    ]
+
+
+@pytest.mark.parametrize(
+    "params",
+    [
+        {"group_by": ["decade"]},
+        {"metrics": ["median"]},
+        {"group_by": ["year", "year"]},
+        {"group_by": ["month", "rocket"], "metrics": ["cumulative_count"]},
+        {"group_by": ["month"], "metrics": ["rolling_success_rate"], "window": 0},
+    ],
+)
+def test_invalid_arguments(columns, params):
+    with pytest.raises(ValueError):
+        aggregate(columns, **params)
+
+
+def test_snapshot_aggregate_uses_its_columns(columns):
+    launches = [make_launch("l1", datetime(2021, 1, 10), True, "Falcon 9", "SLC 40")]
+    snapshot = LaunchSnapshot("v1", launches, {}, {})
+    assert snapshot.aggregate(group_by=["month"]) == [{"month": "2021-01", "count": 1}]
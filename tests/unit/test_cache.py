@@ -0,0 +1,177 @@
+import threading
+from datetime import timedelta
+
+import pytest
+
+from app.cache import LAUNCH_COLUMNS, LAUNCH_SEARCH_FIELDS, SQLiteCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return SQLiteCache(table="launches", db_path=str(tmp_path / "cache.db"))
+
+
+@pytest.fixture
+def launch_cache(tmp_path):
+    return SQLiteCache(
+        table="launches", db_path=str(tmp_path / "cache.db"), columns=LAUNCH_COLUMNS
+    )
+
+
+def test_save_and_load_round_trip(cache):
+    assert cache.version() is None
+    cache.save([{"id": "b", "name": "Beta"}, {"id": "a", "name": "Alpha"}])
+    assert [item["id"] for item in cache.load()] == ["a", "b"]
+    assert cache.is_valid()
+
+
+def test_lease_is_exclusive_until_released(cache):
+    assert cache.acquire_lease("worker-1", ttl_seconds=30)
+    assert not cache.acquire_lease("worker-2", ttl_seconds=30)
+    cache.release_lease("worker-1")
+    assert cache.acquire_lease("worker-2", ttl_seconds=30)
+
+
+def test_expired_lease_can_be_taken_over(cache):
+    assert cache.acquire_lease("worker-1", ttl_seconds=-1)
+    assert cache.acquire_lease("worker-2", ttl_seconds=30)
+
+
+def test_readers_see_previous_rows_while_save_is_in_flight(cache):
+    cache.save([{"id": "a", "name": "Alpha"}])
+    seen = []
+
+    with cache._transaction() as conn:
+        conn.execute("DELETE FROM launches;")
+        reader = threading.Thread(target=lambda: seen.extend(cache.load()))
+        reader.start()
+        reader.join()
+
+    assert [item["id"] for item in seen] == ["a"]
+    assert cache.load() == []
+
+
+def test_sync_only_writes_changed_rows(cache):
+    cache.sync([{"id": "a", "name": "Alpha"}, {"id": "b", "name": "Beta"}])
+    version = cache.version()
+
+    result = cache.sync([{"id": "a", "name": "Alpha"}, {"id": "b", "name": "Beta"}])
+    assert not result.changed
+    assert result.unchanged == 2
+    assert cache.version() == version
+
+    result = cache.sync([{"id": "a", "name": "Alpha 2"}, {"id": "c", "name": "Gamma"}])
+    assert result.updated == ["a"]
+    assert result.inserted == ["c"]
+    assert result.removed == ["b"]
+    assert cache.version() != version
+
+
+def test_changes_combine_journaled_syncs(cache):
+    cache.sync([{"id": "a", "name": "Alpha"}, {"id": "b", "name": "Beta"}])
+    start = cache.version()
+    cache.sync([{"id": "a", "name": "Alpha 2"}, {"id": "c", "name": "Gamma"}])
+    cache.sync([{"id": "a", "name": "Alpha 2"}, {"id": "b", "name": "Beta 2"}])
+    end = cache.version()
+
+    changes = cache.changes(start, end)
+    assert changes.inserted == []
+    assert changes.updated == ["a", "b"]
+    assert changes.removed == []
+    assert cache.changes(end, end).changed is False
+
+    # A full save replaces rows without journaling a delta.
+    cache.save([{"id": "a", "name": "Alpha"}])
+    assert cache.changes(end, cache.version()) is None
+    assert cache.changes(start, end) is not None
+
+
+def test_hot_sync_keeps_rows_missing_from_the_subset(cache):
+    cache.sync([{"id": "a", "upcoming": True}, {"id": "b", "upcoming": False}])
+    result = cache.sync([{"id": "a", "upcoming": False}], prune=False)
+    assert result.updated == ["a"]
+    assert result.removed == []
+    assert {item["id"] for item in cache.load()} == {"a", "b"}
+
+
+def test_hot_ids_cover_upcoming_and_recent_launches(cache):
+    cache.sync(
+        [
+            {"id": "next", "upcoming": True, "date_utc": "2099-01-01T00:00:00.000Z"},
+            {"id": "old", "upcoming": False, "date_utc": "2006-03-24T22:30:00.000Z"},
+        ]
+    )
+    assert cache.hot_ids(timedelta(days=7)) == ["next"]
+
+
+def test_hot_columns_are_loaded_without_decoding_the_payload(launch_cache):
+    launch_cache.sync(
+        [
+            {
+                "id": "a",
+                "date_utc": "2020-01-01T00:00:00.000Z",
+                "success": True,
+                "rocket": "r1",
+                "links": {"reddit": {}},
+            }
+        ]
+    )
+    launch_cache.sync([{"id": "a", "success": False, "rocket": "r2"}])
+
+    [row] = launch_cache.load_rows()
+    assert row["success"] is False
+    assert row["rocket"] == "r2"
+    assert row["date_utc"] is None
+    assert isinstance(row["data"], str)
+
+
+def test_hot_columns_are_backfilled_for_existing_rows(cache, tmp_path):
+    cache.save([{"id": "a", "upcoming": True, "rocket": "r1"}])
+
+    migrated = SQLiteCache(
+        table="launches", db_path=str(tmp_path / "cache.db"), columns=LAUNCH_COLUMNS
+    )
+    [row] = migrated.load_rows()
+    assert row["upcoming"] is True
+    assert row["rocket"] == "r1"
+    assert row["success"] is None
+
+
+def test_hot_ids_use_hot_columns(launch_cache):
+    launch_cache.sync(
+        [
+            {"id": "next", "upcoming": True, "date_utc": "2099-01-01T00:00:00.000Z"},
+            {"id": "old", "upcoming": False, "date_utc": "2006-03-24T22:30:00.000Z"},
+        ]
+    )
+    assert launch_cache.hot_ids(timedelta(days=7)) == ["next"]
+
+
+def test_ttl_is_in_seconds(tmp_path):
+    cache = SQLiteCache("launches", str(tmp_path / "cache.db"), ttl_seconds=3600)
+    assert cache.ttl == timedelta(hours=1)
+
+
+def test_search_index_follows_saves_and_syncs(tmp_path):
+    cache = SQLiteCache(
+        table="launches",
+        db_path=str(tmp_path / "cache.db"),
+        columns=LAUNCH_COLUMNS,
+        search_fields=LAUNCH_SEARCH_FIELDS,
+    )
+    cache.save(
+        [
+            {"id": "a", "name": "Starlink 1", "details": None},
+            {"id": "b", "name": "CRS-22", "details": "Starlink rideshare"},
+        ]
+    )
+    # Name matches are weighted above details matches.
+    assert [row["id"] for row in cache.search_rows('"starlink"', (2.0, 1.0))] == [
+        "a",
+        "b",
+    ]
+
+    # "a" is pruned and "b" re-indexed with its new details.
+    cache.sync([{"id": "b", "name": "CRS-22", "details": "Cargo only"}])
+    assert [row["id"] for row in cache.search_rows('"starlink"')] == []
+    assert [row["id"] for row in cache.search_rows('"carg"*')] == ["b"]
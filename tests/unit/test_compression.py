@@ -0,0 +1,34 @@
+import gzip
+
+import pytest
+
+from webapp.compression import compress_stream, negotiate_encoding
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        (None, None),
+        ("identity", None),
+        ("gzip, deflate", "gzip"),
+        ("gzip;q=0", None),
+        ("br;q=1.0, gzip;q=0.5", "gzip"),
+    ],
+)
+def test_negotiate_encoding(header, expected):
+    assert negotiate_encoding(header) == expected
+
+
+def test_gzip_stream_round_trips():
+    chunks = [b"id,name\n", b"1,Alpha\n", b"2,Beta\n"]
+    assert gzip.decompress(b"".join(compress_stream(chunks, "gzip"))) == b"".join(
+        chunks
+    )
+
+
+def test_zstd_is_preferred_when_available():
+    zstandard = pytest.importorskip("zstandard")
+    assert negotiate_encoding("gzip, zstd") == "zstd"
+    compressed = b"".join(compress_stream([b"a" * 1000], "zstd"))
+    reader = zstandard.ZstdDecompressor().decompressobj()
+    assert reader.decompress(compressed) == b"a" * 1000
@@ -0,0 +1,113 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from app.aggregation import aggregate
+from app.cube import LaunchCube
+from app.snapshot import LaunchSnapshot
+from tests.conftest import make_launch
+
+
+@pytest.fixture
+def snapshot():
+    launches = [
+        make_launch(
+            "l1", datetime(2020, 12, 5, tzinfo=timezone.utc), True, "Falcon 9", "SLC 40"
+        ),
+        make_launch(
+            "l2", datetime(2021, 1, 10, tzinfo=timezone.utc), True, "Falcon 9", "SLC 40"
+        ),
+        make_launch(
+            "l3",
+            datetime(2021, 1, 15, tzinfo=timezone.utc),
+            False,
+            "Falcon 9",
+            "LC 39A",
+        ),
+        make_launch(
+            "l4", datetime(2021, 1, 15, tzinfo=timezone.utc), True, "Falcon 9", "LC 39A"
+        ),
+        make_launch(
+            "l5",
+            datetime(2021, 4, 1, tzinfo=timezone.utc),
+            True,
+            "Falcon Heavy",
+            "LC 39A",
+        ),
+        make_launch(
+            "l6", datetime(2021, 6, 30, tzinfo=timezone.utc), None, "Falcon 9", "SLC 40"
+        ),
+        make_launch(
+            "l7",
+            datetime(2022, 2, 3, tzinfo=timezone.utc),
+            False,
+            "Starship",
+            "Starbase",
+        ),
+    ]
+    return LaunchSnapshot("v1", launches, {}, {})
+
+
+def scan(snapshot, group_by, metrics, window=3, **filters):
+    positions = snapshot.index.positions(**filters)
+    return aggregate(
+        snapshot.columns, group_by, metrics, positions=positions, window=window
+    )
+
+
+@pytest.mark.parametrize(
+    "group_by, metrics",
+    [
+        ((), ("count", "successes", "failures")),
+        (("rocket",), ("count", "success_rate")),
+        (("launchpad", "year"), ("count", "failures")),
+        (("rocket", "month"), ("count", "cumulative_count", "rolling_success_rate")),
+        (("quarter",), ("success_rate", "cumulative_count")),
+    ],
+)
+@pytest.mark.parametrize(
+    "filters",
+    [
+        {},
+        {"success": True},
+        {"success": False},
+        {"rocket_name": "falcon 9"},
+        {"launchpad_name": "LC 39A", "success": True},
+        {"start_date": "2021-01-01", "end_date": "2021-06-30T23:59:59"},
+        {"start_date": "2021-02-15", "end_date": "2021-05-31"},
+    ],
+)
+def test_cube_matches_scan(snapshot, group_by, metrics, filters):
+    rows = snapshot.cube.aggregate(group_by, metrics, **filters)
+    assert rows == scan(snapshot, group_by, metrics, **filters)
+
+
+@pytest.mark.parametrize(
+    "group_by, filters",
+    [
+        (("week",), {}),
+        # 2021-01-10 is before the bound, inside its month.
+        ((), {"start_date": "2021-01-12"}),
+        # 2021-06-30T00:00 is included but later launches that day would not be.
+        ((), {"end_date": "2021-06-30"}),
+    ],
+)
+def test_queries_the_cube_does_not_cover(snapshot, group_by, filters):
+    assert snapshot.cube.aggregate(group_by, **filters) is None
+    # The snapshot falls back to scanning the matching launches.
+    assert snapshot.aggregate(group_by, **filters) == scan(
+        snapshot, group_by, ("count",), **filters
+    )
+
+
+def test_cube_respects_memory_budget(snapshot):
+    assert LaunchCube.build(snapshot.columns, max_bytes=0) is None
+    cube = LaunchCube.build(snapshot.columns)
+    # Launches sharing a month, rocket and launchpad share a cell.
+    assert cube.size == 6
+    assert cube.nbytes > 0
+
+
+def test_cube_on_empty_snapshot():
+    snapshot = LaunchSnapshot("v1", [], {}, {})
+    assert snapshot.cube.aggregate(("rocket",)) == []
@@ -0,0 +1,107 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from app.filters import (
+    filter_by_date_range,
+    filter_by_launchpad,
+    filter_by_rocket_name,
+    filter_by_success,
+)
+from app.index import LaunchIndex
+from tests.conftest import make_launch
+
+
+@pytest.fixture
+def sample_launches():
+    return [
+        make_launch(
+            "1",
+            datetime(2022, 1, 15, tzinfo=timezone.utc),
+            True,
+            "Falcon 9",
+            "CCSFS SLC 40",
+        ),
+        make_launch(
+            "2",
+            datetime(2021, 7, 10, tzinfo=timezone.utc),
+            False,
+            "Starship",
+            "Starbase",
+        ),
+        make_launch(
+            "3", datetime(2020, 3, 1, tzinfo=timezone.utc), True, "Falcon 9", "Starbase"
+        ),
+        make_launch(
+            "4",
+            datetime(2022, 6, 30, tzinfo=timezone.utc),
+            None,
+            "Falcon Heavy",
+            "KSC LC 39A",
+        ),
+        make_launch(
+            "5",
+            datetime(2021, 12, 31, tzinfo=timezone.utc),
+            True,
+            "Falcon 9",
+            "CCSFS SLC 40",
+        ),
+    ]
+
+
+@pytest.mark.parametrize(
+    "filters",
+    [
+        {},
+        {"start_date": "2021-01-01"},
+        {"end_date": "2021-12-31"},
+        {"start_date": "2021-01-01", "end_date": "2022-01-31", "success": True},
+        {"rocket_name": "falcon 9", "launchpad_name": "Starbase"},
+        {"success": False, "rocket_name": "Falcon 9"},
+        {"launchpad_name": "Vandenberg"},
+    ],
+)
+def test_query_matches_filter_chain(sample_launches, filters):
+    expected = filter_by_date_range(
+        sample_launches, filters.get("start_date"), filters.get("end_date")
+    )
+    expected = filter_by_success(expected, filters.get("success"))
+    expected = filter_by_rocket_name(expected, {}, filters.get("rocket_name"))
+    expected = filter_by_launchpad(expected, {}, filters.get("launchpad_name"))
+
+    result = LaunchIndex(sample_launches).query(**filters)
+
+    assert [launch.id for launch in result] == [launch.id for launch in expected]
+
+
+def test_date_range_bounds_are_inclusive(sample_launches):
+    result = LaunchIndex(sample_launches).query(
+        start_date="2021-07-10T00:00:00+00:00", end_date="2022-01-15T00:00:00+00:00"
+    )
+    assert [launch.id for launch in result] == ["1", "2", "5"]
+
+
+@pytest.mark.parametrize(
+    "filters",
+    [{}, {"rocket_name": "Falcon 9"}, {"start_date": "2021-01-01", "success": True}],
+)
+def test_pages_walk_matches_in_date_id_order(sample_launches, filters):
+    index = LaunchIndex(sample_launches)
+    expected = sorted((launch.date_utc, launch.id) for launch in index.query(**filters))
+
+    seen, after = [], None
+    while True:
+        positions, after = index.page(after, 2, **filters)
+        assert len(positions) <= 2
+        seen.extend(index.key(i) for i in positions)
+        if after is None:
+            break
+
+    assert seen == expected
+
+
+def test_page_resumes_after_a_removed_cursor(sample_launches):
+    cursor = (datetime(2021, 1, 1, tzinfo=timezone.utc), "gone")
+    positions, after = LaunchIndex(sample_launches).page(cursor, 10)
+    assert [sample_launches[i].id for i in positions] == ["2", "5", "1", "4"]
+    assert after is None
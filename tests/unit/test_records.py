@@ -0,0 +1,68 @@
+import copy
+import json
+
+import pytest
+
+from app.records import LaunchRecord, build_records, to_model
+from app.utils import enrich_launches
+
+
+@pytest.fixture
+def raw_launches():
+    return [
+        {
+            "id": f"l{i}",
+            "name": f"Mission {i}",
+            "date_utc": f"2021-0{i}-10T00:00:00.000Z",
+            "success": i % 2 == 0,
+            "upcoming": False,
+            "rocket": "r1",
+            "launchpad": "p1" if i < 3 else "p2",
+            "flight_number": i,
+            "details": None,
+            "webcast": "https://youtu.be/abc",
+            "links": {"reddit": {}},
+        }
+        for i in range(1, 5)
+    ]
+
+
+def test_records_share_rocket_and_launchpad_refs(raw_launches):
+    records = build_records(raw_launches, {"r1": "Falcon 9"}, {"p1": "Starbase"})
+    assert all(isinstance(record, LaunchRecord) for record in records)
+    assert len({id(record.rocket) for record in records}) == 1
+    assert len({id(record.launchpad) for record in records}) == 2
+    assert records[3].launchpad.name == "Unknown"
+
+
+def test_records_are_slotted(raw_launches):
+    record = build_records(raw_launches, {}, {})[0]
+    with pytest.raises(AttributeError):
+        record.extra = True
+
+
+def test_boundary_model_matches_enriched_launch(raw_launches):
+    rocket_map, launchpad_map = {"r1": "Falcon 9"}, {"p1": "Starbase"}
+    records = build_records(copy.deepcopy(raw_launches), rocket_map, launchpad_map)
+    expected = enrich_launches(raw_launches, rocket_map, launchpad_map)
+    assert [to_model(record) for record in records] == expected
+
+
+def test_payload_is_decoded_without_being_kept(raw_launches):
+    row = {
+        "id": "l1",
+        "name": "Mission 1",
+        "date_utc": "2021-01-10T00:00:00.000Z",
+        "success": True,
+        "upcoming": False,
+        "rocket": "r1",
+        "launchpad": "p1",
+        "flight_number": 1,
+        "data": json.dumps(raw_launches[0]),
+    }
+    [record] = build_records([row], {}, {})
+    assert isinstance(record._payload, str)
+    assert record.links == {"reddit": {}}
+    assert record.webcast == "https://youtu.be/abc"
+    assert to_model(record).links == {"reddit": {}}
+    assert isinstance(record._payload, str)
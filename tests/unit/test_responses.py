@@ -0,0 +1,34 @@
+from webapp.responses import EncodedResponseCache
+
+
+def test_response_cache_is_bounded_by_body_bytes():
+    cache = EncodedResponseCache(max_bytes=10)
+    renders = []
+
+    def body(size):
+        def render():
+            renders.append(size)
+            return b"x" * size
+
+        return render
+
+    cache.get("v1", "a", body(4))
+    cache.get("v1", "b", body(4))
+    cache.get("v1", "a", body(4))
+    cache.get("v1", "c", body(4))
+    assert cache.size == 8
+    assert renders == [4, 4, 4]
+
+    # "b" was least recently used, so it was evicted and is rendered again.
+    cache.get("v1", "a", body(4))
+    cache.get("v1", "b", body(4))
+    assert renders == [4, 4, 4, 4]
+
+    # Bodies over the whole budget are served but never kept.
+    assert cache.get("v1", "huge", body(11)).body == b"x" * 11
+    assert cache.size <= 10
+    cache.get("v1", "huge", body(11))
+    assert renders.count(11) == 2
+
+    cache.get("v2", "a", body(2))
+    assert cache.size == 2
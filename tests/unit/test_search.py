@@ -0,0 +1,85 @@
+import json
+from datetime import datetime, timezone
+
+import pytest
+
+from app.search import SearchIndex, fts_query, parse_query, tokenize
+from app.snapshot import LaunchSnapshot, SnapshotStore
+from tests.conftest import RowTracker, make_launch
+
+
+@pytest.fixture
+def launches():
+    return [
+        make_launch(
+            "1",
+            datetime(2021, 1, 1, tzinfo=timezone.utc),
+            name="Starlink 4-1",
+            details="Batch of Starlink satellites",
+        ),
+        make_launch(
+            "2",
+            datetime(2021, 1, 2, tzinfo=timezone.utc),
+            name="CRS-22",
+            details="Resupply mission to the ISS, with Starlink",
+        ),
+        make_launch(
+            "3",
+            datetime(2021, 1, 3, tzinfo=timezone.utc),
+            False,
+            name="Crew-2",
+            details="Crewed Dragon mission to the ISS",
+        ),
+        make_launch(
+            "4", datetime(2021, 1, 4, tzinfo=timezone.utc), name="Starship SN15"
+        ),
+    ]
+
+
+def test_tokenize_folds_case_and_diacritics():
+    assert tokenize("Émission d'ÉTÉ, SN_15") == ["emission", "d", "ete", "sn", "15"]
+    assert tokenize(None) == []
+
+
+def test_parse_query_marks_prefix_terms():
+    terms = parse_query('star* "ISS"')
+    assert terms == [("star", True), ("iss", False)]
+    assert fts_query(terms) == '"star"* "iss"'
+
+
+def test_search_ranks_name_matches_first(launches):
+    index = SearchIndex(launches)
+    assert index.search("starlink") == [0, 1]
+    assert index.search("mission iss") == [2, 1]
+
+
+def test_search_matches_prefixes(launches):
+    index = SearchIndex(launches)
+    assert sorted(index.search("star*")) == [0, 1, 3]
+    assert index.search("star") == []
+    assert index.search("crew*") == [2]
+
+
+def test_search_requires_every_term(launches):
+    index = SearchIndex(launches)
+    assert index.search("starlink dragon") == []
+    assert index.search("  ,;") == []
+
+
+def test_snapshot_search_applies_filters_and_limit(launches):
+    snapshot = LaunchSnapshot("v1", launches, {}, {})
+    assert [l.id for l in snapshot.search("iss", success=True)] == ["2"]
+    # The shorter "Starship SN15" outranks "Starlink 4-1" and its details.
+    assert [l.id for l in snapshot.search("star*", limit=2)] == ["4", "1"]
+
+
+def test_search_index_is_built_at_refresh_and_keeps_payloads_raw():
+    tracker = RowTracker()
+    for row in tracker.rows.values():
+        row["data"] = json.dumps({"details": f"Details of {row['id']}"})
+    snapshot = SnapshotStore().get(tracker)
+    assert "search_index" in vars(snapshot)
+    assert all(isinstance(launch._payload, str) for launch in snapshot.launches)
+
+    assert [launch.id for launch in snapshot.search("details l2")] == ["l2"]
+    assert all(isinstance(launch._payload, str) for launch in snapshot.launches)
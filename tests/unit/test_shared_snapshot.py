@@ -0,0 +1,109 @@
+import numpy as np
+
+from app.records import to_model
+from app.shared_snapshot import MappedLaunches, SharedSnapshotFile
+from app.snapshot import LaunchSnapshot, SnapshotStore
+from tests.conftest import FakeTracker
+
+RAW_LAUNCHES = [
+    {
+        "id": "l1",
+        "name": "Mission Alpha",
+        "date_utc": "2021-01-10T12:30:00.000Z",
+        "success": True,
+        "upcoming": False,
+        "rocket": "r1",
+        "launchpad": "p1",
+        "flight_number": 1,
+        "details": "First flight",
+        "links": {"reddit": {"launch": None}},
+    },
+    {
+        "id": "l2",
+        "name": "Mission Beta",
+        "date_utc": "2022-03-01T00:00:00.000Z",
+        "success": None,
+        "upcoming": True,
+        "rocket": "r1",
+        "launchpad": "p9",
+        "flight_number": None,
+        "details": None,
+    },
+]
+ROCKETS = [{"id": "r1", "name": "Falcon 9"}]
+LAUNCHPADS = [{"id": "p1", "name": "CCSFS SLC 40"}]
+
+
+def _snapshot(version):
+    return LaunchSnapshot.build(version, RAW_LAUNCHES, ROCKETS, LAUNCHPADS)
+
+
+def test_mapped_snapshot_matches_the_built_one(tmp_path):
+    built = _snapshot("v1")
+    SharedSnapshotFile(str(tmp_path)).publish(built)
+
+    mapped = SharedSnapshotFile(str(tmp_path)).open("v1")
+    assert [to_model(launch) for launch in mapped.launches] == [
+        to_model(launch) for launch in built.launches
+    ]
+    assert mapped.launches[0].rocket is mapped.launches[1].rocket
+    assert mapped.launchpad_map == built.launchpad_map
+    for name in ("success-rate", "launchpads", "monthly", "yearly"):
+        assert mapped.statistic(name) == built.statistic(name)
+
+
+def test_mapped_launches_and_search_stay_in_the_mapping(tmp_path):
+    built = _snapshot("v1")
+    mapped = SharedSnapshotFile(str(tmp_path)).publish(built)
+
+    assert isinstance(mapped.launches, MappedLaunches)
+    # Records are built on access from the mapping and not kept.
+    assert mapped.launches[0] is not mapped.launches[0]
+    assert isinstance(mapped.launches[0]._payload, memoryview)
+    assert mapped.launches[-1].id == "l2"
+    assert [launch.id for launch in mapped.query(success=True)] == ["l1"]
+
+    assert not mapped.search_index.positions.flags.owndata
+    assert [launch.id for launch in mapped.search("first flight")] == ["l1"]
+    assert [launch.id for launch in mapped.search("mission")] == [
+        launch.id for launch in built.search("mission")
+    ]
+
+
+def test_mapped_columns_are_read_only_views(tmp_path):
+    mapped = SharedSnapshotFile(str(tmp_path)).publish(_snapshot("v1"))
+    assert not mapped.columns.timestamps.flags.owndata
+    assert not mapped.columns.timestamps.flags.writeable
+    np.testing.assert_array_equal(mapped.columns.success, [1, -1])
+
+
+def test_publish_swaps_generations_atomically(tmp_path):
+    shared = SharedSnapshotFile(str(tmp_path))
+    first = shared.publish(_snapshot("v1"))
+    shared.publish(_snapshot("v2"))
+
+    assert shared.generation() == 2
+    assert shared.open("v1") is None
+    assert shared.open("v2").version == "v2"
+    assert len([name for name in tmp_path.iterdir() if name.suffix == ".bin"]) == 1
+    # A worker still holding the old generation can keep reading it.
+    assert first.launches[0].details == "First flight"
+
+
+def test_publishing_an_already_published_version_maps_it(tmp_path):
+    SharedSnapshotFile(str(tmp_path)).publish(_snapshot("v1"))
+    mapped = SharedSnapshotFile(str(tmp_path)).publish(_snapshot("v1"))
+
+    assert SharedSnapshotFile(str(tmp_path)).generation() == 1
+    assert len([name for name in tmp_path.iterdir() if name.suffix == ".bin"]) == 1
+    assert not mapped.columns.timestamps.flags.owndata
+
+
+def test_other_workers_map_instead_of_rebuilding(tmp_path):
+    tracker = FakeTracker()
+    SnapshotStore(SharedSnapshotFile(str(tmp_path))).get(tracker)
+    assert tracker.launch_loads == 1
+
+    snapshot = SnapshotStore(SharedSnapshotFile(str(tmp_path))).get(tracker)
+    assert tracker.launch_loads == 1
+    assert snapshot.launches[0].rocket.name == "Falcon 9"
@@ -0,0 +1,39 @@
+import threading
+
+from app.singleflight import SingleFlight
+
+
+def test_concurrent_calls_share_one_execution():
+    flights = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+    results = []
+
+    def refresh():
+        calls.append(1)
+        started.set()
+        release.wait()
+        return "fresh"
+
+    def caller():
+        results.append(flights.do("launches", refresh))
+
+    leader = threading.Thread(target=caller)
+    leader.start()
+    started.wait()
+    followers = [threading.Thread(target=caller) for _ in range(4)]
+    for thread in followers:
+        thread.start()
+    release.set()
+    for thread in [leader, *followers]:
+        thread.join()
+
+    assert len(calls) == 1
+    assert results == ["fresh"] * 5
+
+
+def test_next_call_runs_again_after_completion():
+    flights = SingleFlight()
+    assert flights.do("rockets", lambda: 1) == 1
+    assert flights.do("rockets", lambda: 2) == 2
@@ -0,0 +1,92 @@
+import pytest
+
+from app.cache import SyncResult
+from app.snapshot import SnapshotStore
+from tests.conftest import FakeTracker, RowTracker
+
+
+@pytest.fixture
+def tracker():
+    return FakeTracker()
+
+
+def test_snapshot_is_enriched(tracker):
+    snapshot = SnapshotStore().get(tracker)
+    assert snapshot.version == "v1"
+    assert snapshot.launches[0].rocket.name == "Falcon 9"
+    assert snapshot.launchpad_map["p1"] == "CCSFS SLC 40"
+
+
+def test_snapshot_is_reused_while_version_is_unchanged(tracker):
+    store = SnapshotStore()
+    first = store.get(tracker)
+    second = store.get(tracker)
+    assert first is second
+    assert tracker.launch_loads == 1
+
+
+def test_snapshot_is_rebuilt_after_refresh(tracker):
+    store = SnapshotStore()
+    first = store.get(tracker)
+    tracker.version = "v2"
+    second = store.get(tracker)
+    assert second is not first
+    assert second.version == "v2"
+    assert tracker.launch_loads == 2
+
+
+def test_listeners_run_once_per_new_snapshot(tracker):
+    store = SnapshotStore()
+    seen = []
+    store.subscribe(lambda snapshot: seen.append(snapshot.version))
+    store.get(tracker)
+    store.get(tracker)
+    tracker.version = "v2"
+    store.get(tracker)
+    assert seen == ["v1", "v2"]
+
+
+def test_tallies_only_recount_changed_launches(caplog):
+    tracker = RowTracker()
+    store = SnapshotStore()
+    first = store.get(tracker)
+    assert first.statistic("monthly") == {"2021-01": 1, "2021-02": 1}
+
+    tracker.rows["l2"].update(success=False, content_hash="h2")
+    del tracker.rows["l1"]
+    tracker.version = "v2"
+    with caplog.at_level("INFO", logger="app.snapshot"):
+        second = store.get(tracker)
+
+    assert "1 launches re-counted, 1 removed" in caplog.text
+    assert second.statistic("success-rate") == {"Falcon 9": 0.0}
+    assert second.statistic("monthly") == {"2021-02": 1}
+    # Statistics already served for the old version are left untouched.
+    assert first.statistic("monthly") == {"2021-01": 1, "2021-02": 1}
+
+
+def test_tallies_apply_the_reported_delta(caplog):
+    tracker = RowTracker()
+    tracker.changes = {}
+    tracker.get_launch_changes = lambda since, until: tracker.changes.get(
+        (since, until)
+    )
+    store = SnapshotStore()
+    store.get(tracker)
+
+    tracker.rows["l2"].update(success=False, content_hash="h2")
+    del tracker.rows["l1"]
+    tracker.version = "v2"
+    tracker.changes[("v1", "v2")] = SyncResult([], ["l2"], ["l1"], 0)
+    with caplog.at_level("INFO", logger="app.snapshot"):
+        second = store.get(tracker)
+
+    assert "1 launches re-counted, 1 removed" in caplog.text
+    assert second.statistic("success-rate") == {"Falcon 9": 0.0}
+    assert second.statistic("monthly") == {"2021-02": 1}
+
+    # Launches outside the reported delta are not rescanned.
+    tracker.rows["l2"].update(success=True, content_hash="h3")
+    tracker.version = "v3"
+    tracker.changes[("v2", "v3")] = SyncResult([], [], [], 0)
+    assert store.get(tracker).statistic("success-rate") == {"Falcon 9": 0.0}
@@ -0,0 +1,183 @@
+import json
+
+import pytest
+
+from app.cache import LAUNCH_COLUMNS, LAUNCH_SEARCH_FIELDS, NAME_COLUMNS, SQLiteCache
+from app.snapshot import LaunchSnapshot
+from app.sql_queries import SQLiteLaunchQueries, sql_timestamp
+from app.utils import parse_date
+
+LAUNCHES = [
+    ("1", "2022-01-15T00:00:00.000Z", True, "r1", "p1"),
+    ("2", "2021-07-10T00:00:00.000Z", False, "r2", "p2"),
+    ("3", "2020-03-01T00:00:00.000Z", True, "r1", "p2"),
+    ("4", "2022-06-30T00:00:00.000Z", None, "r3", "p3"),
+    ("5", "2021-12-31T00:00:00.000Z", True, "r1", "p1"),
+    ("6", "2021-12-31T00:00:00.000Z", False, "r1", "p9"),
+]
+
+
+@pytest.fixture
+def caches(tmp_path):
+    db_path = str(tmp_path / "cache.db")
+    caches = {
+        "launch_cache": SQLiteCache("launches", db_path, columns=LAUNCH_COLUMNS),
+        "rocket_cache": SQLiteCache("rockets", db_path, columns=NAME_COLUMNS),
+        "launchpad_cache": SQLiteCache("launchpads", db_path, columns=NAME_COLUMNS),
+    }
+    caches["launch_cache"].sync(
+        [
+            {
+                "id": launch_id,
+                "name": f"Mission {launch_id}",
+                "date_utc": date_utc,
+                "success": success,
+                "upcoming": False,
+                "rocket": rocket,
+                "launchpad": launchpad,
+                "flight_number": int(launch_id),
+                "details": None,
+            }
+            for launch_id, date_utc, success, rocket, launchpad in LAUNCHES
+        ]
+    )
+    caches["rocket_cache"].sync(
+        [
+            {"id": "r1", "name": "Falcon 9"},
+            {"id": "r2", "name": "Starship"},
+            {"id": "r3", "name": "Falcon Heavy"},
+        ]
+    )
+    caches["launchpad_cache"].sync(
+        [
+            {"id": "p1", "name": "CCSFS SLC 40"},
+            {"id": "p2", "name": "Starbase"},
+            {"id": "p3", "name": "KSC LC 39A"},
+        ]
+    )
+    return caches
+
+
+@pytest.fixture
+def sql(caches):
+    return SQLiteLaunchQueries("v1", **caches)
+
+
+@pytest.fixture
+def snapshot(caches):
+    return LaunchSnapshot.build(
+        "v1",
+        caches["launch_cache"].load_rows(),
+        caches["rocket_cache"].load(),
+        caches["launchpad_cache"].load(),
+    )
+
+
+FILTERS = [
+    {},
+    {"start_date": "2021-01-01"},
+    {"end_date": "2021-12-31"},
+    {"start_date": "2021-01-01", "end_date": "2022-01-31", "success": True},
+    {"rocket_name": "falcon 9", "launchpad_name": "Starbase"},
+    {"success": False, "rocket_name": "Falcon 9"},
+    {"launchpad_name": "Vandenberg"},
+]
+
+
+@pytest.mark.parametrize("filters", FILTERS)
+def test_sql_query_matches_snapshot(sql, snapshot, filters):
+    assert [launch.id for launch in sql.query(**filters)] == [
+        launch.id for launch in snapshot.query(**filters)
+    ]
+
+
+@pytest.mark.parametrize("filters", FILTERS)
+def test_sql_pages_match_snapshot(sql, snapshot, filters):
+    after, expected_after = None, None
+    while True:
+        launches, after = sql.page(after, 2, **filters)
+        expected, expected_after = snapshot.page(expected_after, 2, **filters)
+        assert [launch.id for launch in launches] == [l.id for l in expected]
+        assert after == expected_after
+        if after is None:
+            break
+
+
+@pytest.mark.parametrize("name", ["success-rate", "launchpads", "monthly", "yearly"])
+def test_sql_statistics_match_snapshot(sql, snapshot, name):
+    result = sql.statistic(name)
+    expected = snapshot.statistic(name)
+    assert list(result.items()) == list(expected.items())
+
+
+@pytest.mark.parametrize("filters", FILTERS)
+def test_sql_aggregates_match_snapshot(sql, snapshot, filters):
+    params = dict(
+        group_by=["rocket", "year"],
+        metrics=["count", "success_rate", "cumulative_count"],
+    )
+    expected = snapshot.aggregate(**params, **filters)
+    assert sql.aggregate(**params, **filters) == expected
+
+
+def test_sql_columnar_holds_only_matching_launches(sql, snapshot):
+    launches, columns, positions = sql.columnar(rocket_name="falcon 9")
+    assert [launches[i].id for i in positions] == [
+        launch.id for launch in snapshot.query(rocket_name="falcon 9")
+    ]
+    assert columns.size == len(launches)
+
+
+def test_sql_timestamp_matches_upstream_format():
+    assert (
+        sql_timestamp(parse_date("2021-12-31T01:00:00+01:00"))
+        == "2021-12-31T00:00:00.000Z"
+    )
+
+
+DETAILS = {
+    "1": "Starlink satellites to low Earth orbit",
+    "2": "Cargo Dragon resupply to the ISS",
+    "5": "Crew Dragon to the ISS, with a Starlink rideshare",
+}
+
+
+@pytest.fixture
+def searchable(tmp_path, caches):
+    launch_cache = SQLiteCache(
+        "launches",
+        caches["launch_cache"].db_path,
+        columns=LAUNCH_COLUMNS,
+        search_fields=LAUNCH_SEARCH_FIELDS,
+    )
+    rows = [
+        {**json.loads(row["data"]), "details": DETAILS.get(row["id"])}
+        for row in launch_cache.load_rows()
+    ]
+    launch_cache.sync(rows)
+    caches = {**caches, "launch_cache": launch_cache}
+    sql = SQLiteLaunchQueries("v2", **caches)
+    snapshot = LaunchSnapshot.build(
+        "v2",
+        launch_cache.load_rows(),
+        caches["rocket_cache"].load(),
+        caches["launchpad_cache"].load(),
+    )
+    return sql, snapshot
+
+
+@pytest.mark.parametrize(
+    "q, filters",
+    [
+        ("starlink", {}),
+        ("iss dragon", {}),
+        ("mission", {"success": True}),
+        ("drag*", {"start_date": "2021-12-01"}),
+        ("cargo crew", {}),
+    ],
+)
+def test_sql_search_matches_snapshot(searchable, q, filters):
+    sql, snapshot = searchable
+    assert [launch.id for launch in sql.search(q, **filters)] == [
+        launch.id for launch in snapshot.search(q, **filters)
+    ]
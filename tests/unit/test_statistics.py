@@ -2,12 +2,20 @@ from datetime import datetime
 
 import pytest
 
+from app.columnar import LaunchColumns
 from app.models import LaunchModel, LaunchpadModel, RocketModel
+from app.snapshot import LaunchSnapshot
 from app.statistics import (
+    LaunchTallies,
+    StatisticsCache,
     compute_success_rates_by_rocket,
     count_launches_per_site,
     get_launch_frequency_by_month,
     get_launch_frequency_by_year,
+    launch_frequency_by_month,
+    launch_frequency_by_year,
+    launches_per_site,
+    success_rates_by_rocket,
 )
 
 
@@ -80,3 +88,74 @@ def test_get_launch_frequency_by_year(sample_launches):
     freq = get_launch_frequency_by_year(sample_launches)
     assert freq["2021"] == 2
     assert freq["2022"] == 1
+
+
+def test_columnar_statistics_match_loop_versions(sample_launches):
+    columns = LaunchColumns(sample_launches)
+    assert success_rates_by_rocket(columns) == compute_success_rates_by_rocket(
+        sample_launches, {}
+    )
+    assert launches_per_site(columns) == count_launches_per_site(sample_launches, {})
+    assert launch_frequency_by_month(columns) == get_launch_frequency_by_month(
+        sample_launches
+    )
+    assert launch_frequency_by_year(columns) == get_launch_frequency_by_year(
+        sample_launches
+    )
+
+
+def test_columnar_statistics_on_empty_snapshot():
+    columns = LaunchColumns([])
+    assert success_rates_by_rocket(columns) == {}
+    assert launch_frequency_by_month(columns) == {}
+    assert launch_frequency_by_year(columns) == {}
+
+
+def test_statistics_cache_is_keyed_by_snapshot_version(sample_launches):
+    stats = StatisticsCache()
+    first = LaunchSnapshot("v1", sample_launches, {}, {})
+    stats.warm(first)
+    assert stats.get(first, "yearly") is stats.get(first, "yearly")
+
+    second = LaunchSnapshot("v2", sample_launches[:1], {}, {})
+    assert stats.get(second, "yearly") == {"2021": 1}
+    assert stats.get(first, "yearly") == {"2021": 2, "2022": 1}
+
+
+def test_tallies_match_loop_versions(sample_launches):
+    tallies = LaunchTallies()
+    tallies.apply(sample_launches)
+    assert tallies.statistics() == {
+        "success-rate": compute_success_rates_by_rocket(sample_launches, {}),
+        "launchpads": count_launches_per_site(sample_launches, {}),
+        "monthly": get_launch_frequency_by_month(sample_launches),
+        "yearly": get_launch_frequency_by_year(sample_launches),
+    }
+
+
+def test_tallies_apply_refresh_deltas(sample_launches):
+    tallies = LaunchTallies()
+    tallies.apply(sample_launches, revisions={"l2": "h1"})
+    assert tallies.revision("l2") == "h1"
+
+    changed = sample_launches[1].model_copy(update={"success": True})
+    tallies.apply([changed], removed=["l3"], revisions={"l2": "h2"})
+    remaining = [sample_launches[0], changed]
+    assert len(tallies) == 2
+    assert tallies.revision("l2") == "h2"
+    assert tallies.success_rates_by_rocket() == {"Falcon 9": 100.0}
+    assert tallies.launches_per_site() == {"CCSFS SLC 40": 2}
+    assert tallies.frequency_by_month() == get_launch_frequency_by_month(remaining)
+    assert tallies.frequency_by_year() == {"2021": 2}
+
+
+def test_tallies_merge_disjoint_partials(sample_launches):
+    merged, other = LaunchTallies(), LaunchTallies()
+    merged.apply(sample_launches[:2])
+    other.apply(sample_launches[2:])
+    merged.merge(other)
+
+    whole = LaunchTallies()
+    whole.apply(sample_launches)
+    assert merged.statistics() == whole.statistics()
+    assert "l3" in merged
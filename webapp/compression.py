@@ -0,0 +1,67 @@
+import zlib
+from typing import Dict, Iterable, Iterator, Optional
+
+try:
+    import zstandard
+except ImportError:  # zstd is only offered when the codec is installed
+    zstandard = None
+
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 3
+
+
+def supported_encodings() -> Dict[str, int]:
+    """
+    Returns the streaming encodings we can produce, by server preference.
+    """
+    encodings = {"gzip": 1}
+    if zstandard is not None:
+        encodings["zstd"] = 2
+    return encodings
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """
+    Picks the best supported encoding from an Accept-Encoding header, or
+    ``None`` for identity. Codings with ``q=0`` are treated as refused.
+    """
+    if not accept_encoding:
+        return None
+    supported = supported_encodings()
+    best, best_rank = None, None
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if coding not in supported or quality <= 0:
+            continue
+        rank = (quality, supported[coding])
+        if best_rank is None or rank > best_rank:
+            best, best_rank = coding, rank
+    return best
+
+
+def compress_stream(chunks: Iterable[bytes], encoding: str) -> Iterator[bytes]:
+    """
+    Compresses a byte stream incrementally with ``gzip`` or ``zstd``.
+    """
+    if encoding == "gzip":
+        # wbits=31 selects the gzip container rather than raw zlib.
+        compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+    elif encoding == "zstd" and zstandard is not None:
+        compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compressobj()
+    else:
+        raise ValueError(f"Unsupported content encoding: {encoding}")
+
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
@@ -1,30 +1,77 @@
 from functools import lru_cache
+from typing import Mapping, Sequence
 
-from app.api_client import ISpaceXLaunchTracker, SpaceXLaunchTrackerFactory
-from app.models import LaunchModel
-from app.utils import enrich_launches
+from fastapi import Depends
 
+from app.api_client import IAsyncSpaceXLaunchTracker, SpaceXLaunchTrackerFactory
+from app.cache import SQLiteCache
+from app.queries import ILaunchQueries
+from app.records import LaunchRecord
+from app.settings import config
+from app.shared_snapshot import SharedSnapshotFile
+from app.snapshot import LaunchSnapshot, SnapshotStore
+from app.sql_queries import SQLiteLaunchQueries
+from app.statistics import StatisticsCache
+from webapp.responses import EncodedResponseCache, ResponseBodies
 
-@lru_cache()
-def get_tracker() -> ISpaceXLaunchTracker:
-    return SpaceXLaunchTrackerFactory.get_tracker()
+_snapshot_store = SnapshotStore(
+    SharedSnapshotFile(config.SHARED_SNAPSHOT_DIR)
+    if config.SHARED_SNAPSHOT_DIR
+    else None
+)
+_statistics_cache = StatisticsCache()
+_response_bodies = ResponseBodies(
+    _statistics_cache, EncodedResponseCache(config.RESPONSE_CACHE_MAX_BYTES)
+)
+_snapshot_store.subscribe(_statistics_cache.warm)
+_snapshot_store.subscribe(_response_bodies.warm)
 
 
 @lru_cache()
-def get_rocket_id_to_name_map() -> dict:
-    tracker = get_tracker()
-    return {r["id"]: r["name"] for r in tracker.get_rockets()}
+def get_async_tracker() -> IAsyncSpaceXLaunchTracker:
+    return SpaceXLaunchTrackerFactory.get_async_tracker()
+
+
+async def get_launch_snapshot() -> LaunchSnapshot:
+    return await _snapshot_store.aget(get_async_tracker())
 
 
 @lru_cache()
-def get_launchpad_id_to_name_map() -> dict:
-    tracker = get_tracker()
-    return {p["id"]: p["name"] for p in tracker.get_launchpads()}
+def get_query_caches() -> Mapping[str, SQLiteCache]:
+    return SpaceXLaunchTrackerFactory.get_caches()
+
+
+async def get_sql_launch_queries() -> ILaunchQueries:
+    version = await get_async_tracker().get_data_version()
+    return SQLiteLaunchQueries(version, **get_query_caches())
+
+
+# Read routes depend on this; with the default backend it is the snapshot
+# dependency itself.
+get_launch_queries = (
+    get_sql_launch_queries if config.QUERY_BACKEND == "sqlite" else get_launch_snapshot
+)
+
+
+# The original dependency names, kept for callers and tests that patch them.
+# They read from the snapshot, so they change with its data version.
+async def get_rocket_id_to_name_map(
+    snapshot: LaunchSnapshot = Depends(get_launch_snapshot),
+) -> Mapping[str, str]:
+    return snapshot.rocket_map
+
+
+async def get_launchpad_id_to_name_map(
+    snapshot: LaunchSnapshot = Depends(get_launch_snapshot),
+) -> Mapping[str, str]:
+    return snapshot.launchpad_map
+
+
+async def get_parsed_launches(
+    snapshot: LaunchSnapshot = Depends(get_launch_snapshot),
+) -> Sequence[LaunchRecord]:
+    return snapshot.launches
 
 
-def get_parsed_launches() -> list[LaunchModel]:
-    tracker = get_tracker()
-    rocket_map = get_rocket_id_to_name_map()
-    launchpad_map = get_launchpad_id_to_name_map()
-    raw = tracker.get_launches()
-    return enrich_launches(raw, rocket_map, launchpad_map)
+def get_response_bodies() -> ResponseBodies:
+    return _response_bodies
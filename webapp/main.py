@@ -1,11 +1,26 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 
+from webapp.dependencies import get_async_tracker
 from webapp.routes import export, launches, statistics
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Warm the cache without holding up startup; requests arriving before it
+    # finishes share the same in-flight fetch.
+    tracker = get_async_tracker()
+    tracker.refresh_in_background()
+    yield
+    await tracker.aclose()
+
+
 app = FastAPI(
     title="SpaceX Launch Tracker API",
     version="1.0.0",
     description="Track and analyze SpaceX launches using the SpaceX API.",
+    lifespan=lifespan,
 )
 
 # Register routes
@@ -0,0 +1,46 @@
+import base64
+import json
+from datetime import datetime
+from typing import FrozenSet, Optional
+
+from app.index import PageKey
+from app.models import LaunchModel
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+LAUNCH_FIELDS = frozenset(LaunchModel.model_fields)
+
+
+def encode_cursor(key: PageKey) -> str:
+    """
+    Encodes a (date_utc, id) page key as an opaque URL-safe cursor.
+    """
+    date_utc, launch_id = key
+    raw = json.dumps([date_utc.isoformat(), launch_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> PageKey:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        date_utc, launch_id = json.loads(base64.urlsafe_b64decode(padded))
+        key = (datetime.fromisoformat(date_utc), str(launch_id))
+    except (ValueError, TypeError):
+        raise ValueError(f"Invalid cursor: {cursor}")
+    if key[0].tzinfo is None:
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return key
+
+
+def parse_fields(fields: Optional[str]) -> Optional[FrozenSet[str]]:
+    """
+    Parses a comma-separated ``fields=`` projection of top-level launch fields.
+    """
+    if not fields:
+        return None
+    selected = frozenset(name.strip() for name in fields.split(",") if name.strip())
+    unknown = selected - LAUNCH_FIELDS
+    if unknown:
+        raise ValueError(f"Unknown launch fields: {', '.join(sorted(unknown))}")
+    return selected or None
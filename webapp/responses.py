@@ -0,0 +1,297 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import (
+    AbstractSet,
+    Any,
+    Callable,
+    Hashable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+from app.index import PageKey, normalize_name
+from app.models import LaunchModel
+from app.queries import ILaunchQueries
+from app.records import LaunchRecord, to_model
+from app.search import parse_query
+from app.statistics import STATISTICS, StatisticsCache
+
+_launch = TypeAdapter(LaunchModel)
+_launch_list = TypeAdapter(List[LaunchModel])
+
+
+class EncodedBody(NamedTuple):
+    body: bytes
+    etag: str
+
+
+def encode_launches(
+    launches: Sequence[LaunchRecord], fields: Optional[AbstractSet[str]] = None
+) -> bytes:
+    include = {"__all__": set(fields)} if fields else None
+    return _launch_list.dump_json(
+        [to_model(launch) for launch in launches], include=include
+    )
+
+
+def encode_launch_batches(
+    launches: Sequence[LaunchRecord], batch_size: int, ndjson: bool = False
+) -> Iterator[bytes]:
+    """
+    Yields a JSON array (or NDJSON lines) of launches, encoding ``batch_size``
+    launches per chunk so memory stays bounded regardless of result size.
+    """
+    if not ndjson:
+        yield b"["
+    for start in range(0, len(launches), batch_size):
+        batch = launches[start : start + batch_size]
+        if ndjson:
+            yield b"".join(
+                _launch.dump_json(to_model(launch)) + b"\n" for launch in batch
+            )
+        else:
+            items = encode_launches(batch)[1:-1]
+            yield (b"," + items) if start else items
+    if not ndjson:
+        yield b"]"
+
+
+def encode_json(content: Any) -> bytes:
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def make_etag(body: bytes) -> str:
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+class EncodedResponseCache:
+    """
+    Pre-encoded JSON bodies and their strong ETags for one dataset version.
+
+    Entries are keyed by route and normalized query parameters. As those come
+    from clients, the cache is bounded by the total size of its bodies rather
+    than their number: at most ``max_bytes`` per version, least recently used
+    evicted first, and a body larger than that is served without being kept.
+    Everything is dropped as soon as a newer version is requested.
+    """
+
+    def __init__(self, max_bytes: int = 32 << 20):
+        self._max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._version: Optional[str] = None
+        self._entries: "OrderedDict[Hashable, EncodedBody]" = OrderedDict()
+        self._size = 0
+
+    @property
+    def size(self) -> int:
+        """
+        Total bytes of the bodies currently kept.
+        """
+        return self._size
+
+    def get(
+        self, version: str, key: Hashable, render: Callable[[], bytes]
+    ) -> EncodedBody:
+        with self._lock:
+            if version != self._version:
+                self._version = version
+                self._entries = OrderedDict()
+                self._size = 0
+            encoded = self._entries.get(key)
+            if encoded is not None:
+                self._entries.move_to_end(key)
+                return encoded
+
+        body = render()
+        encoded = EncodedBody(body, make_etag(body))
+        with self._lock:
+            if version == self._version and len(body) <= self._max_bytes:
+                previous = self._entries.pop(key, None)
+                if previous is not None:
+                    self._size -= len(previous.body)
+                self._entries[key] = encoded
+                self._size += len(body)
+                while self._size > self._max_bytes:
+                    _, evicted = self._entries.popitem(last=False)
+                    self._size -= len(evicted.body)
+        return encoded
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+def encoded_response(
+    encoded: EncodedBody,
+    if_none_match: Optional[str],
+    media_type: str = "application/json",
+) -> Response:
+    headers = {"ETag": encoded.etag}
+    if etag_matches(if_none_match, encoded.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=encoded.body, media_type=media_type, headers=headers)
+
+
+class ResponseBodies:
+    """
+    Builds and memoizes the encoded bodies of the read endpoints.
+    """
+
+    def __init__(self, statistics: StatisticsCache, cache: EncodedResponseCache):
+        self._statistics = statistics
+        self._cache = cache
+
+    def launches(
+        self,
+        queries: ILaunchQueries,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        success: Optional[bool] = None,
+        rocket_name: Optional[str] = None,
+        launchpad_name: Optional[str] = None,
+        fields: Optional[AbstractSet[str]] = None,
+    ) -> EncodedBody:
+        key = self._launches_key(
+            start_date, end_date, success, rocket_name, launchpad_name
+        )
+        if fields:
+            key += (tuple(sorted(fields)),)
+        return self._cache.get(
+            queries.version,
+            key,
+            lambda: encode_launches(
+                queries.query(
+                    start_date=start_date,
+                    end_date=end_date,
+                    success=success,
+                    rocket_name=rocket_name,
+                    launchpad_name=launchpad_name,
+                ),
+                fields,
+            ),
+        )
+
+    @staticmethod
+    def _launches_key(
+        start_date: Optional[str],
+        end_date: Optional[str],
+        success: Optional[bool],
+        rocket_name: Optional[str],
+        launchpad_name: Optional[str],
+    ) -> Tuple:
+        return (
+            "launches",
+            start_date or None,
+            end_date or None,
+            success,
+            normalize_name(rocket_name) if rocket_name else None,
+            normalize_name(launchpad_name) if launchpad_name else None,
+        )
+
+    def launch_page(
+        self,
+        queries: ILaunchQueries,
+        after: Optional[PageKey],
+        limit: int,
+        fields: Optional[AbstractSet[str]] = None,
+        **filters,
+    ) -> Tuple[EncodedBody, Optional[PageKey]]:
+        """
+        Encodes one keyset page of launches, optionally projected to
+        ``fields``, and returns it with the key to resume after.
+        """
+        launches, next_key = queries.page(after, limit, **filters)
+        body = encode_launches(launches, fields)
+        return EncodedBody(body, make_etag(body)), next_key
+
+    def search(
+        self,
+        queries: ILaunchQueries,
+        q: str,
+        limit: Optional[int] = None,
+        fields: Optional[AbstractSet[str]] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        success: Optional[bool] = None,
+        rocket_name: Optional[str] = None,
+        launchpad_name: Optional[str] = None,
+    ) -> EncodedBody:
+        """
+        Encodes the ranked full-text matches of ``q``, optionally only the
+        best ``limit`` of them.
+        """
+        filters = dict(
+            start_date=start_date,
+            end_date=end_date,
+            success=success,
+            rocket_name=rocket_name,
+            launchpad_name=launchpad_name,
+        )
+        key = ("search", tuple(parse_query(q)), limit, *self._launches_key(**filters))
+        if fields:
+            key += (tuple(sorted(fields)),)
+        return self._cache.get(
+            queries.version,
+            key,
+            lambda: encode_launches(queries.search(q, limit, **filters), fields),
+        )
+
+    def statistic(self, queries: ILaunchQueries, name: str) -> EncodedBody:
+        return self._cache.get(
+            queries.version,
+            ("stats", name),
+            lambda: encode_json(self._statistics.get(queries, name)),
+        )
+
+    def aggregate(
+        self,
+        queries: ILaunchQueries,
+        group_by: Sequence[str],
+        metrics: Sequence[str],
+        window: int,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        success: Optional[bool] = None,
+        rocket_name: Optional[str] = None,
+        launchpad_name: Optional[str] = None,
+    ) -> EncodedBody:
+        """
+        Encodes the ``/stats/query`` rows for the filtered launches. Invalid
+        dimensions, metrics or dates raise ``ValueError``.
+        """
+        filters = dict(
+            start_date=start_date,
+            end_date=end_date,
+            success=success,
+            rocket_name=rocket_name,
+            launchpad_name=launchpad_name,
+        )
+        key = ("stats-query", *self._launches_key(**filters)[1:])
+        key += (tuple(group_by), tuple(metrics), window)
+        return self._cache.get(
+            queries.version,
+            key,
+            lambda: encode_json(
+                queries.aggregate(group_by, metrics, window, **filters)
+            ),
+        )
+
+    def warm(self, queries: ILaunchQueries) -> None:
+        """
+        Pre-encodes the unfiltered launch list and every statistic.
+        """
+        self.launches(queries)
+        for name in STATISTICS:
+            self.statistic(queries, name)
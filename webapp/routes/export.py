@@ -1,98 +1,166 @@
 import csv
-import json
 from io import StringIO
-from typing import Optional
+from typing import Any, Dict, Iterable, Iterator, Optional, Sequence
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import Response, StreamingResponse
 
-from app.filters import (
-    filter_by_date_range,
-    filter_by_launchpad,
-    filter_by_rocket_name,
-    filter_by_success,
-)
-from app.models import LaunchModel
-from webapp.dependencies import (
-    get_launchpad_id_to_name_map,
-    get_parsed_launches,
-    get_rocket_id_to_name_map,
+from app.arrow_export import (
+    ARROW_MEDIA_TYPE,
+    PARQUET_MEDIA_TYPE,
+    arrow_available,
+    build_launch_table,
+    to_arrow_ipc,
+    to_parquet,
 )
+from app.queries import ILaunchQueries
+from app.records import LaunchRecord
+from webapp.compression import compress_stream, negotiate_encoding
+from webapp.dependencies import get_launch_queries
+from webapp.responses import encode_launch_batches
 
 router = APIRouter()
 
+# Launches encoded per streamed chunk of a JSON/NDJSON export.
+EXPORT_BATCH_SIZE = 256
+# Target size of each streamed CSV chunk.
+CSV_CHUNK_BYTES = 64 * 1024
+# Binary columnar formats: serializer and media type.
+COLUMNAR_FORMATS = {
+    "arrow": (to_arrow_ipc, ARROW_MEDIA_TYPE),
+    "parquet": (to_parquet, PARQUET_MEDIA_TYPE),
+}
+
 
-@router.get("/", summary="Export launch data as CSV or JSON")
+@router.get("/", summary="Export launch data as CSV, JSON, NDJSON, Arrow or Parquet")
 def export_launches(
     format: str = Query(
-        ..., pattern="^(csv|json)$", description="Export format: csv or json"
+        ...,
+        pattern="^(csv|json|ndjson|arrow|parquet)$",
+        description="Export format: csv, json, ndjson, arrow or parquet",
     ),
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
     success: Optional[bool] = None,
     rocket_name: Optional[str] = None,
     launchpad_name: Optional[str] = None,
-    launches: list[LaunchModel] = Depends(get_parsed_launches),
-    rocket_map: dict = Depends(get_rocket_id_to_name_map),
-    launchpad_map: dict = Depends(get_launchpad_id_to_name_map),
+    accept_encoding: Optional[str] = Header(None),
+    queries: ILaunchQueries = Depends(get_launch_queries),
 ):
     """
-    Export filtered launch data in CSV or JSON format.
+    Export filtered launch data in CSV, JSON or NDJSON format, or as a typed
+    columnar Arrow IPC stream / Parquet file.
     """
-    # Apply filters
-    filtered = filter_by_date_range(launches, start_date, end_date)
-    filtered = filter_by_success(filtered, success)
-    filtered = filter_by_rocket_name(filtered, {}, rocket_name)
-    filtered = filter_by_launchpad(filtered, {}, launchpad_name)
+    filters = dict(
+        start_date=start_date,
+        end_date=end_date,
+        success=success,
+        rocket_name=rocket_name,
+        launchpad_name=launchpad_name,
+    )
+
+    encoding = negotiate_encoding(accept_encoding)
 
     if format == "json":
-        return JSONResponse(
-            content=[json.loads(launch.model_dump_json()) for launch in filtered]
-        )
+        return stream_json(queries.query(**filters), encoding=encoding)
+
+    elif format == "ndjson":
+        return stream_json(queries.query(**filters), ndjson=True, encoding=encoding)
 
     elif format == "csv":
-        return stream_csv(filtered)
+        return stream_csv(queries.query(**filters), encoding=encoding)
+
+    elif format in COLUMNAR_FORMATS:
+        return columnar_export(queries, filters, format)
 
     raise HTTPException(status_code=400, detail="Unsupported export format")
 
 
-def stream_csv(launches: list[LaunchModel]) -> StreamingResponse:
-    def generate():
-        buffer = StringIO()
-        writer = csv.writer(buffer)
-
-        header = [
-            "id",
-            "name",
-            "date_utc",
-            "success",
-            "rocket_name",
-            "launchpad_name",
-            "flight_number",
-        ]
-        writer.writerow(header)
-        yield buffer.getvalue()
-        buffer.seek(0)
-        buffer.truncate(0)
-
-        for launch in launches:
-            writer.writerow(
-                [
-                    launch.id,
-                    launch.name,
-                    launch.date_utc.isoformat(),
-                    launch.success,
-                    launch.rocket.name,
-                    launch.launchpad.name,
-                    launch.flight_number,
-                ]
-            )
-            yield buffer.getvalue()
+def streaming_export(
+    chunks: Iterable[bytes],
+    media_type: str,
+    filename: str,
+    encoding: Optional[str] = None,
+) -> StreamingResponse:
+    headers = {
+        "Content-Disposition": f"attachment; filename={filename}",
+        "Vary": "Accept-Encoding",
+    }
+    if encoding is not None:
+        chunks = compress_stream(chunks, encoding)
+        headers["Content-Encoding"] = encoding
+    return StreamingResponse(chunks, media_type=media_type, headers=headers)
+
+
+def csv_chunks(launches: Sequence[LaunchRecord]) -> Iterator[bytes]:
+    """
+    Yields the CSV export with rows batched into chunks of about
+    CSV_CHUNK_BYTES, keeping the number of ASGI sends low.
+    """
+    buffer = StringIO()
+    writer = csv.writer(buffer)
+
+    header = [
+        "id",
+        "name",
+        "date_utc",
+        "success",
+        "rocket_name",
+        "launchpad_name",
+        "flight_number",
+    ]
+    writer.writerow(header)
+
+    for launch in launches:
+        writer.writerow(
+            [
+                launch.id,
+                launch.name,
+                launch.date_utc.isoformat(),
+                launch.success,
+                launch.rocket.name,
+                launch.launchpad.name,
+                launch.flight_number,
+            ]
+        )
+        if buffer.tell() >= CSV_CHUNK_BYTES:
+            yield buffer.getvalue().encode()
             buffer.seek(0)
             buffer.truncate(0)
 
-    return StreamingResponse(
-        generate(),
-        media_type="text/csv",
-        headers={"Content-Disposition": "attachment; filename=launches.csv"},
+    yield buffer.getvalue().encode()
+
+
+def stream_csv(
+    launches: Sequence[LaunchRecord], encoding: Optional[str] = None
+) -> StreamingResponse:
+    return streaming_export(csv_chunks(launches), "text/csv", "launches.csv", encoding)
+
+
+def stream_json(
+    launches: Sequence[LaunchRecord],
+    ndjson: bool = False,
+    encoding: Optional[str] = None,
+) -> StreamingResponse:
+    media_type, filename = (
+        ("application/x-ndjson", "launches.ndjson")
+        if ndjson
+        else ("application/json", "launches.json")
+    )
+    chunks = encode_launch_batches(launches, EXPORT_BATCH_SIZE, ndjson=ndjson)
+    return streaming_export(chunks, media_type, filename, encoding)
+
+
+def columnar_export(
+    queries: ILaunchQueries, filters: Dict[str, Any], format: str
+) -> Response:
+    if not arrow_available():
+        raise HTTPException(status_code=501, detail=f"{format} export requires pyarrow")
+    table = build_launch_table(*queries.columnar(**filters))
+    serialize, media_type = COLUMNAR_FORMATS[format]
+    body = serialize(table)
+    return Response(
+        content=body,
+        media_type=media_type,
+        headers={"Content-Disposition": f"attachment; filename=launches.{format}"},
     )
@@ -1,28 +1,28 @@
 import logging
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
 
 logger = logging.getLogger(__name__)
 
-from app.filters import (
-    filter_by_date_range,
-    filter_by_launchpad,
-    filter_by_rocket_name,
-    filter_by_success,
-)
 from app.models import LaunchModel
-from webapp.dependencies import (
-    get_launchpad_id_to_name_map,
-    get_parsed_launches,
-    get_rocket_id_to_name_map,
+from app.queries import ILaunchQueries
+from webapp.dependencies import get_launch_queries, get_response_bodies
+from webapp.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    decode_cursor,
+    encode_cursor,
+    parse_fields,
 )
+from webapp.responses import ResponseBodies, encoded_response
 
 router = APIRouter()
 
 
 @router.get("/", response_model=List[LaunchModel])
 def list_launches(
+    request: Request,
     start_date: Optional[str] = Query(None, description="Start date (YYYY-MM-DD)"),
     end_date: Optional[str] = Query(None, description="End date (YYYY-MM-DD)"),
     success: Optional[bool] = Query(None, description="Filter by launch success"),
@@ -30,16 +30,69 @@ def list_launches(
     launchpad_name: Optional[str] = Query(
         None, description="Filter by launch site name"
     ),
-    launches: List[LaunchModel] = Depends(get_parsed_launches),
-    rocket_map: dict = Depends(get_rocket_id_to_name_map),
-    launchpad_map: dict = Depends(get_launchpad_id_to_name_map),
+    limit: Optional[int] = Query(
+        None,
+        ge=1,
+        le=MAX_PAGE_SIZE,
+        description="Page size; pages are ordered by (date_utc, id)",
+    ),
+    cursor: Optional[str] = Query(
+        None, description="Opaque cursor from a previous page's X-Next-Cursor"
+    ),
+    fields: Optional[str] = Query(
+        None, description="Comma-separated launch fields to include"
+    ),
+    q: Optional[str] = Query(
+        None,
+        description="Full-text search over names and details, best match "
+        "first; a term ending in * matches as a prefix",
+    ),
+    if_none_match: Optional[str] = Header(None),
+    queries: ILaunchQueries = Depends(get_launch_queries),
+    bodies: ResponseBodies = Depends(get_response_bodies),
 ):
     """
     Retrieve filtered list of SpaceX launches.
+
+    Without ``limit`` or ``cursor`` the full filtered list is returned. With
+    them, results are paged by (date_utc, id) and the next page's cursor is
+    sent in the ``X-Next-Cursor`` and ``Link`` headers.
+
+    With ``q``, the matching launches are ranked by relevance instead, and
+    ``limit`` keeps only the best ones.
     """
-    filtered = filter_by_date_range(launches, start_date, end_date)
-    filtered = filter_by_success(filtered, success)
-    filtered = filter_by_rocket_name(filtered, rocket_map, rocket_name)
-    filtered = filter_by_launchpad(filtered, launchpad_map, launchpad_name)
+    filters = dict(
+        start_date=start_date,
+        end_date=end_date,
+        success=success,
+        rocket_name=rocket_name,
+        launchpad_name=launchpad_name,
+    )
+    try:
+        projection = parse_fields(fields)
+        after = decode_cursor(cursor) if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if q:
+        if after is not None:
+            raise HTTPException(
+                status_code=400, detail="cursor cannot be combined with q"
+            )
+        encoded = bodies.search(queries, q, limit, projection, **filters)
+        return encoded_response(encoded, if_none_match)
+
+    if limit is None and after is None:
+        encoded = bodies.launches(queries, fields=projection, **filters)
+        return encoded_response(encoded, if_none_match)
 
-    return filtered
+    encoded, next_key = bodies.launch_page(
+        queries, after, limit or DEFAULT_PAGE_SIZE, projection, **filters
+    )
+    response = encoded_response(encoded, if_none_match)
+    if next_key is not None:
+        next_cursor = encode_cursor(next_key)
+        next_url = request.url.include_query_params(cursor=next_cursor)
+        response.headers["X-Next-Cursor"] = next_cursor
+        response.headers["Link"] = f'<{next_url}>; rel="next"'
+    return response
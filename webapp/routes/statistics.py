@@ -1,56 +1,108 @@
-from typing import Dict
-
-from fastapi import APIRouter, Depends
-
-from app.models import LaunchModel
-from app.statistics import (
-    compute_success_rates_by_rocket,
-    count_launches_per_site,
-    get_launch_frequency_by_month,
-    get_launch_frequency_by_year,
-)
-from webapp.dependencies import (
-    get_launchpad_id_to_name_map,
-    get_parsed_launches,
-    get_rocket_id_to_name_map,
-)
+from typing import Any, Dict, List, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+
+from app.aggregation import DEFAULT_ROLLING_WINDOW, DIMENSIONS, METRICS
+from app.queries import ILaunchQueries
+from webapp.dependencies import get_launch_queries, get_response_bodies
+from webapp.responses import ResponseBodies, encoded_response
 
 router = APIRouter()
 
 
+def split_list(value: Optional[str]) -> List[str]:
+    return [item.strip() for item in (value or "").split(",") if item.strip()]
+
+
 @router.get("/success-rate", response_model=Dict[str, float])
 def success_rate_by_rocket(
-    launches: list[LaunchModel] = Depends(get_parsed_launches),
-    rocket_map: dict = Depends(get_rocket_id_to_name_map),
+    if_none_match: Optional[str] = Header(None),
+    queries: ILaunchQueries = Depends(get_launch_queries),
+    bodies: ResponseBodies = Depends(get_response_bodies),
 ):
     """
     Success rate of launches per rocket (as %).
     """
-    return compute_success_rates_by_rocket(launches, rocket_map)
+    return encoded_response(bodies.statistic(queries, "success-rate"), if_none_match)
 
 
 @router.get("/launchpads", response_model=Dict[str, int])
 def total_launches_per_site(
-    launches: list[LaunchModel] = Depends(get_parsed_launches),
-    launchpad_map: dict = Depends(get_launchpad_id_to_name_map),
+    if_none_match: Optional[str] = Header(None),
+    queries: ILaunchQueries = Depends(get_launch_queries),
+    bodies: ResponseBodies = Depends(get_response_bodies),
 ):
     """
     Number of launches per launch site.
     """
-    return count_launches_per_site(launches, launchpad_map)
+    return encoded_response(bodies.statistic(queries, "launchpads"), if_none_match)
 
 
 @router.get("/monthly", response_model=Dict[str, int])
-def launches_by_month(launches: list[LaunchModel] = Depends(get_parsed_launches)):
+def launches_by_month(
+    if_none_match: Optional[str] = Header(None),
+    queries: ILaunchQueries = Depends(get_launch_queries),
+    bodies: ResponseBodies = Depends(get_response_bodies),
+):
     """
     Number of launches per month (YYYY-MM).
     """
-    return get_launch_frequency_by_month(launches)
+    return encoded_response(bodies.statistic(queries, "monthly"), if_none_match)
 
 
 @router.get("/yearly", response_model=Dict[str, int])
-def launches_by_year(launches: list[LaunchModel] = Depends(get_parsed_launches)):
+def launches_by_year(
+    if_none_match: Optional[str] = Header(None),
+    queries: ILaunchQueries = Depends(get_launch_queries),
+    bodies: ResponseBodies = Depends(get_response_bodies),
+):
     """
     Number of launches per year (YYYY).
     """
-    return get_launch_frequency_by_year(launches)
+    return encoded_response(bodies.statistic(queries, "yearly"), if_none_match)
+
+
+@router.get("/query", response_model=List[Dict[str, Any]])
+def query_statistics(
+    group_by: Optional[str] = Query(
+        None, description=f"Comma-separated dimensions: {', '.join(DIMENSIONS)}"
+    ),
+    metrics: str = Query(
+        "count", description=f"Comma-separated metrics: {', '.join(METRICS)}"
+    ),
+    window: int = Query(
+        DEFAULT_ROLLING_WINDOW,
+        ge=1,
+        description="Buckets of the last dimension per rolling_success_rate",
+    ),
+    start_date: Optional[str] = Query(None, description="Start date (YYYY-MM-DD)"),
+    end_date: Optional[str] = Query(None, description="End date (YYYY-MM-DD)"),
+    success: Optional[bool] = Query(None, description="Filter by launch success"),
+    rocket_name: Optional[str] = Query(None, description="Filter by rocket name"),
+    launchpad_name: Optional[str] = Query(
+        None, description="Filter by launch site name"
+    ),
+    if_none_match: Optional[str] = Header(None),
+    queries: ILaunchQueries = Depends(get_launch_queries),
+    bodies: ResponseBodies = Depends(get_response_bodies),
+):
+    """
+    Metrics over the launches matching the ``/launches/`` filters, grouped by
+    any combination of dimensions. Rows are ordered by the group-by values,
+    and only non-empty groups are returned.
+    """
+    try:
+        encoded = bodies.aggregate(
+            queries,
+            split_list(group_by),
+            split_list(metrics),
+            window,
+            start_date=start_date,
+            end_date=end_date,
+            success=success,
+            rocket_name=rocket_name,
+            launchpad_name=launchpad_name,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return encoded_response(encoded, if_none_match)